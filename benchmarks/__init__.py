@@ -0,0 +1,5 @@
+"""Benchmarks of clippt on large synthetic decks.
+
+Usage: python -m benchmarks --slides 10000 --output results.json
+       python -m benchmarks --slides 10000 --compare results.json
+"""
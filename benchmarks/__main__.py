@@ -0,0 +1,90 @@
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import click
+
+from benchmarks.decks import SLIDE_KINDS, generate_deck
+from benchmarks.runner import compare, run_benchmark
+
+
+@click.command()
+@click.option("--slides", "-n", type=int, default=1000, show_default=True)
+@click.option(
+    "--kinds",
+    default=",".join(SLIDE_KINDS),
+    show_default=True,
+    help="Comma-separated kinds of the generated slides.",
+)
+@click.option(
+    "--steps",
+    type=int,
+    default=200,
+    show_default=True,
+    help="Number of navigations (next slide) to measure.",
+)
+@click.option(
+    "--cache-size",
+    type=int,
+    default=0,
+    show_default=True,
+    help="Size of the app's slide cache (0 renders every slide).",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the results (JSON) to this file.",
+)
+@click.option(
+    "--compare",
+    "baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Results of an earlier run to compare with.",
+)
+@click.option("--threshold", type=float, default=1.2, show_default=True)
+def main(
+    *,
+    slides: int,
+    kinds: str,
+    steps: int,
+    cache_size: int,
+    output: Path | None,
+    baseline: Path | None,
+    threshold: float,
+):
+    """Benchmark clippt on a synthetic deck.
+
+    With --compare, exits with 1 if any value got worse more than --threshold times.
+    """
+    kind_list = tuple(kind.strip() for kind in kinds.split(",") if kind.strip())
+    with tempfile.TemporaryDirectory(prefix="clippt-bench-") as directory:
+        manifest = generate_deck(Path(directory), slides=slides, kinds=kind_list)
+        results = run_benchmark(
+            manifest,
+            steps=steps,
+            cache_size=cache_size,
+            parameters={"kinds": list(kind_list)},
+        )
+    text = json.dumps(results, indent=2)
+    if output:
+        output.write_text(text + "\n")
+    else:
+        click.echo(text)
+
+    if baseline:
+        regressions = False
+        for metric, old, new, regressed in compare(
+            json.loads(baseline.read_text()), results, threshold=threshold
+        ):
+            ratio = new / old if old else float("inf")
+            flag = "  REGRESSION" if regressed else ""
+            click.echo(f"{metric:40} {old:14.6g} {new:14.6g} {ratio:7.2f}x{flag}")
+            regressions |= regressed
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
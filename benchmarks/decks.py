@@ -0,0 +1,109 @@
+"""Generation of synthetic decks of arbitrary size."""
+
+import json
+import random
+from pathlib import Path
+from typing import Final
+
+SLIDE_KINDS: Final[tuple[str, ...]] = ("markdown", "code", "csv", "parquet", "shell")
+
+DATA_ROWS: Final[int] = 500
+"""Number of rows of each generated data file."""
+
+_WORDS = (
+    "slide terminal textual render python shell data table widget cache "
+    "output lazy deck navigation latency memory"
+).split()
+
+
+def _paragraph(rng: random.Random, words: int = 40) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _markdown(rng: random.Random, index: int) -> str:
+    items = "\n".join(f"- {_paragraph(rng, 6)}" for _ in range(5))
+    return f"# Slide {index}\n\n{_paragraph(rng)}\n\n{items}\n\n{_paragraph(rng)}\n"
+
+
+def _code(rng: random.Random, index: int) -> str:
+    body = "\n".join(f"    total += {rng.randint(1, 100)}" for _ in range(15))
+    return (
+        "import sys  # HIDE\n"
+        f"SEED = {index}  # HIDE\n"
+        "# HIDE_ABOVE\n"
+        f"def compute_{index}(total=0):\n"
+        f"{body}\n"
+        "    return total\n"
+        "\n"
+        f"print(compute_{index}())\n"
+        "# HIDE_BELOW\n"
+        "sys.exit(0)\n"
+    )
+
+
+def _csv(rng: random.Random) -> str:
+    lines = ["id,name,value,ratio"]
+    for row in range(DATA_ROWS):
+        lines.append(
+            f"{row},{rng.choice(_WORDS)},{rng.randint(0, 10_000)},{rng.random():.4f}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def generate_deck(
+    directory: Path,
+    *,
+    slides: int,
+    kinds: tuple[str, ...] = SLIDE_KINDS,
+    seed: int = 0,
+) -> Path:
+    """Write a presentation with the given number of slides (cycling the kinds).
+
+    Each slide gets its own file (apart from the shell ones, which are inline),
+    so that loading has the same cost as in a real deck.
+
+    Returns:
+        Path to the manifest (`presentation.json`).
+    """
+    unknown = set(kinds) - set(SLIDE_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown slide kinds: {', '.join(sorted(unknown))}")
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    entries = []
+    for index in range(slides):
+        kind = kinds[index % len(kinds)]
+        match kind:
+            case "markdown":
+                name = f"slide_{index:05d}.md"
+                (directory / name).write_text(_markdown(rng, index))
+                entries.append({"path": name})
+            case "code":
+                name = f"slide_{index:05d}.py"
+                (directory / name).write_text(_code(rng, index))
+                entries.append({"path": name, "title": f"Code {index}"})
+            case "csv":
+                name = f"slide_{index:05d}.csv"
+                (directory / name).write_text(_csv(rng))
+                entries.append({"path": name})
+            case "parquet":
+                import polars as pl
+
+                name = f"slide_{index:05d}.parquet"
+                pl.read_csv(_csv(rng).encode()).write_parquet(directory / name)
+                entries.append({"path": name})
+            case "shell":
+                entries.append(
+                    {
+                        "type": "shell",
+                        "source": f"echo 'Slide {index}'",
+                        "display_mode": "output",
+                        "prefetch": False,
+                        "cache": False,
+                    }
+                )
+    manifest = directory / "presentation.json"
+    manifest.write_text(
+        json.dumps({"title": f"Synthetic deck ({slides} slides)", "slides": entries})
+    )
+    return manifest
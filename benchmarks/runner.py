@@ -0,0 +1,206 @@
+"""Measuring the deck loading, navigation and rendering."""
+
+import asyncio
+import contextlib
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Final
+
+from clippt.app import PresentationApp
+from clippt.model import PresentationModel
+from clippt.presentation import Presentation
+from clippt.utils import patch_environment
+
+RESULTS_FORMAT: Final[int] = 1
+"""Version of the results layout (bump when incompatible)."""
+
+TERMINAL_SIZE: Final[tuple[int, int]] = (120, 40)
+
+
+def _summary(durations: list[float]) -> dict[str, float | int]:
+    """Statistics of a series of durations (in seconds)."""
+    if not durations:
+        return {"count": 0}
+    ordered = sorted(durations)
+    return {
+        "count": len(ordered),
+        "mean_s": statistics.fmean(ordered),
+        "median_s": statistics.median(ordered),
+        "p95_s": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        "max_s": ordered[-1],
+    }
+
+
+def _timed(func, *args, **kwargs) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _max_rss_bytes() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, in kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+@contextlib.contextmanager
+def _empty_cache():
+    """Point the clippt caches (model, bytecode...) at an empty temporary directory.
+
+    The measures do not depend on previous runs, nor touch the user's caches.
+    """
+    with tempfile.TemporaryDirectory(prefix="clippt-benchmark-") as directory:
+        with patch_environment({"CLIPPT_CACHE_DIR": directory}):
+            yield
+
+
+def measure_load(manifest: Path) -> dict[str, float | int]:
+    """Time of the separate phases of loading the deck, and its memory peak.
+
+    The timings are measured with empty caches, and again with the cached
+    model and bytecode (`*_warm_s`). The peak (`peak_bytes`) covers the memory
+    allocated by Python objects only.
+    """
+    model, parse_s = _timed(PresentationModel.from_path, manifest, cache=None)
+    # Lazy slides do not read their files, which leaves the dispatch to slide types
+    _, dispatch_s = _timed(
+        Presentation.from_model, model, slide_base_path=manifest.parent, lazy=True
+    )
+    with _empty_cache():
+        _, lazy_s = _timed(Presentation.from_path, manifest, lazy=True)
+        _, parse_warm_s = _timed(PresentationModel.from_path, manifest)
+        _, lazy_warm_s = _timed(Presentation.from_path, manifest, lazy=True)
+    with _empty_cache():
+        tracemalloc.start()
+        try:
+            _, eager_s = _timed(Presentation.from_path, manifest)
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        _, eager_warm_s = _timed(Presentation.from_path, manifest)
+    return {
+        "parse_s": parse_s,
+        "parse_warm_s": parse_warm_s,
+        "dispatch_s": dispatch_s,
+        "lazy_s": lazy_s,
+        "lazy_warm_s": lazy_warm_s,
+        # Slightly inflated by the memory tracing
+        "eager_s": eager_s,
+        "eager_warm_s": eager_warm_s,
+        "peak_bytes": peak_bytes,
+    }
+
+
+async def measure_navigation(
+    presentation: Presentation, *, steps: int, cache_size: int = 0
+) -> dict[str, Any]:
+    """Page through the deck in a headless app.
+
+    The latency is measured from the key press until the app is idle again,
+    the render time is the duration of the slide update (per slide type).
+    With the default `cache_size=0`, every slide is rendered from scratch.
+    """
+    app = PresentationApp(presentation, cache_size=cache_size, live_reload=False)
+    latencies: list[float] = []
+    renders: dict[str, list[float]] = defaultdict(list)
+    async with app.run_test(size=TERMINAL_SIZE) as pilot:
+        await pilot.pause()
+        for _ in range(min(steps, presentation.slides_count - 1)):
+            start = time.perf_counter()
+            await pilot.press("pagedown")
+            await pilot.pause()
+            latencies.append(time.perf_counter() - start)
+            if app.last_update_duration is not None:
+                slide_type = type(app.current_slide).__name__
+                renders[slide_type].append(app.last_update_duration)
+        app.workers.cancel_group(app, "exec")
+    return {
+        "navigation": _summary(latencies),
+        "render": {
+            slide_type: _summary(durations)
+            for slide_type, durations in sorted(renders.items())
+        },
+    }
+
+
+def _clippt_version() -> str:
+    try:
+        return version("clippt")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def run_benchmark(
+    manifest: Path, *, steps: int, cache_size: int = 0, parameters: dict | None = None
+) -> dict[str, Any]:
+    """Run all the measurements on a deck, returning JSON-serializable results."""
+    load = measure_load(manifest)
+    with _empty_cache():
+        presentation = Presentation.from_path(manifest)
+        interaction = asyncio.run(
+            measure_navigation(presentation, steps=steps, cache_size=cache_size)
+        )
+    return {
+        "format": RESULTS_FORMAT,
+        "clippt_version": _clippt_version(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "parameters": {
+            "slides": presentation.slides_count,
+            "steps": steps,
+            "cache_size": cache_size,
+        }
+        | (parameters or {}),
+        "load": load,
+        **interaction,
+        "memory": {"max_rss_bytes": _max_rss_bytes()},
+    }
+
+
+def _flatten(results: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    """Measured values by their dotted path (e.g. `load.eager_s`)."""
+    flat = {}
+    for key, value in results.items():
+        if key == "parameters":
+            continue
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat |= _flatten(value, f"{path}.")
+        elif isinstance(value, (int, float)) and key.endswith(("_s", "_bytes")):
+            flat[path] = float(value)
+    return flat
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], *, threshold: float = 1.2
+) -> list[tuple[str, float, float, bool]]:
+    """Compare the values measured in both runs.
+
+    Returns:
+        Tuples of the metric, baseline value, current value and whether
+        the current value exceeds the baseline by more than `threshold` times.
+        The maxima are too noisy to be reported as regressions.
+    """
+    old, new = _flatten(baseline), _flatten(current)
+    return [
+        (
+            metric,
+            old[metric],
+            new[metric],
+            not metric.endswith("max_s") and new[metric] > old[metric] * threshold,
+        )
+        for metric in sorted(old.keys() & new.keys())
+    ]
@@ -1,9 +1,28 @@
-from clippt.app import PresentationApp
-from clippt.slides import Slide
-from clippt.presentation import Presentation
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from clippt.app import PresentationApp
+    from clippt.slides import Slide
+    from clippt.presentation import Presentation
 
 __all__ = [
     "PresentationApp",
     "Presentation",
     "Slide",
 ]
+
+# Imported on first access, so that importing `clippt.cli` (or any submodule)
+# does not pull in textual and pydantic.
+_LAZY_IMPORTS = {
+    "PresentationApp": "clippt.app",
+    "Presentation": "clippt.presentation",
+    "Slide": "clippt.slides",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if module_name := _LAZY_IMPORTS.get(name):
+        import importlib
+
+        return getattr(importlib.import_module(module_name), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,136 @@
+"""Worker process of the Python kernel pool (see `clippt.kernel`).
+
+It is run as a script (not as a module) so that it does not import clippt
+and its dependencies (with `-P`, so that the modules next to it do not shadow
+the user's). The requests are read from stdin and the messages written to
+stdout, both as JSON lines, on copies of the original file descriptors:
+file descriptors 0, 1 and 2 are replaced, so that the output of subprocesses
+and C extensions is also captured (and they cannot read the requests).
+
+Usage: python -P _kernel_worker.py [MODULE_TO_PRELOAD ...]
+"""
+
+import base64
+import codecs
+import importlib
+import json
+import marshal
+import os
+import sys
+import threading
+import traceback
+
+_FLUSH_MARKER = b"\0clippt-flush\0"
+"""Written after the output of an execution, to know when it has all been read."""
+
+
+class _OutputPipe:
+    """Pipe replacing file descriptors 1 and 2, its content sent as output messages."""
+
+    def __init__(self, send):
+        self._send = send
+        read_fd, write_fd = os.pipe()
+        os.dup2(write_fd, 1)
+        os.dup2(write_fd, 2)
+        os.close(write_fd)
+        self._read_fd = read_fd
+        self._flushed = threading.Event()
+        self.forward = False
+        """Whether the output is sent (otherwise, e.g. when preloading, dropped)."""
+
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        pending = b""
+        while data := os.read(self._read_fd, 65536):
+            pending += data
+            while True:
+                before, marker, after = pending.partition(_FLUSH_MARKER)
+                if not marker:
+                    break
+                self._forward(decoder.decode(before, final=True))
+                decoder.reset()
+                pending = after
+                self._flushed.set()
+            # Keep what could be the beginning of a marker
+            keep = next(
+                (
+                    size
+                    for size in range(len(_FLUSH_MARKER) - 1, 0, -1)
+                    if pending.endswith(_FLUSH_MARKER[:size])
+                ),
+                0,
+            )
+            self._forward(decoder.decode(pending[: len(pending) - keep]))
+            pending = pending[len(pending) - keep :]
+
+    def _forward(self, text: str) -> None:
+        if text and self.forward:
+            self._send({"type": "output", "data": text})
+
+    def flush(self) -> None:
+        """Wait until everything written so far has been handled."""
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass  # Closed by the code
+        self._flushed.clear()
+        os.write(1, _FLUSH_MARKER)
+        self._flushed.wait()
+
+
+def main() -> None:
+    channel = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    requests = os.fdopen(os.dup(0), encoding="utf-8")
+    lock = threading.Lock()
+
+    def send(message: dict) -> None:
+        with lock:
+            channel.write(json.dumps(message) + "\n")
+            channel.flush()
+
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    output = _OutputPipe(send)
+    # Same order as written (also with the output of subprocesses)
+    sys.stdout.reconfigure(line_buffering=True)
+    sys.stderr.reconfigure(line_buffering=True)
+
+    errors = []
+    for name in sys.argv[1:]:
+        try:
+            importlib.import_module(name)
+        except Exception as ex:
+            errors.append(f"{name}: {ex}")
+    output.flush()
+    send({"type": "ready", "errors": errors})
+
+    stdout, stderr = sys.stdout, sys.stderr
+    for line in requests:
+        request = json.loads(line)
+        os.environ.update(request["env"])
+        output.forward = True
+        is_error = False
+        try:
+            if "bytecode" in request:
+                code = marshal.loads(base64.b64decode(request["bytecode"]))
+            else:
+                code = compile(request["code"], request["filename"], "exec")
+            exec(code, {"__name__": "__main__"} | request["globals"])
+        except BaseException as ex:
+            is_error = True
+            sys.stdout, sys.stderr = stdout, stderr
+            print(f"Error: {ex}\n", file=stderr)
+            traceback.print_exc(file=stderr)
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+            output.flush()
+            output.forward = False
+        send({"type": "done", "is_error": is_error})
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,129 @@
+import functools
 import os
 import subprocess
-from collections.abc import Iterable
+import threading
+import time
+from collections.abc import Callable, Iterable
 from pathlib import Path
+from typing import ClassVar
 
 import click
-import shellingham
 from textual.reactive import reactive
 from textual.app import App, ComposeResult, SystemCommand, ScreenStackError
+from textual.binding import Binding
 from textual.containers import Container
 from textual.css.query import QueryError
 from textual.screen import Screen
-from textual.widgets import Footer, Header
+from textual.timer import Timer
+from textual.widget import Widget
+from textual.widgets import Footer, Header, Input, Static
 
-from clippt.slides import Slide, ErrorSlide
+from clippt.broadcast import Broadcaster, Follower
+from clippt.cache import OutputCache
+from clippt.kernel import KernelPool
+from clippt.lookahead import LookaheadScheduler
+from clippt.session import ShellSession
+from clippt.state import SessionState, SessionStore
+from clippt.slides import (
+    Slide,
+    ErrorSlide,
+    ExecutableSlide,
+    ExecutionContext,
+    PythonSlide,
+)
 from clippt.theming import css_tweaks
+from clippt.tracing import format_spans, tracer
 from clippt.presentation import Presentation
+from clippt.search import SlideIndex, SlideSearch
+from clippt.utils import detect_shell
+from clippt.widgets import OutputView
+from clippt.watch import FileWatcher, create_watcher
+
+
+def slide_geometry(
+    width: int, height: int, *, header: bool = True, footer: bool = True
+) -> tuple[int, int]:
+    """Columns and rows available for the slide content in a terminal of given size."""
+    columns = width - 2  # For scrollbar
+    rows = height - bool(footer) - bool(header)
+    return columns, rows
+
+
+class SlideWidgetCache:
+    """Rendered widget trees for the current slide and its neighbours.
+
+    The cached widgets stay mounted (but hidden) in the content container,
+    so that switching to a cached slide is only a matter of toggling
+    the display of the widgets.
+    """
+
+    def __init__(self, *, size: int = 2, max_bytes: int = 64 * 1024 * 1024):
+        self.size = size
+        """Number of neighbouring slides (on each side) to keep; 0 disables the cache."""
+
+        self.max_bytes = max_bytes
+        """Upper limit on the estimated memory taken by the cached slides."""
+
+        self.center = 0
+        """Index of the current slide."""
+
+        self._entries: dict[int, tuple[Widget, int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated memory taken by the cached slides."""
+        return sum(nbytes for _, nbytes in self._entries.values())
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, index: int) -> Widget | None:
+        if entry := self._entries.get(index):
+            return entry[0]
+        return None
+
+    def holds(self, widget: Widget) -> bool:
+        """Whether the widget is one of the cached ones."""
+        return any(w is widget for w, _ in self._entries.values())
+
+    def fits(self, nbytes: int) -> bool:
+        """Whether a slide of the estimated size can be added without evictions."""
+        return self.nbytes + nbytes <= self.max_bytes
+
+    def add(self, index: int, widget: Widget, *, nbytes: int) -> None:
+        """Store the widget, evicting the most distant slides if over the limit."""
+        if not self.enabled:
+            return
+        self._entries[index] = (widget, nbytes)
+        self.retain(self.center)
+        by_distance = sorted(self._entries, key=lambda i: abs(i - self.center))
+        while self.nbytes > self.max_bytes and len(by_distance) > 1:
+            farthest = by_distance.pop()
+            if farthest in (index, self.center):
+                continue
+            del self._entries[farthest]
+
+    def retain(self, center: int) -> None:
+        """Move the window to a new current slide and drop what falls outside."""
+        self.center = center
+        for index in list(self._entries):
+            if abs(index - center) > self.size:
+                del self._entries[index]
+
+    def pop(self, index: int) -> Widget | None:
+        if entry := self._entries.pop(index, None):
+            return entry[0]
+        return None
+
+    def clear(self) -> None:
+        self._entries.clear()
 
 
 class PresentationApp(App):
@@ -27,6 +136,7 @@ class PresentationApp(App):
 
     enable_footer: reactive[bool] = reactive(True)
     enable_header: reactive[bool] = reactive(True)
+    show_timings: reactive[bool] = reactive(False)
 
     BINDINGS = [
         ("pageup", "prev_slide", "Previous"),
@@ -38,18 +148,71 @@ class PresentationApp(App):
         ("home", "first_slide", "First"),
         ("end", "last_slide", "Last"),
         ("ctrl+o", "shell", "Shell"),
+        ("escape", "cancel", "Cancel"),
         ("h", "toggle_header", "Toggle header"),
         ("f", "toggle_footer", "Toggle footer"),
+        ("t", "toggle_timings", "Toggle timings"),
+        # Not in the footer (too many), available from the command palette
+        Binding("slash", "search_output", "Search", show=False),
+        Binding("n", "next_match", "Next match", show=False),
+        Binding("N", "previous_match", "Previous match", show=False),
+        Binding("G", "output_end", "End of output", show=False),
     ]
 
     CSS = css_tweaks
 
-    working_dir: Path = Path(".")
-    """Directory in which commands and scripts are executed."""
+    COMMANDS = App.COMMANDS | {SlideSearch}
+
+    last_update_duration: float | None = None
+    """Time (in seconds) it took to display the current slide."""
+
+    first_frame_callback: Callable[[], None] | None = None
+    """Called once the first frame is displayed (e.g. to measure the startup time)."""
+
+    RESIZE_DEBOUNCE: ClassVar[float] = 0.2
+    """Time (in seconds) the size has to stay the same before slides are re-rendered."""
+
+    WATCH_INTERVAL: ClassVar[float] = 0.25
+    """How often (in seconds) the slide files are checked for changes."""
+
+    BROADCAST_INTERVAL: ClassVar[float] = 0.2
+    """How often (in seconds) the state is sent to the followers (if changed)."""
+
+    PRESENTER_ACTIONS: ClassVar[frozenset[str]] = frozenset(
+        {
+            "prev_slide",
+            "next_slide",
+            "first_slide",
+            "last_slide",
+            "run",
+            "edit",
+            "reload",
+            "shell",
+        }
+    )
+    """Actions disabled when following a presenter (they change the shared state)."""
+
+    _watcher: FileWatcher | None = None
+    _resize_timer: Timer | None = None
+    _geometry: tuple[int, int] | None = None
+    """Columns and rows of the slides currently rendered."""
 
     def __init__(
         self,
         presentation: Presentation,
+        *,
+        cache_size: int = 2,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        lookahead: int = 0,
+        lookahead_workers: int = 2,
+        live_reload: bool = True,
+        output_cache: OutputCache | None = None,
+        kernel_pool: KernelPool | None = None,
+        shell_session: ShellSession | None = None,
+        trace_path: Path | None = None,
+        broadcaster: Broadcaster | None = None,
+        follower: Follower | None = None,
+        session_store: SessionStore | None = None,
         **kwargs,
     ):
         if not presentation.slides:
@@ -60,7 +223,34 @@ class PresentationApp(App):
             self.presentation = presentation
 
         super().__init__(**kwargs)
-        self.working_dir = self.presentation.slide_base_path
+        self.execution = ExecutionContext(
+            working_dir=self.presentation.slide_base_path,
+            output_cache=output_cache,
+            kernel_pool=kernel_pool,
+            shell_session=shell_session,
+            follower=follower,
+        )
+        """What the executable slides run with (closed with the app)."""
+        self.slide_cache = SlideWidgetCache(size=cache_size, max_bytes=cache_max_bytes)
+        self.lookahead = LookaheadScheduler(
+            # Nothing is executed when following
+            size=0 if follower is not None else lookahead,
+            max_workers=lookahead_workers,
+        )
+        self.live_reload = live_reload
+        """Reload the slides (and update the view) when their files change."""
+        self.trace_path = trace_path
+        """File to write the timings to (in the Chrome trace format) on exit."""
+        if trace_path is not None:
+            tracer.max_spans = None  # Keep the whole session
+        self.broadcaster = broadcaster
+        """Publishes the state of this session to the followers (if presenting)."""
+        self.search_index = SlideIndex()
+        """Words of the loaded slides, searched from the command palette."""
+        self.session_store = session_store
+        """Keeps the state of the session (for `--continue`), if enabled."""
+        self._restored_scroll: dict[int, float] = {}
+        """Scroll offsets to apply when the slides are first rendered."""
         self.title = presentation.title
         self.theme = kwargs.pop("theme", "textual-light")
 
@@ -72,6 +262,9 @@ class PresentationApp(App):
         yield Container(
             id="content",  # , can_focus=False
         )
+        timings = Static(id="timings")
+        timings.display = self.show_timings
+        yield timings
         footer = Footer(show_command_palette=True)
         footer.display = self.enable_footer
         yield footer
@@ -81,23 +274,220 @@ class PresentationApp(App):
         yield from super().get_system_commands(screen)
 
         # Commands available as bound actions
-        for action in self.BINDINGS:
-            attr_name = f"action_{action[1]}"
+        for binding in Binding.make_bindings(self.BINDINGS):
+            attr_name = f"action_{binding.action}"
             if attr_name in self.__class__.__dict__:
                 attr = getattr(self, attr_name)
                 if callable(attr):
                     doc = attr.__doc__.splitlines()[0].rstrip(".")
-                    yield SystemCommand(action[2], doc, attr)
+                    yield SystemCommand(binding.description, doc, attr)
 
     def watch_slide_index(self, old_value: int, new_value: int) -> None:
         """Hook called when the current slide index changes"""
         self._update_slide()
 
     def on_resize(self) -> None:
-        """Hook called when the app is resized."""
-        # TODO: Update only slides that need it.
+        """Hook called when the app is resized.
+
+        Consecutive resize events are coalesced, the slides are updated
+        only after the size settles (or immediately on the first display).
+        """
+        if self._resize_timer is not None:
+            self._resize_timer.stop()
+        if self._geometry is None:
+            self._resize_timer = None
+            self._update_slide()
+        else:
+            self._resize_timer = self.set_timer(
+                self.RESIZE_DEBOUNCE, self._on_resize_settled
+            )
+
+    def _on_resize_settled(self) -> None:
+        self._resize_timer = None
+        if self._slide_geometry() == self._geometry:
+            return
+        # Other slides reflow on their own
+        for index, slide in enumerate(self.presentation.slides):
+            if index in self.slide_cache and slide.geometry_dependent:
+                self.slide_cache.pop(index)
         self._update_slide()
 
+    def on_mount(self) -> None:
+        self._check_syntax(range(self.presentation.slides_count))
+        self.run_worker(
+            functools.partial(self.search_index.refresh, self.presentation.slides),
+            thread=True,
+            group="index",
+            exit_on_error=False,
+        )
+        if self.broadcaster is not None:
+            self.set_interval(self.BROADCAST_INTERVAL, self._publish_state)
+        if self.follower is not None:
+            self.follower.start(
+                lambda state: self.call_from_thread(self._follow_state, state)
+            )
+        if self.live_reload:
+            self._watcher = create_watcher(
+                slide.file_path for slide in self.presentation.slides if slide.file_path
+            )
+            self.log("Watching slide files", {"watcher": type(self._watcher).__name__})
+            self.set_interval(self.WATCH_INTERVAL, self._reload_changed_files)
+
+    def on_ready(self) -> None:
+        if self.first_frame_callback is not None:
+            self.first_frame_callback()
+
+    def on_unmount(self) -> None:
+        if self.broadcaster is not None:
+            self.broadcaster.close()
+        if self.follower is not None:
+            self.follower.close()
+        self.lookahead.shutdown()
+        if self.kernel_pool is not None:
+            self.kernel_pool.shutdown()
+        if self.shell_session is not None:
+            self.shell_session.close()
+        if self._watcher is not None:
+            self._watcher.close()
+        if self.trace_path is not None:
+            tracer.dump(self.trace_path)
+        if self.session_store is not None:
+            self.session_store.close()
+
+    def check_action(self, action: str, parameters: tuple[object, ...]) -> bool | None:
+        if self.follower is not None and action in self.PRESENTER_ACTIONS:
+            return False
+        return True
+
+    def _publish_state(self) -> None:
+        """Send the current slide (and its output) to the followers."""
+        slide = self.current_slide
+        state = {"slide_index": self.slide_index}
+        if isinstance(slide, ExecutableSlide):
+            state["display_mode"] = slide.display_mode
+            if slide.display_mode == "output":
+                columns, rows = self._slide_geometry()
+                state["output"] = slide.shared_output(columns=columns, rows=rows)
+        self.broadcaster.publish(state)
+
+    def _follow_state(self, state: dict) -> None:
+        """Show the state of the presenter's session."""
+        index = min(state["slide_index"], self.presentation.slides_count - 1)
+        slide = self.presentation.slides[index]
+        if output := state.get("output"):
+            self.follower.output(output["source"]).update(
+                text=output["text"], is_error=output["is_error"], done=output["done"]
+            )
+        changed = False
+        if (mode := state.get("display_mode")) and isinstance(slide, ExecutableSlide):
+            if slide.display_mode != mode:
+                slide.display_mode = mode
+                self.slide_cache.pop(index)
+                changed = True
+        if index != self.slide_index:
+            self.slide_index = index  # Updates the view
+        elif changed:
+            self._update_slide()
+
+    def _reload_changed_files(self) -> None:
+        """Reload the slides whose files changed, updating the view if needed."""
+        if self._watcher is None or not (changed := self._watcher.changes()):
+            return
+        self.log("Slide files changed", {"paths": changed})
+        for index, slide in enumerate(self.presentation.slides):
+            if slide.path and slide.path.absolute() in changed:
+                if slide.loaded:
+                    slide.reload()
+                    self._check_syntax([index])
+                    self.search_index.update(index, slide)
+                self.slide_cache.pop(index)
+                if index == self.slide_index:
+                    self._update_slide()
+
+    def _check_syntax(self, indices: Iterable[int]) -> None:
+        """Report the Python slides that do not compile (compiled in the background)."""
+        slides = [
+            (index, slide)
+            for index in indices
+            if isinstance(slide := self.presentation.slides[index], PythonSlide)
+            and slide.loaded
+        ]
+
+        def check() -> None:
+            for index, slide in slides:
+                if (error := slide.syntax_error) is not None:
+                    self.log.warning("Syntax error", {"index": index, "error": error})
+                    self.call_from_thread(
+                        self.notify,
+                        f"Slide {index + 1}: {error.msg} (line {error.lineno})",
+                        title="Syntax error",
+                        severity="error",
+                    )
+
+        if slides:
+            self.run_worker(check, thread=True, group="check")
+
+    def on_idle(self) -> None:
+        """Pre-render one of the neighbouring slides when there is nothing else to do."""
+        index = self._next_slide_to_prerender()
+        if index is None:
+            return
+        try:
+            container_widget = self.query_one("#content", Container)
+        except (QueryError, ScreenStackError):
+            return
+        if not container_widget.is_attached:
+            return
+        slide = self.presentation.slides[index]
+        self.log("Pre-rendering slide", {"index": index})
+        widget = self._render_slide(slide)
+        widget.display = False
+        self._mount_slide(container_widget, index, widget)
+        self.slide_cache.add(index, widget, nbytes=slide.estimated_size)
+
+    def _next_slide_to_prerender(self) -> int | None:
+        """Index of the closest neighbour that is worth rendering in advance."""
+        if not self.slide_cache.enabled:
+            return None
+        for distance in range(1, self.slide_cache.size + 1):
+            for index in (self.slide_index + distance, self.slide_index - distance):
+                if not 0 <= index < self.presentation.slides_count:
+                    continue
+                if index in self.slide_cache:
+                    continue
+                slide = self.presentation.slides[index]
+                if slide.cacheable and self.slide_cache.fits(slide.estimated_size):
+                    return index
+        return None
+
+    @property
+    def working_dir(self) -> Path:
+        """Directory in which commands and scripts are executed."""
+        return self.execution.working_dir
+
+    @property
+    def output_cache(self) -> OutputCache | None:
+        """On-disk cache of the outputs of executable slides (if enabled)."""
+        return self.execution.output_cache
+
+    @property
+    def kernel_pool(self) -> KernelPool | None:
+        """Processes to run Python slides in (if None, they run in the app process)."""
+        return self.execution.kernel_pool
+
+    @property
+    def shell_session(self) -> ShellSession | None:
+        """Shell running all shell slides (if None, each runs in a new shell)."""
+        return self.execution.shell_session
+
+    @property
+    def follower(self) -> Follower | None:
+        """Receives the state of the presenter's session (if following).
+
+        The slides are then not executed, they show the presenter's output.
+        """
+        return self.execution.follower
+
     @property
     def current_slide(self) -> Slide:
         return self.presentation.slides[self.slide_index]
@@ -105,7 +495,7 @@ class PresentationApp(App):
     def action_shell(self):
         """Run a shell in the alternate screen"""
         with self.suspend():
-            _, shell = shellingham.detect_shell()
+            _, shell = detect_shell()
             subprocess.run(
                 shell, shell=True, capture_output=False, cwd=self.working_dir
             )
@@ -113,6 +503,7 @@ class PresentationApp(App):
     def action_reload(self) -> None:
         """Reload current slide"""
         self.current_slide.reload()
+        self.slide_cache.pop(self.slide_index)
         self._update_slide()
 
     def action_next_slide(self) -> None:
@@ -127,19 +518,25 @@ class PresentationApp(App):
         """Go to the first slide."""
         self.slide_index = 0
 
+    def go_to_slide(self, index: int) -> None:
+        """Show the slide (without rendering the ones in between)."""
+        if self.follower is None:
+            self.slide_index = max(0, min(index, self.presentation.slides_count - 1))
+
     def action_last_slide(self) -> None:
         """Got to the last slide"""
         self.slide_index = self.presentation.slides_count - 1
 
     def action_edit(self) -> None:
         """Edit the current slide's source code"""
-        if self.current_slide.path:
+        if self.current_slide.file_path:
             with self.suspend():
                 click.edit(
                     filename=[str(self.current_slide.path)],
                     editor=os.environ.get("EDITOR"),
                 )
             self.current_slide.reload()
+        self.slide_cache.pop(self.slide_index)
         self._update_slide()
 
     def action_run(self) -> None:
@@ -149,43 +546,229 @@ class PresentationApp(App):
         """
         if self.current_slide.runnable:
             self.current_slide.toggle_output()
+            self._remember_display_mode(self.slide_index)
+            self.slide_cache.pop(self.slide_index)
             self._update_slide()
             # No need to refresh() - update_slide() handles the refresh
 
+    def restore_session(self, state: SessionState) -> None:
+        """Continue from the state of a previous session.
+
+        The executable slides are put back in output mode only if their output
+        is in the output cache, so that nothing runs when the app starts.
+        """
+        slides = self.presentation.slides
+        for index, mode in state.display_modes.items():
+            if index >= len(slides):
+                continue
+            slide = slides[index]
+            if not isinstance(slide, ExecutableSlide) or not slide.runnable:
+                continue
+            if mode == "output" and (
+                self.output_cache is None
+                or (key := state.outputs.get(index)) is None
+                or key not in self.output_cache
+            ):
+                continue
+            slide.display_mode = mode
+        self._restored_scroll = dict(state.scroll)
+        self.slide_index = max(0, min(state.slide_index, len(slides) - 1))
+
+    def _remember_display_mode(self, index: int) -> None:
+        slide = self.presentation.slides[index]
+        if self.session_store is None or not isinstance(slide, ExecutableSlide):
+            return
+        output = None
+        if slide.display_mode == "output" and self._geometry is not None:
+            columns, rows = slide.output_geometry(
+                columns=self._geometry[0], rows=self._geometry[1]
+            )
+            output = slide.persistent_key(self.execution, columns=columns, rows=rows)
+        self.session_store.set_display_mode(index, slide.display_mode, output=output)
+
+    def action_cancel(self) -> None:
+        """Cancel the commands running in the background"""
+        self.workers.cancel_group(self, "exec")
+        self._hide_search()
+
+    def _current_output(self) -> OutputView | None:
+        """The output view of the displayed slide (if any)."""
+        try:
+            container_widget = self.query_one("#content", Container)
+        except QueryError:
+            return None
+        for child in container_widget.children:
+            if not child.display:
+                continue
+            if isinstance(child, OutputView):
+                return child
+            views = child.query(OutputView)
+            if views:
+                return views.last()
+        return None
+
+    def _hide_search(self) -> None:
+        # Only mounted while searching (an idle input would take the focus)
+        for search in self.query("#search"):
+            search.remove()
+            self.set_focus(None)
+
+    def action_search_output(self) -> None:
+        """Search for a text in the output of the current slide"""
+        if self._current_output() is None:
+            self.notify("No output to search in.")
+            return
+        if not self.query("#search"):
+            search = Input(placeholder="Search in the output", id="search")
+            self.mount(search, before=self.query_one(Footer))
+        self.query_one("#search", Input).focus()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        if event.input.id != "search":
+            return
+        self._hide_search()
+        output = self._current_output()
+        if output is not None and event.value:
+            if not output.search(event.value):
+                self.notify(f"Not found: {event.value}", severity="warning")
+
+    def _search_again(self, *, backwards: bool) -> None:
+        output = self._current_output()
+        if output is None or not output.query_text:
+            return
+        if not output.search(output.query_text, backwards=backwards):
+            self.notify(f"Not found: {output.query_text}", severity="warning")
+
+    def action_next_match(self) -> None:
+        """Go to the next match of the output search"""
+        self._search_again(backwards=False)
+
+    def action_previous_match(self) -> None:
+        """Go to the previous match of the output search"""
+        self._search_again(backwards=True)
+
+    def action_output_end(self) -> None:
+        """Scroll to the end of the output of the current slide"""
+        if (output := self._current_output()) is not None:
+            output.scroll_end(animate=False)
+
     def _update_slide(self) -> None:
-        """Render the current slide and update the view."""
+        """Show the current slide (rendering it if not cached) and update the view."""
         try:
             container_widget = self.query_one("#content", Container)
             if not container_widget.is_attached:
                 return
-            container_widget.remove_children()
-            # No need to refresh() - mounting will trigger automatic refresh
+            start = time.perf_counter()
+            with tracer.span("update_slide", index=self.slide_index):
+                slide = self.current_slide
+                self.slide_cache.retain(self.slide_index)
+                content_widget = self.slide_cache.get(self.slide_index)
+                cached = content_widget is not None
+                if content_widget is None:
+                    self.log(
+                        "Rendering slide",
+                        {"type": slide.__class__.__name__} | slide.model_dump(),
+                    )
+                    content_widget = self._render_slide(slide)
+                    self._mount_slide(
+                        container_widget, self.slide_index, content_widget
+                    )
+                    # No need to refresh() - mounting will trigger automatic refresh
+                    if slide.cacheable:
+                        self.slide_cache.add(
+                            self.slide_index,
+                            content_widget,
+                            nbytes=slide.estimated_size,
+                        )
+                content_widget.display = True
+                stale_widgets = []
+                for child in container_widget.children:
+                    if child is content_widget:
+                        continue
+                    if self.slide_cache.holds(child):
+                        child.display = False
+                    else:
+                        stale_widgets.append(child)
+                container_widget.remove_children(stale_widgets)
+                self.sub_title = (
+                    f"{self.slide_index + 1} / {self.presentation.slides_count}"
+                )
+
+                if self.session_store is not None:
+                    # Only in memory, written later in the background
+                    self.session_store.set_slide_index(self.slide_index)
+                columns, rows = self._slide_geometry()
+                self.lookahead.schedule(
+                    self, self.slide_index, columns=columns, rows=rows
+                )
+                if self.presentation.lazy:
+                    self.run_worker(
+                        functools.partial(self.presentation.prefetch, self.slide_index),
+                        group="prefetch",
+                        thread=True,
+                        exclusive=True,
+                        exit_on_error=False,
+                    )
+            self.last_update_duration = time.perf_counter() - start
+            spans = tracer.spans_since(start, thread_id=threading.get_ident())
             self.log(
-                "Rendering slide",
-                {"type": self.current_slide.__class__.__name__}
-                | self.current_slide.model_dump(),
+                "Slide displayed",
+                {
+                    "index": self.slide_index,
+                    "cached": cached,
+                    "duration": self.last_update_duration,
+                    "timings": {span.name: span.duration for span in spans},
+                },
             )
-            columns = self.size.width - 2  # For scrollbar
-            rows = (
-                self.size.height - bool(self.enable_footer) - bool(self.enable_header)
+            self.query_one("#timings", Static).update(
+                f"Slide {self.slide_index + 1}"
+                f"{' (cached)' if cached else ''}: {format_spans(spans)}"
             )
-            content_widget = self.current_slide.render(
-                app=self, columns=columns, rows=rows
-            )
-            container_widget.mount(content_widget)
-            self.sub_title = (
-                f"{self.slide_index + 1} / {self.presentation.slides_count}"
-            )
-
-            Path(".current_slide").write_text(str(self.slide_index))
+            if self.broadcaster is not None:
+                self._publish_state()
         except (QueryError, ScreenStackError):
             pass
 
+    def _mount_slide(
+        self, container_widget: Container, index: int, widget: Widget
+    ) -> None:
+        """Show the widget of the slide in the container (possibly hidden)."""
+        container_widget.mount(widget)
+        if self.session_store is not None:
+            # Remembered as it changes (the widgets are gone on exit)
+            self.watch(
+                widget,
+                "scroll_y",
+                functools.partial(self.session_store.set_scroll, index),
+                init=False,
+            )
+        if (offset := self._restored_scroll.pop(index, None)) is not None:
+            widget.call_after_refresh(widget.scroll_to, y=offset, animate=False)
+
+    def _slide_geometry(self) -> tuple[int, int]:
+        """Columns and rows available for the slide content."""
+        return slide_geometry(
+            self.size.width,
+            self.size.height,
+            header=self.enable_header,
+            footer=self.enable_footer,
+        )
+
+    def _render_slide(self, slide: Slide) -> Widget:
+        """Create the widget tree for a slide, using the current app size."""
+        columns, rows = self._geometry = self._slide_geometry()
+        return slide.render(app=self, columns=columns, rows=rows)
+
     def action_toggle_footer(self) -> None:
         """Show / hide the application footer"""
         self.enable_footer = not self.enable_footer
         self.query_one(Footer).display = self.enable_footer
 
+    def action_toggle_timings(self) -> None:
+        """Show / hide the timings of the current slide"""
+        self.show_timings = not self.show_timings
+        self.query_one("#timings", Static).display = self.show_timings
+
     def action_toggle_header(self) -> None:
         """Show / hide the application header"""
         self.enable_header = not self.enable_header
@@ -0,0 +1,182 @@
+"""Sharing the state of a presenter's session with followers (`--broadcast` / `--follow`).
+
+The presenter's app publishes the current slide, its display mode and the output
+of its execution (as JSON lines) on a Unix socket. The followers render
+that state without executing anything, so the code runs once for any number
+of viewers (e.g. the apps served with `--serve --follow`).
+"""
+
+import json
+import logging
+import queue
+import select
+import socket
+import threading
+from pathlib import Path
+from typing import Any, Callable, Final
+
+logger = logging.getLogger(__name__)
+
+SEND_TIMEOUT: Final[float] = 1.0
+"""Time (in seconds) after which a follower not reading the state is dropped."""
+
+RECONNECT_INTERVAL: Final[float] = 1.0
+"""How often (in seconds) a follower tries to reach a presenter that is not running."""
+
+
+class Broadcaster:
+    """Publishes the state of the presenter's session to the connected followers.
+
+    The followers get the last state when they connect, then every change.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        path.unlink(missing_ok=True)  # Left by a previous session
+        self._listener.bind(str(path))
+        self._listener.listen()
+        self._followers: list[socket.socket] = []
+        self._messages: queue.Queue[bytes | None] = queue.Queue()
+        self._last: dict[str, Any] | None = None
+        self._thread = threading.Thread(
+            target=self._run, name="clippt-broadcast", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def followers_count(self) -> int:
+        return len(self._followers)
+
+    def publish(self, state: dict[str, Any]) -> bool:
+        """Send the state to the followers (unless unchanged).
+
+        Returns:
+            Whether the state changed.
+        """
+        if state == self._last:
+            return False
+        self._last = state
+        self._messages.put(json.dumps(state).encode("utf-8") + b"\n")
+        return True
+
+    def _run(self) -> None:
+        last_message = None
+        while True:
+            ready, _, _ = select.select([self._listener], [], [], 0.05)
+            if ready:
+                try:
+                    follower, _ = self._listener.accept()
+                except OSError:
+                    return  # Closed
+                follower.settimeout(SEND_TIMEOUT)
+                if last_message is not None:
+                    self._send(follower, last_message)
+                self._followers.append(follower)
+            while True:
+                try:
+                    message = self._messages.get_nowait()
+                except queue.Empty:
+                    break
+                if message is None:
+                    return
+                last_message = message
+                for follower in list(self._followers):
+                    self._send(follower, message)
+
+    def _send(self, follower: socket.socket, message: bytes) -> None:
+        try:
+            follower.sendall(message)
+        except OSError:
+            logger.info("Follower disconnected")
+            follower.close()
+            if follower in self._followers:
+                self._followers.remove(follower)
+
+    def close(self) -> None:
+        self._messages.put(None)
+        self._thread.join()
+        self._listener.close()
+        for follower in self._followers:
+            follower.close()
+        self._followers.clear()
+        self.path.unlink(missing_ok=True)
+
+
+class SharedOutput:
+    """Output of the presenter's execution, as shown by the followers.
+
+    It has the attributes of `OutputStream` read by `StreamingOutput`.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.is_error = False
+        self.done = False
+        self.version = 0
+
+    def update(self, *, text: str, is_error: bool, done: bool) -> None:
+        self.text = text
+        self.is_error = is_error
+        self.done = done
+        self.version += 1
+
+
+class Follower:
+    """Receives the state of the presenter's session (in a thread).
+
+    It connects (and reconnects) to the presenter as long as it is not closed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.outputs: dict[str, SharedOutput] = {}
+        """Outputs received from the presenter, by hash of the slide source."""
+
+        self._closed = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def output(self, source_hash: str) -> SharedOutput:
+        """The output for the source (empty until the presenter shares it)."""
+        if (output := self.outputs.get(source_hash)) is None:
+            output = self.outputs[source_hash] = SharedOutput()
+        return output
+
+    def start(self, on_state: Callable[[dict[str, Any]], None]) -> None:
+        """Start receiving the states, passed to `on_state` (called in the thread)."""
+        self._thread = threading.Thread(
+            target=self._run, args=(on_state,), name="clippt-follow", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, on_state: Callable[[dict[str, Any]], None]) -> None:
+        while not self._closed.is_set():
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                    conn.connect(str(self.path))
+                    self._receive(conn, on_state)
+            except OSError:
+                pass  # Presenter not started (or gone)
+            self._closed.wait(RECONNECT_INTERVAL)
+
+    def _receive(
+        self, conn: socket.socket, on_state: Callable[[dict[str, Any]], None]
+    ) -> None:
+        buffer = b""
+        while not self._closed.is_set():
+            ready, _, _ = select.select([conn], [], [], 0.1)
+            if not ready:
+                continue
+            data = conn.recv(65536)
+            if not data:
+                return
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            if lines:
+                # Only the last state matters
+                on_state(json.loads(lines[-1]))
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
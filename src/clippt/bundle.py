@@ -0,0 +1,242 @@
+"""Single-file presentation bundles (see `clippt build`).
+
+A bundle is an uncompressed ZIP archive holding the validated presentation
+model, the sources of the slides, their data files converted to Arrow IPC
+and (optionally) the outputs of the executable slides. It is memory-mapped
+when shown, and each slide is read from the mapping when it is first needed,
+so the start does not depend on the size of the presentation.
+"""
+
+import io
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zipfile
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final
+
+from clippt.cache import clippt_version
+from clippt.model import PresentationModel, SlideModel
+from clippt.tracing import tracer
+
+if TYPE_CHECKING:
+    from clippt.presentation import Presentation
+
+BUNDLE_FORMAT: Final[int] = 1
+"""Version of the bundle layout (bump when incompatible)."""
+
+BUNDLE_SUFFIX: Final[str] = ".clippt"
+
+MANIFEST: Final[str] = "manifest.json"
+
+DATA_SUFFIXES: Final[frozenset[str]] = frozenset(
+    {".csv", ".pq", ".parquet", ".arrow", ".ipc", ".feather"}
+)
+"""Data files, stored in the bundle as Arrow IPC."""
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+"""Local file header of a ZIP member (followed by the name and extra field)."""
+
+_ALIGNMENT: Final[int] = 64
+"""Alignment of the members in the file, so that Arrow can use them in place."""
+
+_PADDING_EXTRA_ID: Final[int] = 0xD935
+"""ID of the extra field padding the local headers (as used by zipalign)."""
+
+
+class BundleError(ValueError):
+    """The file is not a (compatible) bundle."""
+
+
+class Bundle:
+    """Memory-mapped bundle, giving access to its members without copying them."""
+
+    def __init__(self, path: Path):
+        self.path = path.absolute()
+        with open(self.path, "rb") as f:
+            try:
+                with zipfile.ZipFile(f) as archive:
+                    infos = archive.infolist()
+            except zipfile.BadZipFile as ex:
+                raise BundleError(f"{path} is not a clippt bundle") from ex
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._members: dict[str, tuple[int, int]] = {}
+        """Offset and size of the (stored) members, by name."""
+
+        for info in infos:
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise BundleError(f"{path}: {info.filename} is compressed")
+            header = _LOCAL_HEADER.unpack_from(self._map, info.header_offset)
+            name_length, extra_length = header[-2:]
+            offset = info.header_offset + _LOCAL_HEADER.size + name_length
+            self._members[info.filename] = (offset + extra_length, info.file_size)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._members
+
+    def read(self, name: str) -> memoryview:
+        """The content of the member (a view of the mapped file)."""
+        try:
+            offset, size = self._members[name]
+        except KeyError:
+            raise FileNotFoundError(f"{self.path}: no member {name}") from None
+        return memoryview(self._map)[offset : offset + size]
+
+    def read_file(self, path: Path) -> memoryview:
+        """The content of the member at the path (as set on the bundled slides)."""
+        return self.read(path.relative_to(self.path).as_posix())
+
+    def manifest(self) -> dict[str, Any]:
+        try:
+            manifest = json.loads(bytes(self.read(MANIFEST)))
+        except (FileNotFoundError, ValueError) as ex:
+            raise BundleError(f"{self.path}: invalid manifest") from ex
+        if manifest.get("format") != BUNDLE_FORMAT:
+            raise BundleError(
+                f"{self.path}: unsupported bundle format {manifest.get('format')}"
+                f" (built by clippt {manifest.get('clippt_version')})"
+            )
+        return manifest
+
+
+def load_bundle(path: Path | str, *, lazy: bool = False) -> "Presentation":
+    """Create the presentation from a bundle (reading the slides from the mapping)."""
+    from clippt.presentation import Presentation
+    from clippt.slides import ExecutableSlide, Slide
+
+    with tracer.span("load_bundle", path=path, lazy=lazy):
+        bundle = Bundle(Path(path))
+        manifest = bundle.manifest()
+        model = PresentationModel.model_validate(manifest["model"])
+        slides = []
+        for slide_model in model.slides:
+            assert isinstance(slide_model, SlideModel)  # Normalized by `build`
+            # Always lazy: the reader is set after the creation
+            slide = Slide.from_model(slide_model, base_path=bundle.path, lazy=True)
+            if slide.path:
+                slide._reader = bundle.read_file
+            slides.append(slide)
+        for entry in manifest.get("outputs", []):
+            slide = slides[entry["slide"]]
+            if isinstance(slide, ExecutableSlide):
+                slide.ensure_loaded()
+                data = json.loads(bytes(bundle.read(entry["member"])))
+                key = slide._output_key(columns=entry["columns"], rows=entry["rows"])
+                slide._store_output(key, (data["output"], data["is_error"]))
+        if not lazy:
+            for slide in slides:
+                slide.ensure_loaded()
+        return Presentation(
+            title=model.title,
+            slides=slides,
+            # The commands run next to the bundle
+            slide_base_path=bundle.path.parent,
+            source_path=bundle.path,
+            lazy=lazy,
+        )
+
+
+def _data_to_arrow(path: Path) -> bytes:
+    import polars as pl
+
+    match path.suffix:
+        case ".csv":
+            data = pl.scan_csv(path)
+        case ".pq" | ".parquet":
+            data = pl.scan_parquet(path)
+        case _:
+            data = pl.scan_ipc(path)
+    buffer = io.BytesIO()
+    # Uncompressed, so that it is used in place from the mapping
+    data.collect().write_ipc(buffer, compression="uncompressed")
+    return buffer.getvalue()
+
+
+def build_bundle(
+    source: Path,
+    target: Path,
+    *,
+    outputs: Iterable[tuple[int, int, int, tuple[str, bool]]] = (),
+) -> dict[str, Any]:
+    """Write the presentation (a file or directory) as a bundle.
+
+    Args:
+        outputs: Index of the slide, columns, rows (of the inline output)
+            and the result of the execution to include.
+
+    Returns:
+        The manifest of the bundle.
+    """
+    model = PresentationModel.from_path(source)
+    base_path = source.absolute()
+    if not base_path.is_dir():
+        base_path = base_path.parent
+    members: dict[str, bytes] = {}
+    slide_models = []
+    for index, slide_model in enumerate(model.expand(base_path)):
+        if isinstance(slide_model, str):
+            slide_model = SlideModel(path=Path(slide_model))
+        if slide_model.path:
+            path = base_path / slide_model.path
+            if path.suffix in DATA_SUFFIXES:
+                member = f"data/{index}.arrow"
+                members[member] = _data_to_arrow(path)
+            else:
+                # The name is kept, as it determines the type of the slide
+                member = f"slides/{index}/{path.name}"
+                members[member] = path.read_text(encoding="utf-8").encode("utf-8")
+            slide_model = slide_model.model_copy(update={"path": Path(member)})
+        slide_models.append(slide_model)
+    manifest: dict[str, Any] = {
+        "format": BUNDLE_FORMAT,
+        "clippt_version": clippt_version(),
+        "model": PresentationModel(title=model.title, slides=slide_models).model_dump(
+            mode="json", exclude_none=True
+        ),
+        "outputs": [],
+    }
+    for index, columns, rows, (output, is_error) in outputs:
+        member = f"outputs/{index}-{columns}x{rows}.json"
+        members[member] = json.dumps({"output": output, "is_error": is_error}).encode(
+            "utf-8"
+        )
+        manifest["outputs"].append(
+            {"slide": index, "columns": columns, "rows": rows, "member": member}
+        )
+    members[MANIFEST] = json.dumps(manifest, indent=2).encode("utf-8")
+    _write_archive(target, members)
+    return manifest
+
+
+def _aligned_info(name: str, offset: int, size: int) -> zipfile.ZipInfo:
+    """Member whose data (after the header at the offset) is aligned."""
+    info = zipfile.ZipInfo(name)
+    info.external_attr = 0o644 << 16
+    start = offset + _LOCAL_HEADER.size + len(name.encode("utf-8"))
+    if size * 1.05 > zipfile.ZIP64_LIMIT:
+        start += 20  # Zip64 extra field, added by `zipfile`
+    padding = -start % _ALIGNMENT
+    if padding:
+        if padding < 4:
+            padding += _ALIGNMENT
+        info.extra = struct.pack("<2H", _PADDING_EXTRA_ID, padding - 4)
+        info.extra += bytes(padding - 4)
+    return info
+
+
+def _write_archive(target: Path, members: dict[str, bytes]) -> None:
+    """Write the (uncompressed) archive atomically."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            with zipfile.ZipFile(f, "w", compression=zipfile.ZIP_STORED) as archive:
+                for name, data in members.items():
+                    archive.writestr(_aligned_info(name, f.tell(), len(data)), data)
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
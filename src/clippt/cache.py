@@ -0,0 +1,233 @@
+"""Persistent (on-disk) caches: outputs and compiled code of executable slides, presentation models."""
+
+import functools
+import hashlib
+import importlib.util
+import json
+import marshal
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from types import CodeType
+from typing import Any, Final
+
+CACHE_FORMAT: Final[int] = 1
+"""Version of the stored data (bump when incompatible)."""
+
+RELEVANT_ENV_VARS: Final[tuple[str, ...]] = (
+    "PATH",
+    "VIRTUAL_ENV",
+    "CONDA_PREFIX",
+    "PYTHONPATH",
+    "LANG",
+    "LC_ALL",
+    "TERM",
+)
+"""Environment variables that are likely to affect the output of the commands."""
+
+
+def cache_dir() -> Path:
+    """Directory of the clippt caches (`$CLIPPT_CACHE_DIR` or the user cache dir)."""
+    if directory := os.environ.get("CLIPPT_CACHE_DIR"):
+        return Path(directory)
+    if sys.platform == "win32" and (local_app_data := os.environ.get("LOCALAPPDATA")):
+        return Path(local_app_data) / "clippt" / "cache"
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "clippt"
+
+
+@functools.cache
+def clippt_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("clippt")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write the file so that readers never see it partially written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class OutputCache:
+    """Content-addressed store of the execution results (output and error flag).
+
+    The results are keyed by everything that should affect them: the slide type
+    and source, the working directory, the terminal size and the relevant
+    environment variables.
+    """
+
+    def __init__(self, directory: Path | None = None):
+        self.directory = (directory or cache_dir()) / "outputs"
+
+    @staticmethod
+    def key(
+        *,
+        kind: str,
+        source: str,
+        cwd: Path | None,
+        columns: int,
+        rows: int,
+        limits: tuple[int, ...],
+    ) -> str:
+        """Key of the output (`limits`: how much of it is kept, see `OutputLimits`)."""
+        description = {
+            "format": CACHE_FORMAT,
+            "kind": kind,
+            "source": source,
+            "cwd": str(Path(cwd).absolute()) if cwd else None,
+            "columns": columns,
+            "rows": rows,
+            "limits": list(limits),
+            "env": {name: os.environ.get(name) for name in RELEVANT_ENV_VARS},
+            "python": sys.version,
+        }
+        return hashlib.sha256(
+            json.dumps(description, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> tuple[str, bool] | None:
+        """The stored output and error flag (if any)."""
+        try:
+            data = json.loads(self._path(key).read_text(encoding="utf-8"))
+            return data["output"], data["is_error"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, output: str, is_error: bool) -> None:
+        data = {"output": output, "is_error": is_error}
+        write_atomic(self._path(key), json.dumps(data).encode("utf-8"))
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+
+class CodeCache:
+    """Compiled code of Python slides, by hash of the source and file name.
+
+    The code objects are kept in memory and, like the `__pycache__` directories,
+    stored on disk (unless `sys.dont_write_bytecode` is set) with the magic
+    number of the interpreter.
+    """
+
+    MAX_IN_MEMORY: Final[int] = 1024
+
+    def __init__(self, directory: Path | None = None):
+        self._directory = directory
+        self._memory: OrderedDict[str, CodeType] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        # Resolved on use, the global cache is created on import
+        return (self._directory or cache_dir()) / "bytecode"
+
+    @staticmethod
+    def key(source: str, filename: str) -> str:
+        description = (
+            f"{CACHE_FORMAT}\0{sys.implementation.cache_tag}\0{filename}\0{source}"
+        )
+        return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pyc"
+
+    def _read(self, key: str) -> CodeType | None:
+        try:
+            data = self._path(key).read_bytes()
+        except OSError:
+            return None
+        magic = importlib.util.MAGIC_NUMBER
+        if not data.startswith(magic):
+            return None
+        try:
+            code = marshal.loads(data[len(magic) :])
+        except (EOFError, ValueError, TypeError):
+            return None
+        return code if isinstance(code, CodeType) else None
+
+    def compile(self, source: str, filename: str) -> CodeType:
+        """The compiled source (raising `SyntaxError` if it is not valid)."""
+        key = self.key(source, filename)
+        with self._lock:
+            if (code := self._memory.get(key)) is not None:
+                self._memory.move_to_end(key)
+                return code
+        if (code := self._read(key)) is None:
+            code = compile(source, filename, "exec", dont_inherit=True)
+            if not sys.dont_write_bytecode:
+                try:
+                    write_atomic(
+                        self._path(key),
+                        importlib.util.MAGIC_NUMBER + marshal.dumps(code),
+                    )
+                except OSError:
+                    pass  # Read-only cache, the code is still usable
+        with self._lock:
+            self._memory[key] = code
+            while len(self._memory) > self.MAX_IN_MEMORY:
+                self._memory.popitem(last=False)
+        return code
+
+
+code_cache = CodeCache()
+"""The cache used by the Python slides."""
+
+
+class ModelCache:
+    """Validated presentation models, by hash of the manifest and clippt version.
+
+    The models are stored (with marshal) as their JSON-compatible dump,
+    so that the manifest does not need to be parsed again.
+    """
+
+    def __init__(self, directory: Path | None = None):
+        self._directory = directory
+
+    @property
+    def directory(self) -> Path:
+        return (self._directory or cache_dir()) / "models"
+
+    @staticmethod
+    def key(content: bytes, *, suffix: str) -> str:
+        description = (
+            f"{CACHE_FORMAT}\0{clippt_version()}\0{sys.implementation.cache_tag}"
+            f"\0{suffix}\0"
+        ).encode("utf-8")
+        return hashlib.sha256(description + content).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.bin"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        try:
+            data = marshal.loads(self._path(key).read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def put(self, key: str, data: dict[str, Any]) -> None:
+        try:
+            write_atomic(self._path(key), marshal.dumps(data))
+        except OSError:
+            pass  # Read-only cache
+
+
+model_cache = ModelCache()
+"""The cache used by `PresentationModel.from_path`."""
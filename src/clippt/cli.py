@@ -1,48 +1,354 @@
 from pathlib import Path
+import shutil
 import sys
 import shlex
-from typing import Callable
+from typing import Callable, TYPE_CHECKING
 
 import click
 
-from clippt.app import PresentationApp
-from clippt.presentation import Presentation
+# The heavy modules (textual, pydantic, ...) are imported in the commands
+# so that `--help` and shell completion stay fast.
+if TYPE_CHECKING:
+    from clippt.app import PresentationApp
+    from clippt.presentation import Presentation
+
+SOURCE_TYPE = click.Path(
+    exists=True,
+    file_okay=True,
+    dir_okay=True,
+    path_type=Path,
+)
+
+
+class DefaultCommandGroup(click.Group):
+    """Group of commands that runs the default one if no other is named.
+
+    This keeps `clippt SOURCE` working next to `clippt warm SOURCE` etc.
+    """
+
+    def __init__(self, *args, default_command: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if (
+            args
+            and args[0] not in self.commands
+            and args[0] not in ctx.help_option_names
+        ):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
 
 
 def common_options(func: Callable) -> Callable:
     func = click.option("--no-footer", is_flag=True, help="Disable footer.")(func)
     func = click.option("--no-header", is_flag=True, help="Disable header.")(func)
     func = click.option(
-        "--continue", "-c", "continue_", is_flag=True, help="Continue from last slide."
+        "--continue",
+        "-c",
+        "continue_",
+        is_flag=True,
+        help="Continue where the last session of the presentation stopped.",
     )(func)
     func = click.option("--serve", "-s", is_flag=True, help="Start a web server")(func)
     func = click.option("-v", "--verbose", count=True)(func)
     func = click.option("--theme", "-t", help="Theme to select")(func)
+    func = click.option(
+        "--no-live-reload", is_flag=True, help="Do not watch the slide files."
+    )(func)
+    func = click.option(
+        "--cache-size",
+        type=int,
+        default=2,
+        show_default=True,
+        help="Number of neighbouring slides kept rendered (0 disables).",
+    )(func)
+    func = click.option(
+        "--cache-max-mb",
+        type=int,
+        default=64,
+        show_default=True,
+        help="Memory budget (in MB) of the rendered slides kept.",
+    )(func)
+    func = click.option(
+        "--kernels",
+        type=int,
+        default=0,
+        show_default=True,
+        help="Number of processes running Python slides (0 = run in the app).",
+    )(func)
+    func = click.option(
+        "--preload",
+        multiple=True,
+        help="Module to import in the Python processes in advance (repeatable).",
+    )(func)
+    func = click.option(
+        "--shell-session",
+        is_flag=True,
+        help="Run all shell slides in one shell (keeping cd, variables, ...).",
+    )(func)
+    func = click.option(
+        "--output-cache",
+        is_flag=True,
+        help="Reuse (and store) the outputs of executable slides across runs.",
+    )(func)
+    func = click.option(
+        "--lookahead",
+        type=int,
+        default=0,
+        show_default=True,
+        help="Number of upcoming slides whose output is computed in advance.",
+    )(func)
+    func = click.option(
+        "--trace",
+        "trace_path",
+        type=click.Path(dir_okay=False, path_type=Path),
+        help="Write the timings of loading, rendering and execution (Chrome trace).",
+    )(func)
+    func = click.option(
+        "--broadcast",
+        "broadcast_path",
+        type=click.Path(dir_okay=False, path_type=Path),
+        help="Share this session with the followers connecting to the socket.",
+    )(func)
+    func = click.option(
+        "--follow",
+        "follow_path",
+        type=click.Path(dir_okay=False, path_type=Path),
+        help="Show the session shared on the socket (without running anything).",
+    )(func)
     return func
 
 
-@click.command()
-@click.argument(
-    "source",
-    type=click.Path(
-        exists=True,
-        file_okay=True,
-        dir_okay=True,
-        path_type=Path,
-    ),
-)
+@click.group(cls=DefaultCommandGroup, default_command="show")
+def clippt():
+    """CLI slideshows in Python and Textual.
+
+    Without a command, `show` is used: clippt [OPTIONS] SOURCE
+    """
+
+
+@clippt.command()
+@click.argument("source", type=SOURCE_TYPE)
+@click.option("--lazy", is_flag=True, help="Read the slide files only when needed.")
 @common_options
-def clippt(*, source: Path, verbose: int, **kwargs):
+def show(*, source: Path, verbose: int, lazy: bool, **kwargs):
     """Run a presentation in the command-line."""
+    from clippt.presentation import Presentation
+
     _apply_log_level(verbose)
-    presentation = Presentation.from_path(source)
+    presentation = Presentation.from_path(source, lazy=lazy)
     _run_cli(
         presentation=presentation,
         **kwargs,
     )
 
 
-def create_cli_command(presentation: Presentation):
+@clippt.command()
+@click.argument("source", type=SOURCE_TYPE)
+@click.option("--columns", type=int, help="Terminal width (default: current).")
+@click.option("--rows", type=int, help="Terminal height (default: current).")
+@click.option("--jobs", "-j", type=int, default=4, show_default=True)
+@click.option("--no-footer", is_flag=True, help="Footer will be disabled.")
+@click.option("--no-header", is_flag=True, help="Header will be disabled.")
+@click.option("-v", "--verbose", count=True)
+def warm(
+    *,
+    source: Path,
+    columns: int | None,
+    rows: int | None,
+    jobs: int,
+    no_footer: bool,
+    no_header: bool,
+    verbose: int,
+):
+    """Run the executable slides, storing their outputs in the cache.
+
+    The outputs are then reused with `--output-cache`, if the terminal
+    has the same size.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    from clippt.app import slide_geometry
+    from clippt.cache import OutputCache
+    from clippt.presentation import Presentation
+    from clippt.slides import ExecutableSlide, ExecutionContext
+
+    _apply_log_level(verbose)
+    presentation = Presentation.from_path(source)
+    context = ExecutionContext(
+        working_dir=presentation.slide_base_path, output_cache=OutputCache()
+    )
+    terminal_size = shutil.get_terminal_size()
+    slide_columns, slide_rows = slide_geometry(
+        columns or terminal_size.columns,
+        rows or terminal_size.lines,
+        header=not no_header,
+        footer=not no_footer,
+    )
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        for index, slide in enumerate(presentation.slides):
+            if not isinstance(slide, ExecutableSlide):
+                continue
+            if not slide.runnable or not slide.cache or slide.alt_screen:
+                continue
+            future = slide.prefetch_output(
+                context, columns=slide_columns, rows=slide_rows, executor=executor
+            )
+            if future is not None:
+                futures[future] = index
+        for future in as_completed(futures):
+            index = futures[future]
+            status = "failed" if future.result()[1] else "ok"
+            click.echo(f"Slide {index + 1}: {status}")
+
+
+@clippt.command()
+@click.argument("source", type=SOURCE_TYPE)
+@click.option(
+    "--output",
+    "-o",
+    "target",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Bundle to write (default: SOURCE with the .clippt suffix).",
+)
+@click.option(
+    "--with-outputs",
+    is_flag=True,
+    help="Include the outputs stored in the cache (see `clippt warm`).",
+)
+@click.option("--columns", type=int, help="Terminal width (default: current).")
+@click.option("--rows", type=int, help="Terminal height (default: current).")
+@click.option("--no-footer", is_flag=True, help="Footer will be disabled.")
+@click.option("--no-header", is_flag=True, help="Header will be disabled.")
+@click.option("-v", "--verbose", count=True)
+def build(
+    *,
+    source: Path,
+    target: Path | None,
+    with_outputs: bool,
+    columns: int | None,
+    rows: int | None,
+    no_footer: bool,
+    no_header: bool,
+    verbose: int,
+):
+    """Write the presentation as a single file, quick to start.
+
+    The bundle holds the slides and their data (as Arrow IPC) and is shown
+    like any presentation: clippt talk.clippt
+    """
+    from clippt.bundle import BUNDLE_SUFFIX, build_bundle
+
+    _apply_log_level(verbose)
+    if target is None:
+        target = source.absolute()
+        if target.is_dir():
+            target = target / "presentation.toml"
+        target = target.with_suffix(BUNDLE_SUFFIX)
+    outputs = []
+    if with_outputs:
+        from clippt.app import slide_geometry
+        from clippt.cache import OutputCache
+        from clippt.presentation import Presentation
+        from clippt.slides import ExecutableSlide, ExecutionContext
+
+        presentation = Presentation.from_path(source)
+        output_cache = OutputCache()
+        context = ExecutionContext(
+            working_dir=presentation.slide_base_path, output_cache=output_cache
+        )
+        terminal_size = shutil.get_terminal_size()
+        slide_columns, slide_rows = slide_geometry(
+            columns or terminal_size.columns,
+            rows or terminal_size.lines,
+            header=not no_header,
+            footer=not no_footer,
+        )
+        for index, slide in enumerate(presentation.slides):
+            if not isinstance(slide, ExecutableSlide) or not slide.runnable:
+                continue
+            output_columns, output_rows = slide.output_geometry(
+                columns=slide_columns, rows=slide_rows
+            )
+            key = slide.persistent_key(
+                context, columns=output_columns, rows=output_rows
+            )
+            if key is not None and (result := output_cache.get(key)):
+                outputs.append((index, output_columns, output_rows, result))
+            else:
+                click.echo(f"Slide {index + 1}: no output in the cache", err=True)
+    manifest = build_bundle(source, target, outputs=outputs)
+    click.echo(
+        f"{target}: {len(manifest['model']['slides'])} slides,"
+        f" {len(manifest['outputs'])} outputs"
+    )
+
+
+@clippt.command()
+@click.argument("source", type=SOURCE_TYPE)
+@click.option(
+    "--output",
+    "-o",
+    "directory",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path("export"),
+    show_default=True,
+    help="Directory to write the files to.",
+)
+@click.option(
+    "--format",
+    "-f",
+    "formats",
+    type=click.Choice(["svg", "html", "text"]),
+    multiple=True,
+    help="Format of the files (repeatable, default: svg).",
+)
+@click.option("--columns", type=int, default=120, show_default=True)
+@click.option("--rows", type=int, default=36, show_default=True)
+@click.option("--run", is_flag=True, help="Show the output of executable slides.")
+@click.option("--theme", "-t", help="Theme to select")
+@click.option("--jobs", "-j", type=int, help="Number of processes (default: CPUs).")
+@click.option("--no-footer", is_flag=True, help="Footer will be disabled.")
+@click.option("--no-header", is_flag=True, help="Header will be disabled.")
+@click.option("-v", "--verbose", count=True)
+def export(
+    *,
+    source: Path,
+    directory: Path,
+    formats: tuple[str, ...],
+    columns: int,
+    rows: int,
+    run: bool,
+    theme: str | None,
+    jobs: int | None,
+    no_footer: bool,
+    no_header: bool,
+    verbose: int,
+):
+    """Render every slide to files, without a terminal.
+
+    Useful for handouts or to check a presentation in CI.
+    """
+    from clippt.export import ExportOptions, export_presentation
+
+    _apply_log_level(verbose)
+    options = ExportOptions(
+        directory=directory,
+        formats=formats or ("svg",),  # type: ignore[arg-type]
+        columns=columns,
+        rows=rows,
+        run=run,
+        theme=theme,
+        header=not no_header,
+        footer=not no_footer,
+    )
+    paths = export_presentation(source, options, jobs=jobs)
+    click.echo(f"{len(paths)} files written to {directory}")
+
+
+def create_cli_command(presentation: "Presentation"):
     """Create a CLI command for a concrete presentation.
 
     Useful when using clippt as a library."""
@@ -66,25 +372,100 @@ def create_cli_command(presentation: Presentation):
 
 def _run_cli(
     *,
-    presentation: Presentation,
+    presentation: "Presentation",
     no_footer: bool,
     no_header: bool,
     continue_: bool,
     theme: str | None,
     serve: bool,
+    cache_size: int,
+    cache_max_mb: int,
+    lookahead: int,
+    no_live_reload: bool,
+    output_cache: bool,
+    kernels: int,
+    preload: tuple[str, ...],
+    shell_session: bool,
+    trace_path: Path | None,
+    broadcast_path: Path | None,
+    follow_path: Path | None,
 ):
-    app = PresentationApp(presentation=presentation)
-    if theme:
-        app.theme = theme
-    app.enable_footer = not no_footer
-    app.enable_header = not no_header
-    if continue_ and Path(".current_slide").exists():
-        app.slide_index = int(Path(".current_slide").read_text())
-    app.slide_index = min(app.slide_index, len(presentation.slides) - 1)
+    from clippt.app import PresentationApp
+    from clippt.broadcast import Broadcaster, Follower
+    from clippt.cache import OutputCache
+    from clippt.kernel import KernelPool
+    from clippt.session import ShellSession
+    from clippt.state import SessionStore
+
+    if shell_session and sys.platform == "win32":
+        raise click.UsageError("--shell-session is not supported on Windows.")
+    if (broadcast_path or follow_path) and sys.platform == "win32":
+        raise click.UsageError("--broadcast / --follow are not supported on Windows.")
+    if broadcast_path and follow_path:
+        raise click.UsageError("--broadcast and --follow are mutually exclusive.")
+    if broadcast_path and serve:
+        raise click.UsageError(
+            "The served apps can only follow (present in a terminal with --broadcast)."
+        )
+
+    # Followers do not run anything
+    executing = follow_path is None
+
+    def create_app() -> PresentationApp:
+        # The processes and sessions are not shared by the served apps
+        # (nor is the stored state, only kept for the terminal session)
+        session_store = (
+            SessionStore.for_presentation(presentation)
+            if executing and not serve
+            else None
+        )
+        app = PresentationApp(
+            presentation=presentation,
+            cache_size=cache_size,
+            cache_max_bytes=cache_max_mb * 1024 * 1024,
+            lookahead=lookahead,
+            live_reload=not no_live_reload,
+            output_cache=OutputCache() if output_cache else None,
+            kernel_pool=(
+                KernelPool(kernels, preload=preload) if kernels and executing else None
+            ),
+            shell_session=(
+                ShellSession(cwd=presentation.slide_base_path)
+                if shell_session and executing
+                else None
+            ),
+            trace_path=trace_path,
+            broadcaster=Broadcaster(broadcast_path) if broadcast_path else None,
+            follower=Follower(follow_path) if follow_path else None,
+            session_store=session_store,
+        )
+        if theme:
+            app.theme = theme
+        app.enable_footer = not no_footer
+        app.enable_header = not no_header
+        if continue_:
+            app.restore_session(
+                (session_store or SessionStore.for_presentation(presentation)).load()
+            )
+        return app
 
     if serve:
-        from textual_serve.server import Server
+        _serve(presentation, create_app)
+    else:
+        create_app().run()
+
 
+def _serve(
+    presentation: "Presentation", create_app: Callable[[], "PresentationApp"]
+) -> None:
+    """Serve the app in the browser, with a process forked for each connection.
+
+    (On Windows, each connection starts clippt again with the same arguments.)
+    """
+    from textual_serve.server import Server
+
+    zygote = None
+    if sys.platform == "win32":
         command_args = sys.argv
         # Remove serve flag from args (could be either --serve or -s)
         for flag in ["--serve", "-s"]:
@@ -94,16 +475,25 @@ def _run_cli(
             except ValueError:
                 pass
         serve_command = shlex.join(command_args)
+    else:
+        from clippt.zygote import Zygote
+
+        presentation.prepare()
+        zygote = Zygote(create_app)
+        zygote.start()
+        serve_command = zygote.client_command
+    try:
         server = Server(
             serve_command,
             host="localhost",
             port=23456,
-            title=serve_command,
+            title=presentation.title or "clippt",
             public_url=None,
         )
         server.serve()
-    else:
-        app.run()
+    finally:
+        if zygote is not None:
+            zygote.stop()
 
 
 def _apply_log_level(verbose: int) -> None:
@@ -0,0 +1,238 @@
+"""Data (table) slides, including data too large to be read into memory."""
+
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Final, Literal, Optional
+
+import polars as pl
+from textual.widget import Widget
+from textual.widgets import Markdown
+from textual_fastdatatable import DataTable
+from textual_fastdatatable.backend import DataTableBackend, PolarsBackend
+
+from clippt.slides import Slide
+
+if TYPE_CHECKING:
+    from clippt.app import PresentationApp
+
+
+OUT_OF_CORE_THRESHOLD: Final[int] = 64 * 1024 * 1024
+"""Size of data files (in bytes) from which they are not read into memory."""
+
+
+class LazyPolarsBackend(DataTableBackend[pl.LazyFrame]):
+    """Read-only data table backend materializing only the rows being displayed.
+
+    The rows are collected from the lazy frame in pages (with a small read-ahead),
+    only a few of which are kept in memory. The column widths are measured
+    on the first page only.
+    """
+
+    PAGE_SIZE: int = 200
+    """Number of rows collected at once."""
+
+    READ_AHEAD: int = 50
+    """Number of extra rows collected with each page."""
+
+    MAX_PAGES: int = 4
+    """Number of pages kept in memory."""
+
+    def __init__(
+        self,
+        data: pl.LazyFrame,
+        max_rows: int | None = None,
+        column_names: Sequence[str] | None = None,
+    ) -> None:
+        if column_names is not None:
+            data = data.rename(dict(zip(data.collect_schema().names(), column_names)))
+        self.data = data
+        # Served from the metadata for Parquet, a streaming count for CSV
+        self._source_row_count: int = data.select(pl.len()).collect().item()
+        self._row_count = (
+            min(self._source_row_count, max_rows)
+            if max_rows is not None
+            else self._source_row_count
+        )
+        self._columns = data.collect_schema().names()
+        self._pages: OrderedDict[int, pl.DataFrame] = OrderedDict()
+        self._column_content_widths: list[int] = []
+        self._render_markup = None
+
+    @classmethod
+    def from_pydict(
+        cls,
+        data: Mapping[str, Sequence[Any]],
+        max_rows: int | None = None,
+        column_names: Sequence[str] | None = None,
+    ) -> "LazyPolarsBackend":
+        return cls(
+            pl.from_dict(data).lazy(), max_rows=max_rows, column_names=column_names
+        )
+
+    @property
+    def source_data(self) -> pl.LazyFrame:
+        return self.data
+
+    @property
+    def source_row_count(self) -> int:
+        return self._source_row_count
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    @property
+    def columns(self) -> Sequence[str]:
+        return self._columns
+
+    @property
+    def column_content_widths(self) -> Sequence[int]:
+        if not self._column_content_widths:
+            sample = PolarsBackend.from_dataframe(self._page(0))
+            sample.render_markup = self.render_markup
+            self._column_content_widths = list(sample.column_content_widths)
+        return self._column_content_widths
+
+    def _page(self, number: int) -> pl.DataFrame:
+        """Rows of a page (including the read-ahead), collecting them if needed."""
+        if number in self._pages:
+            self._pages.move_to_end(number)
+        else:
+            self._pages[number] = self.data.slice(
+                number * self.PAGE_SIZE, self.PAGE_SIZE + self.READ_AHEAD
+            ).collect()
+            while len(self._pages) > self.MAX_PAGES:
+                self._pages.popitem(last=False)
+        return self._pages[number]
+
+    def _locate(self, row_index: int) -> tuple[pl.DataFrame, int]:
+        """Find a collected page containing the row (and the row position in it)."""
+        if row_index < 0 or row_index >= self._row_count:
+            raise IndexError(
+                f"Cannot get row={row_index} in table with {self._row_count} rows"
+            )
+        number, offset = divmod(row_index, self.PAGE_SIZE)
+        # Rows just after a page are covered by its read-ahead
+        if number not in self._pages and (number - 1) in self._pages:
+            previous = self._pages[number - 1]
+            if offset + self.PAGE_SIZE < len(previous):
+                return previous, offset + self.PAGE_SIZE
+        return self._page(number), offset
+
+    def get_row_at(self, index: int) -> Sequence[Any]:
+        page, offset = self._locate(index)
+        return list(page.row(offset))
+
+    def get_column_at(self, index: int) -> Sequence[Any]:
+        if index < 0 or index >= len(self._columns):
+            raise IndexError(f"Cannot get column={index} in table")
+        column = self.data.select(pl.nth(index)).head(self._row_count)
+        return column.collect().to_series().to_list()
+
+    def get_cell_at(self, row_index: int, column_index: int) -> Any:
+        if column_index < 0 or column_index >= len(self._columns):
+            raise IndexError(f"Cannot get column={column_index} in table")
+        page, offset = self._locate(row_index)
+        return page.row(offset)[column_index]
+
+    def sort(
+        self, by: list[tuple[str, Literal["ascending", "descending"]]] | str
+    ) -> None:
+        if isinstance(by, str):
+            self.data = self.data.sort(by)
+        else:
+            self.data = self.data.sort(
+                [column for column, _ in by],
+                descending=[direction == "descending" for _, direction in by],
+            )
+        self._pages.clear()
+
+    def append_column(self, label: str, default: Any | None = None) -> int:
+        raise NotImplementedError("The lazy backend is read-only.")
+
+    def append_rows(self, records: Iterable[Iterable[Any]]) -> list[int]:
+        raise NotImplementedError("The lazy backend is read-only.")
+
+    def drop_row(self, row_index: int) -> None:
+        raise NotImplementedError("The lazy backend is read-only.")
+
+    def update_cell(self, row_index: int, column_index: int, value: Any) -> None:
+        raise NotImplementedError("The lazy backend is read-only.")
+
+
+class DataSlide(Slide):
+    """Slide containing data displayed as a table."""
+
+    data: Optional[pl.DataFrame | pl.LazyFrame] = None
+
+    out_of_core: bool | None = None
+    """If true, the file is scanned (not read) and only the visible rows are collected.
+
+    By default, this is done for files larger than `OUT_OF_CORE_THRESHOLD`.
+    """
+
+    model_config = {"arbitrary_types_allowed": True}
+    scrollbar: Literal["own"] = "own"
+
+    @property
+    def estimated_size(self) -> int:
+        if isinstance(self.data, pl.DataFrame):
+            return int(self.data.estimated_size())
+        if isinstance(self.data, pl.LazyFrame):
+            # Only a few pages of rows are in memory
+            return len(self.title or "")
+        return super().estimated_size
+
+    def _render_impl(
+        self, app: "PresentationApp", *, columns: int, rows: int
+    ) -> Widget:
+        if self.data is not None:
+            if isinstance(self.data, pl.LazyFrame):
+                backend = LazyPolarsBackend(self.data)
+            else:
+                backend = PolarsBackend.from_dataframe(self.data)
+            dt = DataTable(backend=backend, zebra_stripes=True, show_cursor=False)
+            dt.can_focus = False
+            return dt
+        else:
+            return Markdown("No data.")
+
+    def _read_bundled(self) -> pl.DataFrame | pl.LazyFrame:
+        """Read the Arrow IPC stored in a bundle (see `clippt.bundle`).
+
+        The columns refer to the memory-mapped bundle (they are not copied),
+        so only the pages of the file that are used are read from the disk.
+        """
+        import pyarrow as pa
+
+        view = self._reader(self.path)
+        with pa.ipc.open_file(pa.py_buffer(view)) as reader:
+            data = pl.from_arrow(reader.read_all(), rechunk=False)
+        assert isinstance(data, pl.DataFrame)
+        out_of_core = self.out_of_core
+        if out_of_core is None:
+            out_of_core = len(view) > OUT_OF_CORE_THRESHOLD
+        return data.lazy() if out_of_core else data
+
+    def _load(self) -> None:
+        if self.path and self._reader is not None:
+            self.data = self._read_bundled()
+        elif self.path:
+            out_of_core = self.out_of_core
+            if out_of_core is None:
+                out_of_core = self.path.stat().st_size > OUT_OF_CORE_THRESHOLD
+            match self.path.suffix, out_of_core:
+                case ".csv", False:
+                    self.data = pl.read_csv(self.path)
+                case ".csv", True:
+                    self.data = pl.scan_csv(self.path)
+                case ".pq" | ".parquet", False:
+                    self.data = pl.read_parquet(self.path)
+                case ".pq" | ".parquet", True:
+                    self.data = pl.scan_parquet(self.path)
+                case ".arrow" | ".ipc" | ".feather", False:
+                    self.data = pl.read_ipc(self.path)
+                case ".arrow" | ".ipc" | ".feather", True:
+                    self.data = pl.scan_ipc(self.path)
+                case _:
+                    raise NotImplementedError()
@@ -0,0 +1,163 @@
+"""Rendering the slides without a terminal (see `clippt export`).
+
+The slides are shown by the app running with Textual's headless driver,
+and the screen is saved as SVG, HTML or plain text. The slides are split
+into chunks rendered by a pool of processes, each running its own app.
+"""
+
+import asyncio
+import io
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, Literal
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from clippt.app import PresentationApp
+    from clippt.presentation import Presentation
+
+ExportFormat = Literal["svg", "html", "text"]
+
+EXTENSIONS: Final[dict[str, str]] = {"svg": "svg", "html": "html", "text": "txt"}
+
+
+@dataclass(frozen=True)
+class ExportOptions:
+    """How the slides are exported (the same in all processes)."""
+
+    directory: Path
+    formats: tuple[ExportFormat, ...] = ("svg",)
+    columns: int = 120
+    rows: int = 36
+    run: bool = False
+    """Show the executable slides in output mode (running them)."""
+
+    theme: str | None = None
+    header: bool = True
+    footer: bool = True
+
+    def file_name(self, index: int, count: int, export_format: ExportFormat) -> str:
+        digits = max(3, len(str(count)))
+        return f"slide-{index + 1:0{digits}}.{EXTENSIONS[export_format]}"
+
+
+def _capture(app: "PresentationApp") -> "Console":
+    """Console with the current screen recorded (as in `App.export_screenshot`)."""
+    from rich.console import Console
+
+    width, height = app.size
+    console = Console(
+        width=width,
+        height=height,
+        file=io.StringIO(),
+        force_terminal=True,
+        color_system="truecolor",
+        record=True,
+        legacy_windows=False,
+        safe_box=False,
+    )
+    console.print(
+        app.screen._compositor.render_update(
+            full=True, screen_stack=app._background_screens, simplify=True
+        )
+    )
+    return console
+
+
+async def _export_slides(
+    presentation: "Presentation", indices: Sequence[int], options: ExportOptions
+) -> list[Path]:
+    from clippt.app import PresentationApp
+    from clippt.slides import ExecutableSlide
+    from clippt.widgets import StreamingOutput
+
+    app = PresentationApp(presentation, cache_size=0, live_reload=False)
+    if options.theme:
+        app.theme = options.theme
+    app.enable_header = options.header
+    app.enable_footer = options.footer
+    count = presentation.slides_count
+    written = []
+    async with app.run_test(size=(options.columns, options.rows)) as pilot:
+        for index in indices:
+            slide = presentation.slides[index]
+            if (
+                options.run
+                and isinstance(slide, ExecutableSlide)
+                and slide.runnable
+                and not slide.alt_screen
+            ):
+                slide.display_mode = "output"
+            if index == app.slide_index:
+                # Already shown when the app started (possibly in code mode)
+                app._update_slide()
+            else:
+                app.slide_index = index
+            await pilot.pause()
+            if app.query(StreamingOutput):
+                await app.workers.wait_for_complete()
+                # Let the view show the end of the output
+                await pilot.pause(StreamingOutput.REFRESH_INTERVAL * 2)
+            console = _capture(app)
+            title = f"{presentation.title or 'clippt'} ({index + 1} / {count})"
+            for export_format in options.formats:
+                path = options.directory / options.file_name(
+                    index, count, export_format
+                )
+                match export_format:
+                    case "svg":
+                        content = console.export_svg(title=title, clear=False)
+                    case "html":
+                        content = console.export_html(inline_styles=True, clear=False)
+                    case "text":
+                        content = console.export_text(clear=False)
+                path.write_text(content, encoding="utf-8")
+                written.append(path)
+    return written
+
+
+def _export_chunk(
+    source: Path, indices: Sequence[int], options: ExportOptions
+) -> list[Path]:
+    """Export some slides of the presentation (in a worker process)."""
+    from clippt.presentation import Presentation
+
+    presentation = Presentation.from_path(source, lazy=True)
+    return asyncio.run(_export_slides(presentation, indices, options))
+
+
+def export_presentation(
+    source: Path, options: ExportOptions, *, jobs: int | None = None
+) -> list[Path]:
+    """Export all slides of the presentation, in parallel.
+
+    Args:
+        jobs: Number of processes (default: number of CPUs); with 1,
+            the slides are exported in this process.
+
+    Returns:
+        The files written, in the order of the slides.
+    """
+    from clippt.presentation import Presentation
+
+    count = Presentation.from_path(source, lazy=True).slides_count
+    if not count:
+        return []
+    jobs = max(1, min(jobs or os.cpu_count() or 1, count))
+    options.directory.mkdir(parents=True, exist_ok=True)
+    # Contiguous chunks, so that each process reads only its slides
+    size = -(-count // jobs)
+    chunks = [range(start, min(start + size, count)) for start in range(0, count, size)]
+    if jobs == 1:
+        return [
+            path for chunk in chunks for path in _export_chunk(source, chunk, options)
+        ]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(
+            _export_chunk, [source] * len(chunks), chunks, [options] * len(chunks)
+        )
+        return [path for paths in results for path in paths]
@@ -0,0 +1,200 @@
+"""Pool of pre-started Python processes to run the code of Python slides."""
+
+import base64
+import json
+import logging
+import marshal
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from types import CodeType
+from typing import Callable
+
+from clippt.utils import OutputBuffer, OutputLimits, get_terminal_env_vars
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).with_name("_kernel_worker.py")
+
+
+class KernelError(Exception):
+    """The execution in a kernel was interrupted (timeout, cancellation, crash)."""
+
+
+class Kernel:
+    """A worker Python process accepting code over a pipe."""
+
+    def __init__(self, *, preload: Iterable[str] = ()):
+        self.process = subprocess.Popen(
+            # -P: the modules next to the script would shadow the user's
+            [sys.executable, "-P", str(WORKER_SCRIPT), *preload],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,  # Would garble the TUI
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self.messages: queue.Queue[dict | None] = queue.Queue()
+        """Messages from the worker (None when it exits)."""
+
+        threading.Thread(target=self._read_messages, daemon=True).start()
+
+    def _read_messages(self) -> None:
+        assert self.process.stdout
+        for line in self.process.stdout:
+            try:
+                self.messages.put(json.loads(line))
+            except ValueError:
+                pass  # Not from us
+        self.messages.put(None)
+
+    def send(self, request: dict) -> None:
+        assert self.process.stdin
+        self.process.stdin.write(json.dumps(request) + "\n")
+        self.process.stdin.flush()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.wait()
+
+
+class KernelPool:
+    """Pre-started Python processes executing the code of Python slides.
+
+    Each execution gets fresh globals, but the imported modules stay loaded
+    in the process, so that repeated runs are fast. A kernel that times out,
+    is cancelled or crashes is killed and replaced with a new one.
+    """
+
+    def __init__(
+        self, size: int = 2, *, preload: Iterable[str] = (), timeout: float = 60.0
+    ):
+        self.size = size
+        self.preload = list(preload)
+        """Modules imported by each kernel when it starts."""
+
+        self.timeout = timeout
+        """Maximum duration (in seconds) of an execution."""
+
+        self._kernels: set[Kernel] = set()
+        """All the kernels (idle or running code), killed by `shutdown`."""
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._idle: queue.Queue[Kernel] = queue.Queue()
+        for _ in range(size):
+            if (kernel := self._start_kernel()) is not None:
+                self._idle.put(kernel)
+
+    def _start_kernel(self) -> Kernel | None:
+        """A new kernel (None if the pool was shut down)."""
+        kernel = Kernel(preload=self.preload)
+        with self._lock:
+            if not self._closed:
+                self._kernels.add(kernel)
+                return kernel
+        kernel.kill()
+        return None
+
+    def _discard(self, kernel: Kernel) -> None:
+        kernel.kill()
+        with self._lock:
+            self._kernels.discard(kernel)
+
+    def execute(
+        self,
+        code: str | CodeType,
+        *,
+        filename: str = "<slide>",
+        columns: int,
+        rows: int,
+        limits: OutputLimits = OutputLimits(),
+        on_output: Callable[[str], None] | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> tuple[str, bool]:
+        """Run the code in one of the kernels (waiting for one to be free).
+
+        Args:
+            code: The source, or the already compiled code (with its own file name).
+            filename: Shown in the tracebacks.
+            limits: How much of the output to return (all of it is passed to `on_output`).
+            on_output: Called with the output (stdout and stderr) as it arrives.
+            cancelled: When set, the execution is interrupted.
+
+        Returns:
+            The output and whether the execution failed.
+        """
+        kernel: Kernel | None = self._idle.get()
+        assert kernel is not None
+        output = OutputBuffer(limits)
+        try:
+            if isinstance(code, CodeType):
+                # The kernels run the same interpreter
+                payload = {"bytecode": base64.b64encode(marshal.dumps(code)).decode()}
+            else:
+                payload = {"code": code}
+            kernel.send(
+                payload
+                | {
+                    "filename": filename,
+                    "globals": {"WIDTH": columns, "HEIGHT": rows},
+                    "env": get_terminal_env_vars(columns, rows),
+                }
+            )
+            is_error = self._collect(kernel, output, on_output, cancelled)
+        except (KernelError, OSError) as ex:
+            self._discard(kernel)
+            kernel = self._start_kernel()
+            message = f"\nError: {ex}\n"
+            output.write(message)
+            if on_output:
+                on_output(message)
+            is_error = True
+        finally:
+            if kernel is not None:
+                self._idle.put(kernel)
+        return output.text, is_error
+
+    def _collect(
+        self,
+        kernel: Kernel,
+        output: OutputBuffer,
+        on_output: Callable[[str], None] | None,
+        cancelled: threading.Event | None,
+    ) -> bool:
+        """Gather the output messages until the execution is done."""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            if cancelled is not None and cancelled.is_set():
+                raise KernelError("Cancelled.")
+            if (remaining := deadline - time.monotonic()) <= 0:
+                raise KernelError(f"Timeout, not finished in {self.timeout} s.")
+            try:
+                message = kernel.messages.get(timeout=min(remaining, 0.1))
+            except queue.Empty:
+                continue
+            if message is None:
+                raise KernelError("The kernel process died.")
+            match message["type"]:
+                case "ready":
+                    if message["errors"]:
+                        logger.warning("Preloading failed: %s", message["errors"])
+                case "output":
+                    output.write(message["data"])
+                    if on_output:
+                        on_output(message["data"])
+                case "done":
+                    return message["is_error"]
+
+    def shutdown(self) -> None:
+        """Kill all kernels, including those still running code."""
+        with self._lock:
+            self._closed = True
+            kernels, self._kernels = self._kernels, set()
+        for kernel in kernels:
+            kernel.kill()
@@ -0,0 +1,67 @@
+"""Speculative execution of the slides coming next."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from clippt.slides import ExecutableSlide
+
+if TYPE_CHECKING:
+    from clippt.app import PresentationApp
+
+
+class LookaheadScheduler:
+    """Runs the inline output of the upcoming executable slides in the background.
+
+    While slide K is displayed, the prefetchable slides K+1..K+N are executed
+    in a bounded thread pool with the current terminal size, so that switching
+    them to the output is instant. When the size changes, the executions
+    not started yet are dropped (the results are keyed by source and size).
+    """
+
+    def __init__(self, *, size: int, max_workers: int = 2):
+        self.size = size
+        """Number of upcoming slides to execute; 0 disables the scheduler."""
+
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: list[Future] = []
+        self._geometry: tuple[int, int] | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def schedule(
+        self, app: "PresentationApp", index: int, *, columns: int, rows: int
+    ) -> None:
+        """Start executing the slides following the one at `index`."""
+        if not self.enabled:
+            return
+        if self._geometry != (columns, rows):
+            self.cancel()
+            self._geometry = (columns, rows)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="clippt-lookahead"
+            )
+        self._futures = [future for future in self._futures if not future.done()]
+        for slide in app.presentation.slides[index + 1 : index + 1 + self.size]:
+            if isinstance(slide, ExecutableSlide) and slide.prefetchable:
+                future = slide.prefetch_output(
+                    app.execution, columns=columns, rows=rows, executor=self._executor
+                )
+                if future is not None:
+                    app.log("Prefetching slide output", {"title": slide.title})
+                    self._futures.append(future)
+
+    def cancel(self) -> None:
+        """Drop the executions that have not started yet."""
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+
+    def shutdown(self) -> None:
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,22 +1,25 @@
 """Static description of the presentation as pydantic models."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from pathlib import Path
 from typing import Literal
 import io
+import logging
 import tomllib
 import json
 
+from clippt.cache import ModelCache, model_cache
 
-class SlideModel(BaseModel):
-    """Description of a single slide."""
+logger = logging.getLogger(__name__)
+
+
+class SlideOptions(BaseModel):
+    """Options of slides (shared by the slides included with a pattern)."""
 
     model_config = {"extra": "forbid"}
 
     type: Literal["python", "shell", "markdown", "code"] | None = None
-    source: str | None = None
-    path: Path | None = None
-    """Path relative to the presentation."""
+    """By default, given by the extension of the file (or `markdown` for a source)."""
 
     title: str | None = None
     language: str | None = None
@@ -26,20 +29,93 @@ class SlideModel(BaseModel):
     display_mode: Literal["code", "output"] | None = None
     runnable: bool | None = None
     wait_for_key: bool | None = None
+    prefetch: bool | None = None
+    """Whether the output may be computed in advance (see `--lookahead`)."""
+
+    cache: bool | None = None
+    """Whether the output may be stored on disk and reused across runs."""
+
+    out_of_core: bool | None = None
+    """For data slides, whether to scan the file instead of reading it into memory."""
+
+    output_head_lines: int | None = None
+    """For executable slides, number of lines kept from the beginning of the output."""
+
+    output_tail_lines: int | None = None
+    """For executable slides, number of lines kept from the end of the output."""
 
     classes: list[str] | None = None
 
 
+class SlideModel(SlideOptions):
+    """Description of a single slide."""
+
+    source: str | None = None
+    path: Path | None = None
+    """Path relative to the presentation."""
+
+
+class IncludeModel(SlideOptions):
+    """Slides of the files matching a pattern, in the order of their paths.
+
+    The options apply to all of them; `{stem}` and `{name}` in the title
+    are replaced with the stem and name of each file.
+    """
+
+    include: str
+    """Glob pattern relative to the presentation (`**` for any subdirectory) or a directory."""
+
+    def expand(self, base_path: Path) -> list[SlideModel]:
+        """Slides of the files currently matching (hidden ones excluded)."""
+        pattern = self.include
+        if (base_path / pattern).is_dir():
+            pattern = f"{pattern.rstrip('/')}/*"
+        relative_paths = sorted(
+            path.relative_to(base_path)
+            for path in base_path.glob(pattern)
+            if path.is_file()
+        )
+        options = self.model_dump(exclude_unset=True, exclude={"include"})
+        slides = []
+        for path in relative_paths:
+            if any(part.startswith(".") for part in path.parts):
+                continue
+            fields = dict(options)
+            if title := fields.get("title"):
+                fields["title"] = title.replace("{stem}", path.stem).replace(
+                    "{name}", path.name
+                )
+            slides.append(SlideModel(path=path, **fields))
+        if not slides:
+            logger.warning("No slide files match %s", self.include)
+        return slides
+
+
 class PresentationModel(BaseModel):
     """Description of a presentation."""
 
     title: str | None = None
-    slides: list[SlideModel | str] = Field(default_factory=list)
+    slides: list[SlideModel | IncludeModel | str] = Field(default_factory=list)
+
+    def expand(self, base_path: Path) -> list[SlideModel | str]:
+        """The slides, with the included files found (relative to `base_path`)."""
+        slides: list[SlideModel | str] = []
+        for slide in self.slides:
+            if isinstance(slide, IncludeModel):
+                slides.extend(slide.expand(base_path))
+            else:
+                slides.append(slide)
+        return slides
 
     @classmethod
     def from_path(
-        cls, path_or_file: Path | str | io.TextIOBase, /
+        cls,
+        path_or_file: Path | str | io.TextIOBase,
+        /,
+        *,
+        cache: ModelCache | None = model_cache,
     ) -> "PresentationModel":
+        """Parse and validate the description (reusing the cached model if unchanged)."""
         if isinstance(path_or_file, io.TextIOBase):
             content = path_or_file.read()
             data = tomllib.loads(content)
@@ -50,12 +126,28 @@ class PresentationModel(BaseModel):
             if path.is_dir() and (path / "presentation.toml").exists():
                 path = path / "presentation.toml"
 
-            match path.suffix.lower():
+            suffix = path.suffix.lower()
+            if suffix not in (".toml", ".json"):
+                raise ValueError(f"Cannot parse {path}")
+            content = path.read_bytes()
+            if cache is not None:
+                key = cache.key(content, suffix=suffix)
+                if (dump := cache.get(key)) is not None:
+                    try:
+                        # Validating the dump is much faster than parsing
+                        # the TOML (and than `model_construct`)
+                        model = PresentationModel.model_validate(dump)
+                    except ValidationError:
+                        pass  # Corrupted entry
+                    else:
+                        logger.debug("Model of %s read from the cache", path)
+                        return model
+            match suffix:
                 case ".toml":
-                    data = tomllib.loads(path.read_text())
-                    return PresentationModel.model_validate(data)
-                case ".json":
-                    data = json.loads(path.read_text())
-                    return PresentationModel.model_validate(data)
+                    data = tomllib.loads(content.decode("utf-8"))
                 case _:
-                    raise ValueError(f"Cannot parse {path}")
+                    data = json.loads(content)
+            model = PresentationModel.model_validate(data)
+            if cache is not None:
+                cache.put(key, model.model_dump(mode="json", exclude_unset=True))
+            return model
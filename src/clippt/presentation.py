@@ -1,12 +1,24 @@
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Final
 
 from pydantic import BaseModel, Field
 
+from clippt.bundle import BUNDLE_SUFFIX
 from clippt.model import PresentationModel, SlideModel
 from clippt.slides import (
     Slide,
     load_slide,
 )
+from clippt.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+LOAD_WORKERS: Final[int] = 8
+"""Number of slide files read at the same time (e.g. to hide network latency)."""
 
 
 class Presentation(BaseModel):
@@ -16,38 +28,103 @@ class Presentation(BaseModel):
     title: str | None = None
     slide_base_path: Path
 
+    source_path: Path | None = None
+    """File (or directory) the presentation was loaded from, if any."""
+
+    lazy: bool = False
+    """If true, the slide files are read only when needed (or prefetched)."""
+
+    prefetch_window: int = 5
+    """Number of slides following the current one to load in advance (in lazy mode)."""
+
     @staticmethod
-    def _create_slide(slide: SlideModel | str, *, slide_base_path: Path) -> Slide:
+    def _create_slide(
+        slide: SlideModel | str, *, slide_base_path: Path, lazy: bool = False
+    ) -> Slide:
         if isinstance(slide, str):
             path = slide_base_path / slide
-            return load_slide(path)
+            return load_slide(path, lazy=lazy)
         else:
-            return Slide.from_model(slide, base_path=slide_base_path)
+            return Slide.from_model(slide, base_path=slide_base_path, lazy=lazy)
 
     @classmethod
     def from_model(
-        cls, model: PresentationModel, *, slide_base_path: Path = Path(".")
+        cls,
+        model: PresentationModel,
+        *,
+        slide_base_path: Path = Path("."),
+        lazy: bool = False,
     ) -> "Presentation":
-        """Create the presentation from a pydantic description."""
+        """Create the presentation from a pydantic description.
+
+        Unless lazy, the slide files are read concurrently (see `LOAD_WORKERS`).
+        """
+        slide_models = model.expand(slide_base_path)
+        create_slide = functools.partial(
+            cls._create_slide, slide_base_path=slide_base_path, lazy=lazy
+        )
+        if lazy or len(slide_models) < 2:
+            slides = [create_slide(slide) for slide in slide_models]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(LOAD_WORKERS, len(slide_models)),
+                thread_name_prefix="clippt-load",
+            ) as executor:
+                # In the order of the description
+                slides = list(executor.map(create_slide, slide_models))
         return Presentation(
             title=model.title,
-            slides=[
-                cls._create_slide(slide, slide_base_path=slide_base_path)
-                for slide in model.slides
-            ],
+            slides=slides,
             slide_base_path=slide_base_path,
+            lazy=lazy,
         )
 
     @classmethod
-    def from_path(cls, path_or_file: Path | str) -> "Presentation":
-        """Load the presentation from the external file."""
-        model = PresentationModel.from_path(path_or_file)
-        slide_base_path = Path(path_or_file).absolute()
-        if not slide_base_path.is_dir():
-            slide_base_path = slide_base_path.parent
-        presentation = cls.from_model(model, slide_base_path=slide_base_path)
+    def from_path(
+        cls, path_or_file: Path | str, *, lazy: bool = False
+    ) -> "Presentation":
+        """Load the presentation from the external file (or bundle, see `clippt build`)."""
+        if Path(path_or_file).suffix == BUNDLE_SUFFIX:
+            from clippt.bundle import load_bundle
+
+            return load_bundle(path_or_file, lazy=lazy)
+        start = time.perf_counter()
+        with tracer.span("load_presentation", path=path_or_file, lazy=lazy):
+            model = PresentationModel.from_path(path_or_file)
+            slide_base_path = Path(path_or_file).absolute()
+            if not slide_base_path.is_dir():
+                slide_base_path = slide_base_path.parent
+            presentation = cls.from_model(
+                model, slide_base_path=slide_base_path, lazy=lazy
+            )
+            presentation.source_path = Path(path_or_file).absolute()
+        logger.info(
+            "Loaded %s (%d slides) in %.1f ms",
+            path_or_file,
+            presentation.slides_count,
+            (time.perf_counter() - start) * 1000,
+        )
         return presentation
 
+    def prefetch(self, index: int) -> None:
+        """Load the slides around the given one (previous + `prefetch_window` next)."""
+        start = max(index - 1, 0)
+        for slide in self.slides[start : index + self.prefetch_window + 1]:
+            slide.ensure_loaded()
+
+    def prepare(self) -> None:
+        """Load all the slides, waiting for any work done in the background.
+
+        (Needed before forking, see `clippt.zygote`.)
+        """
+        for slide in self.slides:
+            slide.prepare()
+
+    @property
+    def loaded_count(self) -> int:
+        """Number of slides already loaded."""
+        return sum(slide.loaded for slide in self.slides)
+
     @property
     def slides_count(self) -> int:
         """Total number of slides."""
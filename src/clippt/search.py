@@ -0,0 +1,204 @@
+"""Full-text search of the slides, from the command palette."""
+
+import bisect
+import difflib
+import functools
+import re
+import threading
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+from textual.command import Hit, Hits, Provider
+
+if TYPE_CHECKING:
+    from clippt.app import PresentationApp
+    from clippt.slides import Slide
+
+TITLE_WEIGHT: Final[int] = 3
+"""How many times a word of the title counts (compared to a word of the source)."""
+
+MAX_RESULTS: Final[int] = 20
+
+_WORD = re.compile(r"\w+")
+
+_SLIDE_NUMBER = re.compile(r"(?:(?:go\s*to\s*)?slide\s*)?#?(\d+)", re.IGNORECASE)
+
+
+def _words(text: str) -> list[str]:
+    return _WORD.findall(text.casefold())
+
+
+class SearchResult(NamedTuple):
+    index: int
+    """Index of the slide."""
+
+    score: int
+
+
+class SlideIndex:
+    """Inverted index of the words in the titles and sources of the slides.
+
+    Only the loaded slides are indexed; `refresh` (re)indexes the slides
+    loaded or reloaded since the previous call.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict[int, int]] = {}
+        """Number of occurrences of each word, by slide index."""
+
+        self._documents: dict[int, tuple[str | None, str]] = {}
+        """Title and source of the indexed slides."""
+
+        self._vocabulary: list[str] | None = None
+        """Sorted words (for prefix search), rebuilt when needed."""
+
+        self._lock = threading.Lock()
+        """The index is built in a thread, while the palette searches it."""
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def update(self, index: int, slide: "Slide") -> bool:
+        """Index the slide unless unloaded or unchanged.
+
+        Returns:
+            Whether the slide was (re)indexed.
+        """
+        if not slide.loaded:
+            return False
+        document = (slide.title, slide.source)
+        with self._lock:
+            if self._documents.get(index) == document:
+                return False
+            self._remove(index)
+            self._documents[index] = document
+            counts: dict[str, int] = {}
+            for word in _words(slide.title or ""):
+                counts[word] = counts.get(word, 0) + TITLE_WEIGHT
+            for word in _words(slide.source):
+                counts[word] = counts.get(word, 0) + 1
+            for word, count in counts.items():
+                self._postings.setdefault(word, {})[index] = count
+            self._vocabulary = None
+        return True
+
+    def _remove(self, index: int) -> None:
+        if (document := self._documents.pop(index, None)) is None:
+            return
+        title, source = document
+        for word in set(_words(title or "")) | set(_words(source)):
+            del self._postings[word][index]
+            if not self._postings[word]:
+                del self._postings[word]
+
+    def refresh(self, slides: Sequence["Slide"]) -> int:
+        """Index the slides loaded or changed since the last call.
+
+        Returns:
+            The number of slides (re)indexed.
+        """
+        with self._lock:
+            for index in [index for index in self._documents if index >= len(slides)]:
+                self._remove(index)
+                self._vocabulary = None
+        return sum(self.update(index, slide) for index, slide in enumerate(slides))
+
+    def _matching_words(self, term: str) -> list[str]:
+        """Indexed words starting with the term (or close to it, for typos)."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        start = bisect.bisect_left(vocabulary, term)
+        words = []
+        for word in vocabulary[start:]:
+            if not word.startswith(term):
+                break
+            words.append(word)
+        return words or difflib.get_close_matches(term, vocabulary, n=3, cutoff=0.8)
+
+    def search(self, query: str, *, limit: int = MAX_RESULTS) -> list[SearchResult]:
+        """Slides containing all the words of the query (as prefixes), best first."""
+        terms = _words(query)
+        if not terms:
+            return []
+        with self._lock:
+            scores: dict[int, int] | None = None
+            for term in terms:
+                term_scores: dict[int, int] = {}
+                for word in self._matching_words(term):
+                    # Whole words count more than prefixes
+                    weight = 2 if word == term else 1
+                    for index, count in self._postings[word].items():
+                        term_scores[index] = term_scores.get(index, 0) + count * weight
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        index: score + term_scores[index]
+                        for index, score in scores.items()
+                        if index in term_scores
+                    }
+        results = [
+            SearchResult(index, score) for index, score in (scores or {}).items()
+        ]
+        results.sort(key=lambda result: (-result.score, result.index))
+        return results[:limit]
+
+    def snippet(self, index: int, query: str, *, width: int = 60) -> str:
+        """The first line of the slide source containing a word of the query."""
+        _, source = self._documents.get(index, (None, ""))
+        terms = _words(query)
+        for line in source.splitlines():
+            folded = line.casefold()
+            if any(term in folded for term in terms):
+                line = line.strip()
+                return line if len(line) <= width else line[: width - 1] + "…"
+        return ""
+
+
+def describe(index: int, slide: "Slide") -> str:
+    """Number and title of the slide (or its first line), as listed in the palette."""
+    title = slide.title
+    if not title:
+        first_line = next(
+            (line for line in slide.source.splitlines() if line.strip()), ""
+        )
+        title = first_line.strip().lstrip("#").strip() or type(slide).__name__
+    return f"{index + 1}. {title}"
+
+
+class SlideSearch(Provider):
+    """Command palette provider: the slides containing the words typed,
+    and "go to slide N" (rendering only that slide)."""
+
+    async def search(self, query: str) -> Hits:
+        app: PresentationApp = self.app  # type: ignore[assignment]
+        if app.follower is not None:
+            return  # The presenter chooses the slide
+        slides = app.presentation.slides
+        if match := _SLIDE_NUMBER.fullmatch(query.strip()):
+            number = int(match.group(1))
+            if 1 <= number <= len(slides):
+                yield Hit(
+                    1.0,
+                    f"Go to slide {number}",
+                    functools.partial(app.go_to_slide, number - 1),
+                    help=describe(number - 1, slides[number - 1]),
+                )
+        # Slides loaded (or reloaded) since the last search
+        app.search_index.refresh(slides)
+        results = app.search_index.search(query)
+        if not results:
+            return
+        matcher = self.matcher(query)
+        best = results[0].score
+        for result in results:
+            label = describe(result.index, slides[result.index])
+            yield Hit(
+                # Below "go to slide N"
+                0.9 * result.score / best,
+                matcher.highlight(label),
+                functools.partial(app.go_to_slide, result.index),
+                text=label,
+                help=app.search_index.snippet(result.index, query),
+            )
@@ -0,0 +1,232 @@
+"""Long-lived shell shared by the shell slides (see `--shell-session`)."""
+
+import codecs
+import os
+import re
+import select
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Final
+
+from clippt.utils import (
+    OutputBuffer,
+    OutputLimits,
+    detect_shell,
+    get_terminal_env_vars,
+    open_pseudo_terminal,
+)
+
+POSIX_SHELLS: Final[frozenset[str]] = frozenset({"bash", "zsh", "sh", "dash", "ksh"})
+"""Shells understanding the commands sent by the session (others fall back to sh)."""
+
+
+def _quote(text: str) -> str:
+    """Quote the text as a single shell word."""
+    return "'" + text.replace("'", "'\\''") + "'"
+
+
+class ShellSession:
+    """A shell running for the whole presentation, executing commands one by one.
+
+    The working directory, variables, activated virtual environments etc.
+    carry over from one command to the next. The commands are read by the shell
+    from a pipe (so there is no prompt or echo), while their output goes
+    to a pseudo-terminal (so that programs keep their colours). The end of each
+    command is marked in the output by a sentinel carrying its exit status.
+
+    If the shell exits (or a command is cancelled), it is started again
+    for the next command, losing the state.
+    """
+
+    def __init__(
+        self,
+        *,
+        cwd: Path | None = None,
+        shell: str | None = None,
+        timeout: float = 60.0,
+    ):
+        self.cwd = cwd
+        self.shell = shell or self._default_shell()
+        self.timeout = timeout
+        """Maximum duration (in seconds) of a command."""
+
+        self._lock = threading.Lock()
+        self._process: subprocess.Popen | None = None
+        self._master_fd = -1
+        self._token = uuid.uuid4().hex
+        self._counter = 0
+
+    @staticmethod
+    def _default_shell() -> str:
+        try:
+            name, path = detect_shell()
+        except Exception:  # shellingham.ShellDetectionFailure
+            return "/bin/sh"
+        return path if name in POSIX_SHELLS else "/bin/sh"
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _start(self, *, columns: int, rows: int) -> None:
+        master_fd, slave_fd = open_pseudo_terminal(columns=columns, rows=rows)
+        self._process = subprocess.Popen(
+            [self.shell],
+            stdin=subprocess.PIPE,
+            stdout=slave_fd,
+            stderr=slave_fd,
+            close_fds=True,
+            cwd=self.cwd,
+            env=os.environ | get_terminal_env_vars(columns, rows),
+            start_new_session=True,  # To kill the commands with the shell
+            text=True,
+            encoding="utf-8",
+        )
+        os.close(slave_fd)
+        self._master_fd = master_fd
+
+    def _resize(self, *, columns: int, rows: int) -> None:
+        import fcntl
+        import struct
+        import termios
+
+        winsize = struct.pack("HHHH", rows, columns, 0, 0)
+        fcntl.ioctl(self._master_fd, termios.TIOCSWINSZ, winsize)
+
+    def _script(self, command: str, sentinel: str, *, columns: int, rows: int) -> str:
+        """The lines sent to the shell to run the command."""
+        exports = " ".join(
+            f"{name}={_quote(value)}"
+            for name, value in get_terminal_env_vars(columns, rows).items()
+        )
+        # Syntax errors would terminate (non-interactive) shells like dash,
+        # so the command is first parsed as a function body in a subshell.
+        check = _quote(f"__clippt_check() {{\n{command}\n}}")
+        quoted = _quote(command)
+        return (
+            f"export {exports}\n"
+            f"if ( eval {check} ) 2>/dev/null; then eval {quoted} < /dev/null;"
+            f" else ( eval {quoted} ) < /dev/null; fi\n"
+            f"printf '{sentinel}:%d\\036' $?\n"
+        )
+
+    def execute(
+        self,
+        command: str,
+        *,
+        columns: int,
+        rows: int,
+        limits: OutputLimits = OutputLimits(),
+        on_output: Callable[[str], None] | None = None,
+        cancelled: threading.Event | None = None,
+    ) -> tuple[str, bool]:
+        """Run the command in the shell (waiting for the previous one to finish).
+
+        Args:
+            limits: How much of the output to return (all of it is passed to `on_output`).
+            on_output: Called with the output as it arrives.
+            cancelled: When set, the command is interrupted (restarting the shell).
+
+        Returns:
+            The output and whether the command failed.
+        """
+        with self._lock:
+            if not self.running:
+                self.close()
+                self._start(columns=columns, rows=rows)
+            else:
+                self._resize(columns=columns, rows=rows)
+            self._counter += 1
+            sentinel = f"\x1e{self._token}-{self._counter}"
+            assert self._process and self._process.stdin
+            try:
+                self._process.stdin.write(
+                    self._script(command, sentinel, columns=columns, rows=rows)
+                )
+                self._process.stdin.flush()
+                return self._collect(
+                    sentinel, OutputBuffer(limits), on_output, cancelled
+                )
+            except OSError as ex:
+                self.close()
+                message = f"\nError: {ex}\n"
+                if on_output:
+                    on_output(message)
+                return message, True
+
+    def _collect(
+        self,
+        sentinel: str,
+        output: OutputBuffer,
+        on_output: Callable[[str], None] | None,
+        cancelled: threading.Event | None,
+    ) -> tuple[str, bool]:
+        """Read the output until the sentinel (or the end of the shell)."""
+        pattern = re.compile(re.escape(sentinel) + r":(\d+)\x1e")
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        """Decoded output that may contain the beginning of the sentinel."""
+
+        def emit(text: str) -> None:
+            if text:
+                output.write(text)
+                if on_output:
+                    on_output(text)
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            if cancelled is not None and cancelled.is_set():
+                self.close()
+                emit(pending + "\nCancelled.\n")
+                return output.text, True
+            if time.monotonic() >= deadline:
+                self.close()
+                emit(pending + f"\nTimeout, not finished in {self.timeout} s.\n")
+                return output.text, True
+            ready, _, _ = select.select([self._master_fd], [], [], 0.1)
+            if not ready:
+                continue
+            try:
+                data = os.read(self._master_fd, 4096)
+            except OSError:
+                data = b""  # Linux: EIO when the shell exited
+            if not data:
+                self.close()
+                emit(pending + decoder.decode(b"", final=True))
+                emit("\nThe shell exited.\n")
+                return output.text, True
+            pending += decoder.decode(data)
+            if match := pattern.search(pending):
+                emit(pending[: match.start()])
+                return output.text, int(match.group(1)) != 0
+            # Keep what could be a partial sentinel
+            keep = pending.rfind("\x1e")
+            if keep == -1:
+                emit(pending)
+                pending = ""
+            else:
+                emit(pending[:keep])
+                pending = pending[keep:]
+
+    def close(self) -> None:
+        """Kill the shell (and the commands started by it)."""
+        if self._process is not None:
+            if self._process.poll() is None:
+                try:
+                    os.killpg(self._process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                self._process.wait()
+            if self._process.stdin:
+                try:
+                    self._process.stdin.close()
+                except OSError:
+                    pass
+            self._process = None
+        if self._master_fd >= 0:
+            os.close(self._master_fd)
+            self._master_fd = -1
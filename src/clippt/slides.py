@@ -1,37 +1,97 @@
+import asyncio
 import contextlib
-import io
+import functools
+import hashlib
+import os
+import threading
 import traceback
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor, Future
 from contextlib import redirect_stdout
+from dataclasses import dataclass
 from io import StringIO
 from pathlib import Path
 from textwrap import dedent
+from types import CodeType
 from typing import Callable, Final, Literal, Optional, Any, TYPE_CHECKING, final, Self
 
-import polars as pl
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
-from shellingham import detect_shell
 from textual.app import App
 from textual.containers import VerticalScroll, Vertical
 from textual.widget import Widget
 from textual.widgets import Markdown, Static
-from textual_fastdatatable import DataTable
-from textual_fastdatatable.backend import PolarsBackend
 
 from clippt.utils import (
+    detect_shell,
     wait_for_key,
     patch_environment,
     get_terminal_env_vars,
     exec_in_pseudo_terminal,
     exec_in_alt_screen,
+    stream_in_pseudo_terminal,
+    OutputBuffer,
+    OutputLimits,
+    OutputStream,
 )
+from clippt.cache import code_cache
+from clippt.widgets import CachedMarkdownParser, OutputView, StreamingOutput
 from clippt.model import SlideModel
+from clippt.tracing import tracer
 
 if TYPE_CHECKING:
     from clippt.app import PresentationApp
+    from clippt.broadcast import Follower
+    from clippt.cache import OutputCache
+    from clippt.kernel import KernelPool
+    from clippt.session import ShellSession
+
+
+MAX_CACHED_OUTPUTS: Final[int] = 8
+"""Number of execution results (for different sizes) kept for each slide."""
+
+OUTPUT_MARGIN: Final[int] = 3
+"""Margin of the inline output (+1 for occasional rendering bugs)."""
+
+_PYTHON_EXEC_LOCK = threading.Lock()
+
+
+@functools.cache
+def _compile_executor() -> Executor:
+    """Thread compiling the Python slides when they are loaded."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="clippt-compile")
+
+
+if hasattr(os, "register_at_fork"):
+    # The thread does not survive in forked processes (see `clippt.zygote`)
+    os.register_at_fork(after_in_child=_compile_executor.cache_clear)
+
+
+@dataclass(frozen=True)
+class ExecutionContext:
+    """Where and how the executable slides run (see `PresentationApp.execution`).
+
+    It can be created without an app, e.g. to run the slides from the CLI.
+    """
+
+    working_dir: Path = Path(".")
+    """Directory in which commands and scripts are executed."""
+
+    output_cache: "OutputCache | None" = None
+    """On-disk cache of the outputs (if enabled)."""
+
+    kernel_pool: "KernelPool | None" = None
+    """Processes to run Python slides in (if None, they run in this process)."""
+
+    shell_session: "ShellSession | None" = None
+    """Shell running all shell slides (if None, each runs in a new shell)."""
+
+    follower: "Follower | None" = None
+    """Receives the presenter's outputs (if following): nothing is executed."""
 
 
 class Slide(ABC, BaseModel):
@@ -49,21 +109,89 @@ class Slide(ABC, BaseModel):
     scrollbar: Literal["own", "system", "none"] = "system"
     """Which scrollbars to show."""
 
+    lazy: bool = Field(default=False, exclude=True)
+    """If true, the file is not read until the slide is needed (see `ensure_loaded`)."""
+
+    _loaded: bool = PrivateAttr(default=False)
+    _reader: Callable[[Path], bytes] | None = PrivateAttr(default=None)
+    """Reads the file when it is not on the file system (see `clippt.bundle`)."""
+
+    _load_lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+    """Loading happens in the app and in the prefetch thread (only once at a time)."""
+
     @model_validator(mode="after")
     def _load_on_start(self) -> Self:
-        self._load()
+        if not self.lazy:
+            self.ensure_loaded()
         return self
 
+    @property
+    def loaded(self) -> bool:
+        """Whether the file (if any) has already been read."""
+        return self._loaded
+
+    def ensure_loaded(self) -> None:
+        """Read the file unless already done."""
+        if not self._loaded:
+            with self._load_lock:
+                # Possibly loaded by another thread while waiting
+                if not self._loaded:
+                    self.reload()
+
+    @property
+    def file_path(self) -> Path | None:
+        """The file of the slide on the file system (if any, e.g. to watch it)."""
+        return self.path if self._reader is None else None
+
+    def _read_text(self) -> str:
+        assert self.path
+        if self._reader is not None:
+            return bytes(self._reader(self.path)).decode("utf-8")
+        return self.path.read_text(encoding="utf-8")
+
     def _load(self) -> None:
         if self.path:
             try:
-                self.source = self.path.read_text(encoding="utf-8")
+                self.source = self._read_text()
             except FileNotFoundError:
                 self.source = f"File not found: {self.path}."
                 self.runnable = False
 
     def reload(self) -> None:
-        self._load()
+        with self._load_lock, tracer.span("load", slide=self.label):
+            self._load()
+            self._loaded = True
+
+    def prepare(self) -> None:
+        """Load the slide and finish any work started in the background by loading."""
+        self.ensure_loaded()
+
+    @property
+    def label(self) -> str:
+        """Short description of the slide (for logs and traces)."""
+        name = self.title or (self.path.name if self.path else None)
+        return f"{type(self).__name__}({name})" if name else type(self).__name__
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether the rendered widget can be kept and reused (or pre-rendered)."""
+        return True
+
+    @property
+    def geometry_dependent(self) -> bool:
+        """Whether the content must be re-rendered when the available size changes.
+
+        Slides that are not geometry-dependent simply reflow.
+        """
+        return False
+
+    @property
+    def estimated_size(self) -> int:
+        """Rough estimate of the memory taken by the rendered slide (in bytes)."""
+        if not self._loaded and self.file_path:
+            with contextlib.suppress(OSError):
+                return self.path.stat().st_size + len(self.title or "")
+        return len(self.source) + len(self.title or "")
 
     @final
     def render(self, app: "PresentationApp", *, columns: int, rows: int) -> Widget:
@@ -80,27 +208,30 @@ class Slide(ABC, BaseModel):
         Note:
             This method is not meant to be overridden. Override `_render_impl` instead.
         """
-        widgets = []
-        if self.title:
-            # TODO: We should not support this
-            if self.is_title_markdown:
-                widgets.append(
-                    Markdown(
-                        self.title,
-                        classes="slide-title",
+        with tracer.span("render", slide=self.label, columns=columns, rows=rows):
+            self.ensure_loaded()
+            widgets = []
+            if self.title:
+                # TODO: We should not support this
+                if self.is_title_markdown:
+                    widgets.append(
+                        Markdown(
+                            self.title,
+                            classes="slide-title",
+                        )
                     )
-                )
-                rows -= 3  # This is not correct
-            else:
-                widgets.append(Markdown(f"# {self.title}", classes="slide-title"))
-                rows -= 3
-        widgets.append(self._render_impl(app, rows=rows, columns=columns))
-        if self.scrollbar in ["own", "none"]:
-            if len(widgets) == 1:
-                return widgets[0]
-            else:
-                return Vertical(*widgets)
-        return VerticalScroll(*widgets, can_focus=False)
+                    rows -= 3  # This is not correct
+                else:
+                    widgets.append(Markdown(f"# {self.title}", classes="slide-title"))
+                    rows -= 3
+            with tracer.span("render_impl", slide=self.label):
+                widgets.append(self._render_impl(app, rows=rows, columns=columns))
+            if self.scrollbar in ["own", "none"]:
+                if len(widgets) == 1:
+                    return widgets[0]
+                else:
+                    return Vertical(*widgets)
+            return VerticalScroll(*widgets, can_focus=False)
 
     @abstractmethod
     def _render_impl(
@@ -117,7 +248,9 @@ class Slide(ABC, BaseModel):
         pass
 
     @staticmethod
-    def from_model(s: SlideModel, *, base_path: Path | None = None) -> "Slide":
+    def from_model(
+        s: SlideModel, *, base_path: Path | None = None, lazy: bool = False
+    ) -> "Slide":
         if not base_path:
             base_path = Path(".")
         if s.path:
@@ -125,6 +258,8 @@ class Slide(ABC, BaseModel):
             full_path = base_path / s.path
             return load_slide(
                 path=full_path,
+                slide_type=s.type,
+                lazy=lazy,
                 **s.model_dump(exclude_none=True, exclude={"type", "path"}),
             )
         else:
@@ -179,28 +314,46 @@ class CodeSlide(Slide):
 
     language: str | None = None
 
+    _displayed_code: tuple[str, str] | None = PrivateAttr(default=None)
+    """Hash of the source and the code without the hidden lines."""
+
+    def _load(self):
+        if self._displayed_code is not None:
+            CachedMarkdownParser.forget(self._code_markdown)
+            self._displayed_code = None
+        super()._load()
+
     def _render_impl(
         self, app: "PresentationApp", *, columns: int, rows: int
     ) -> Widget:
         return self._render_code()
 
+    @property
+    def displayed_code(self) -> str:
+        """The source without the lines hidden by `# HIDE`, `# HIDE_ABOVE` and `# HIDE_BELOW`."""
+        source_hash = hashlib.sha256(self.source.encode("utf-8")).hexdigest()
+        if self._displayed_code is None or self._displayed_code[0] != source_hash:
+            code_lines = []
+            for line in self.source.splitlines():
+                line = line.rstrip()
+                if "# HIDE_ABOVE" in line:
+                    code_lines = []
+                    continue
+                if "# HIDE_BELOW" in line:
+                    break
+                if "# HIDE" in line:
+                    continue
+                code_lines.append(line)
+            self._displayed_code = (source_hash, "\n".join(code_lines))
+        return self._displayed_code[1]
+
+    @property
+    def _code_markdown(self) -> str:
+        return f"```{self.language}\n{self.displayed_code}\n```"
+
     def _render_code(self) -> Markdown:
         # We do not need columns/rows, the Markdown widget properly formats itself
-        if self.path:
-            self.reload()
-        code_lines = []
-        for line in self.source.splitlines():
-            line = line.rstrip()
-            if "# HIDE_ABOVE" in line:
-                code_lines = []
-                continue
-            if "# HIDE_BELOW" in line:
-                break
-            if "# HIDE" in line:
-                continue
-            code_lines.append(line)
-        code = "\n".join(line for line in code_lines)
-        return Markdown(f"```{self.language}\n{code}\n```")
+        return Markdown(self._code_markdown, parser_factory=CachedMarkdownParser)
 
 
 class ExecutableSlide(CodeSlide, ABC):
@@ -223,12 +376,46 @@ class ExecutableSlide(CodeSlide, ABC):
 
     is_error: bool = False
 
-    _output: str | None = None
+    prefetch: bool = True
+    """Whether the output may be computed in advance (disable for code with side effects)."""
+
+    cache: bool = True
+    """Whether the output may be stored on disk and reused across runs (if enabled in the app)."""
+
+    output_head_lines: int = Field(default=OutputLimits().head_lines, ge=0)
+    """Number of lines kept from the beginning of the output."""
+
+    output_tail_lines: int = Field(default=OutputLimits().tail_lines, ge=0)
+    """Number of lines kept from the end of the output (the lines between are dropped)."""
+
+    _outputs: dict[tuple[str, int, int], tuple[str, bool]] = PrivateAttr(
+        default_factory=dict
+    )
+    """Results of the execution (output, is_error) by (source hash, columns, rows)."""
+
+    _pending: dict[tuple[str, int, int], Future] = PrivateAttr(default_factory=dict)
+    """Executions submitted to an executor (see `prefetch_output`), by the same key as `_outputs`."""
+
+    _streams: dict[tuple[str, int, int], OutputStream] = PrivateAttr(
+        default_factory=dict
+    )
+    """Outputs of the executions still running, by the same key as `_outputs`."""
 
     def _load(self):
-        self._output = None
+        self._outputs.clear()
+        self._pending.clear()
+        self._streams.clear()
         super()._load()
 
+    @property
+    def cacheable(self) -> bool:
+        # Rendering the output means running the code
+        return self.display_mode == "code"
+
+    @property
+    def geometry_dependent(self) -> bool:
+        return self.display_mode == "output" and not self.alt_screen
+
     def _render_impl(
         self, app: "PresentationApp", *, columns: int, rows: int
     ) -> Widget:
@@ -236,19 +423,274 @@ class ExecutableSlide(CodeSlide, ABC):
             case "code":
                 return self._render_code()
             case "output":
+                if app.execution.follower is not None:
+                    # Only the presenter runs the code (see `clippt.broadcast`)
+                    return self._render_shared(app.execution.follower, rows=rows)
                 if self.alt_screen:
                     self._exec_in_alternate_screen(app)
                     return self._render_code()
                 else:
-                    columns -= (
-                        3  # Margin of the output (+1 for occasional rendering bugs)
+                    columns -= OUTPUT_MARGIN
+                    return self._render_inline(app, columns=columns, rows=rows)
+
+    def _render_shared(self, follower: "Follower", *, rows: int) -> Widget:
+        source_hash, _, _ = self._output_key(columns=0, rows=0)
+        return StreamingOutput(
+            follower.output(source_hash),
+            max_height=rows,
+            running_status="Waiting for the presenter...",
+        )
+
+    def shared_output(self, *, columns: int, rows: int) -> dict[str, Any] | None:
+        """The output shown for the size (if any), as published to the followers.
+
+        Args:
+            columns: The number of columns available for the whole slide (as in `render`)
+            rows: The number of rows available for the whole slide (as in `render`)
+        """
+        columns, rows = self.output_geometry(columns=columns, rows=rows)
+        key = self._output_key(columns=columns, rows=rows)
+        if (stream := self._streams.get(key)) is not None:
+            text, is_error, done = stream.text, stream.is_error, stream.done
+        elif key in self._outputs:
+            (text, is_error), done = self._outputs[key], True
+        else:
+            return None
+        return {"source": key[0], "text": text, "is_error": is_error, "done": done}
+
+    def _render_inline(
+        self, app: "PresentationApp", *, columns: int, rows: int
+    ) -> Widget:
+        """Render the output, running the code unless already done for this size.
+
+        If possible, the code runs in the background, streaming the output.
+        """
+        context = app.execution
+        key = self._output_key(columns=columns, rows=rows)
+        if key not in self._outputs and (
+            persisted := self._load_persisted(context, columns=columns, rows=rows)
+        ):
+            self._store_output(key, persisted)
+        if key in self._outputs or not self._can_stream(context):
+            return self._render_output(
+                output=self._exec_cached(context, columns=columns, rows=rows),
+                app=app,
+                rows=rows,
+            )
+        if (stream := self._streams.get(key)) is None:
+            stream = self._streams[key] = OutputStream(self.output_limits)
+            app.run_worker(
+                self._stream_output(
+                    stream, context=context, key=key, columns=columns, rows=rows
+                ),
+                name=self.title or type(self).__name__,
+                group="exec",
+                exit_on_error=False,
+            )
+        return StreamingOutput(stream, max_height=rows)
+
+    async def _stream_output(
+        self,
+        stream: OutputStream,
+        *,
+        context: ExecutionContext,
+        key: tuple[str, int, int],
+        columns: int,
+        rows: int,
+    ) -> None:
+        """Run the code in the background, collecting its output in the stream."""
+        try:
+            if (future := self._pending.get(key)) is not None:
+                # Already running in the background
+                output, stream.is_error = await asyncio.wrap_future(future)
+                stream.write(output)
+            else:
+                with tracer.span(
+                    "exec",
+                    asynchronous=True,
+                    slide=self.label,
+                    columns=columns,
+                    rows=rows,
+                ):
+                    stream.is_error = await self._exec_streaming(
+                        context, columns=columns, rows=rows, on_output=stream.write
                     )
-                    output = self._exec_inline(app, columns=columns, rows=rows)
-                    return self._render_output(output=output, app=app)
+        except asyncio.CancelledError:
+            stream.write("\nCancelled.")
+            stream.is_error = True
+            raise
+        except Exception as ex:
+            stream.write(f"\nError: {ex}")
+            stream.is_error = True
+        else:
+            # A reload in the meantime makes the result obsolete
+            if self._streams.get(key) is stream:
+                result = (stream.text, stream.is_error)
+                self._store_output(key, result)
+                self._persist(context, result, columns=columns, rows=rows)
+                self.is_error = stream.is_error
+        finally:
+            stream.done = True
+            if self._streams.get(key) is stream:
+                del self._streams[key]
+
+    def _can_stream(self, context: ExecutionContext) -> bool:
+        """Whether the code can run in the background (see `_exec_streaming`)."""
+        return False
+
+    async def _exec_streaming(
+        self,
+        context: ExecutionContext,
+        *,
+        columns: int,
+        rows: int,
+        on_output: Callable[[str], None],
+    ) -> bool:
+        """Execute the code, passing the output to `on_output` as it arrives.
+
+        Returns:
+            Whether the execution failed.
+        """
+        raise NotImplementedError()
+
+    @property
+    def output_limits(self) -> OutputLimits:
+        return OutputLimits(
+            head_lines=self.output_head_lines, tail_lines=self.output_tail_lines
+        )
+
+    def _output_key(self, *, columns: int, rows: int) -> tuple[str, int, int]:
+        source_hash = hashlib.sha256(
+            f"{self.source}\0{tuple(self.output_limits)}".encode("utf-8")
+        ).hexdigest()
+        return source_hash, columns, rows
+
+    def _exec_cached(
+        self, context: ExecutionContext, *, columns: int, rows: int
+    ) -> str:
+        """Execute the code unless it already ran for the same source and size."""
+        key = self._output_key(columns=columns, rows=rows)
+        if key not in self._outputs:
+            if (future := self._pending.get(key)) is not None:
+                # Already running in the background
+                self._store_output(key, future.result())
+            else:
+                self._store_output(
+                    key, self._exec_persistent(context, columns=columns, rows=rows)
+                )
+        output, self.is_error = self._outputs[key]
+        return output
+
+    def _exec_persistent(
+        self, context: ExecutionContext, *, columns: int, rows: int
+    ) -> tuple[str, bool]:
+        """Execute the code, unless its output is stored in the on-disk cache."""
+        if (
+            result := self._load_persisted(context, columns=columns, rows=rows)
+        ) is not None:
+            return result
+        with tracer.span("exec", slide=self.label, columns=columns, rows=rows):
+            result = self._exec_inline(context, columns=columns, rows=rows)
+        self._persist(context, result, columns=columns, rows=rows)
+        return result
+
+    def persistent_key(
+        self, context: ExecutionContext, *, columns: int, rows: int
+    ) -> str | None:
+        """Key of the output in the on-disk cache (None if not cached).
 
-    def _render_output(self, *, output: str, app: "PresentationApp") -> Widget:
+        Args:
+            columns: The number of columns of the output (see `output_geometry`)
+            rows: The number of rows of the output (see `output_geometry`)
+        """
+        if context.output_cache is None or not self.cache:
+            return None
+        return context.output_cache.key(
+            kind=type(self).__name__,
+            source=self.source,
+            cwd=context.working_dir,
+            columns=columns,
+            rows=rows,
+            limits=tuple(self.output_limits),
+        )
+
+    def _load_persisted(
+        self, context: ExecutionContext, *, columns: int, rows: int
+    ) -> tuple[str, bool] | None:
+        if (key := self.persistent_key(context, columns=columns, rows=rows)) is None:
+            return None
+        return context.output_cache.get(key)
+
+    def _persist(
+        self,
+        context: ExecutionContext,
+        result: tuple[str, bool],
+        *,
+        columns: int,
+        rows: int,
+    ) -> None:
+        if (key := self.persistent_key(context, columns=columns, rows=rows)) is None:
+            return
+        context.output_cache.put(key, *result)
+
+    def _store_output(self, key: tuple[str, int, int], result: tuple[str, bool]):
+        self._outputs[key] = result
+        while len(self._outputs) > MAX_CACHED_OUTPUTS:
+            del self._outputs[next(iter(self._outputs))]
+
+    @property
+    def prefetchable(self) -> bool:
+        """Whether the output can be computed in advance, in the background."""
+        return self.runnable and self.prefetch and not self.alt_screen
+
+    def prefetch_output(
+        self,
+        context: ExecutionContext,
+        *,
+        columns: int,
+        rows: int,
+        executor: Executor,
+    ) -> Future | None:
+        """Start computing the output in the executor (unless available or running).
+
+        Args:
+            columns: The number of columns available for the whole slide (as in `render`)
+            rows: The number of rows available for the whole slide (as in `render`)
+
+        Returns:
+            The future of the execution, if submitted.
+        """
+        self.ensure_loaded()
+        columns, rows = self.output_geometry(columns=columns, rows=rows)
+        key = self._output_key(columns=columns, rows=rows)
+        if key in self._outputs or key in self._pending:
+            return None
+        future = executor.submit(
+            self._exec_persistent, context, columns=columns, rows=rows
+        )
+        self._pending[key] = future
+        future.add_done_callback(functools.partial(self._store_prefetched, key))
+        return future
+
+    def _store_prefetched(self, key: tuple[str, int, int], future: Future) -> None:
+        if self._pending.get(key) is not future:
+            return  # Reloaded in the meantime
+        del self._pending[key]
+        if not future.cancelled() and future.exception() is None:
+            self._store_output(key, future.result())
+
+    def output_geometry(self, *, columns: int, rows: int) -> tuple[int, int]:
+        """Size of the inline output, given the size available for the whole slide."""
+        if self.title:
+            rows -= 3
+        return columns - OUTPUT_MARGIN, rows
+
+    def _render_output(
+        self, *, output: str, app: "PresentationApp", rows: int
+    ) -> Widget:
         classes = "error" if self.is_error else "output"
-        return Static(Text.from_ansi(output + "\n"), classes=classes)
+        with tracer.span("output_view", slide=self.label, length=len(output)):
+            return OutputView(output, max_height=rows, classes=classes)
 
     def toggle_output(self):
         self.display_mode = "output" if self.display_mode == "code" else "code"
@@ -269,45 +711,136 @@ class ExecutableSlide(CodeSlide, ABC):
         """Execute the code in an alternate screen."""
 
     @abstractmethod
-    def _exec_inline(self, app: "PresentationApp", *, columns: int, rows: int) -> str:
-        """Execute the code and return the output."""
+    def _exec_inline(
+        self, context: ExecutionContext, *, columns: int, rows: int
+    ) -> tuple[str, bool]:
+        """Execute the code and return the output and whether it failed.
+
+        It may be called from a worker thread (see `prefetch_output`).
+        """
 
 
 class PythonSlide(ExecutableSlide):
     """Slide with runnable Python code.
 
-    It executes the code directly in the running Python process.
+    It executes the code directly in the running Python process,
+    or in a separate one if the app has a kernel pool.
     """
 
     language: Final[str] = "python"
 
-    def _exec_inline(self, app: "PresentationApp", *, columns: int, rows: int) -> str:
-        f = io.StringIO()
-        with patch_environment(get_terminal_env_vars(columns, rows)):
-            with redirect_stdout(f):
-                self.is_error = False
-                try:
-                    exec(
-                        self.source,
-                        globals=globals()
-                        | {
-                            "WIDTH": columns,
-                            "HEIGHT": rows,
-                        },
-                    )
-                    return f.getvalue()
-                except Exception as ex:
-                    self.is_error = True
-                    out = StringIO()
-                    out.write(f"Error: {ex}\n")
-                    out.write("\n")
-                    traceback.print_exception(ex, file=out)
-                    return out.getvalue()
+    _compiled: tuple[str, Future[CodeType]] | None = PrivateAttr(default=None)
+    """The source and its compilation (started when loaded)."""
+
+    def _load(self):
+        super()._load()
+        self._compiled = (
+            self.source,
+            _compile_executor().submit(self._compile, self.source),
+        )
+
+    def prepare(self) -> None:
+        super().prepare()
+        if self._compiled is not None:
+            self._compiled[1].exception()  # Waits for the compilation
+
+    def _compile(self, source: str) -> CodeType:
+        with tracer.span("compile", slide=self.label):
+            return code_cache.compile(source, self._filename)
+
+    @property
+    def code(self) -> CodeType:
+        """The compiled source (raising `SyntaxError` if it is not valid)."""
+        if self._compiled is None or self._compiled[0] != self.source:
+            # Changed since loaded
+            return self._compile(self.source)
+        return self._compiled[1].result()
+
+    @property
+    def syntax_error(self) -> SyntaxError | None:
+        """The error preventing the source from being compiled (if any)."""
+        try:
+            self.code
+        except SyntaxError as ex:
+            return ex
+        except ValueError as ex:  # e.g. null bytes
+            return SyntaxError(str(ex))
+        return None
+
+    def _code_or_source(self) -> CodeType | str:
+        """What to send to a kernel (that reports the errors itself)."""
+        return self.source if self.syntax_error else self.code
+
+    def _can_stream(self, context: ExecutionContext) -> bool:
+        return context.kernel_pool is not None
+
+    async def _exec_streaming(
+        self,
+        context: ExecutionContext,
+        *,
+        columns: int,
+        rows: int,
+        on_output: Callable[[str], None],
+    ) -> bool:
+        cancelled = threading.Event()
+        try:
+            _, is_error = await asyncio.to_thread(
+                context.kernel_pool.execute,
+                self._code_or_source(),
+                filename=self._filename,
+                columns=columns,
+                rows=rows,
+                limits=self.output_limits,
+                on_output=on_output,
+                cancelled=cancelled,
+            )
+            return is_error
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    @property
+    def _filename(self) -> str:
+        """Name of the code shown in the tracebacks."""
+        return str(self.path) if self.path else "<slide>"
+
+    def _exec_inline(
+        self, context: ExecutionContext, *, columns: int, rows: int
+    ) -> tuple[str, bool]:
+        if context.kernel_pool is not None:
+            return context.kernel_pool.execute(
+                self._code_or_source(),
+                filename=self._filename,
+                columns=columns,
+                rows=rows,
+                limits=self.output_limits,
+            )
+        f = OutputBuffer(self.output_limits)
+        # Both the environment and stdout are process-wide
+        with _PYTHON_EXEC_LOCK:
+            with patch_environment(get_terminal_env_vars(columns, rows)):
+                with redirect_stdout(f):
+                    try:
+                        exec(
+                            self.code,
+                            globals=globals()
+                            | {
+                                "WIDTH": columns,
+                                "HEIGHT": rows,
+                            },
+                        )
+                        return f.text, False
+                    except Exception as ex:
+                        out = StringIO()
+                        out.write(f"Error: {ex}\n")
+                        out.write("\n")
+                        traceback.print_exception(ex, file=out)
+                        return out.getvalue(), True
 
     def _exec_in_alternate_screen(self, app: "PresentationApp"):
         with self._alternate_screen(app=app):
             exec(
-                self.source,
+                self.code,
                 globals=globals(),
             )
 
@@ -323,17 +856,81 @@ class ShellSlide(ExecutableSlide):
 
     def _exec_in_alternate_screen(self, app: "PresentationApp"):
         with self._alternate_screen(app=app):
-            exec_in_alt_screen(self.source, app.working_dir)
-
-    def _exec_inline(self, app: "PresentationApp", *, columns: int, rows: int) -> str:
-        if self._output is None:
-            self._output, self.is_error = exec_in_pseudo_terminal(
-                command=self.source.strip(),
-                cwd=app.working_dir,
+            exec_in_alt_screen(self.source, app.execution.working_dir)
+
+    def _can_stream(self, context: ExecutionContext) -> bool:
+        return True
+
+    def persistent_key(
+        self, context: ExecutionContext, *, columns: int, rows: int
+    ) -> str | None:
+        if context.shell_session is not None:
+            return None  # The output depends on the commands run before
+        return super().persistent_key(context, columns=columns, rows=rows)
+
+    def prefetch_output(
+        self,
+        context: ExecutionContext,
+        *,
+        columns: int,
+        rows: int,
+        executor: Executor,
+    ) -> Future | None:
+        if context.shell_session is not None:
+            return None  # The commands must run in the order of the slides
+        return super().prefetch_output(
+            context, columns=columns, rows=rows, executor=executor
+        )
+
+    async def _exec_streaming(
+        self,
+        context: ExecutionContext,
+        *,
+        columns: int,
+        rows: int,
+        on_output: Callable[[str], None],
+    ) -> bool:
+        if context.shell_session is not None:
+            cancelled = threading.Event()
+            try:
+                _, is_error = await asyncio.to_thread(
+                    context.shell_session.execute,
+                    self.source.strip(),
+                    columns=columns,
+                    rows=rows,
+                    limits=self.output_limits,
+                    on_output=on_output,
+                    cancelled=cancelled,
+                )
+                return is_error
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return await stream_in_pseudo_terminal(
+            command=self.source.strip(),
+            cwd=context.working_dir,
+            columns=columns,
+            rows=rows,
+            on_output=on_output,
+        )
+
+    def _exec_inline(
+        self, context: ExecutionContext, *, columns: int, rows: int
+    ) -> tuple[str, bool]:
+        if context.shell_session is not None:
+            return context.shell_session.execute(
+                self.source.strip(),
                 columns=columns,
                 rows=rows,
+                limits=self.output_limits,
             )
-        return self._output
+        return exec_in_pseudo_terminal(
+            command=self.source.strip(),
+            cwd=context.working_dir,
+            columns=columns,
+            rows=rows,
+            limits=self.output_limits,
+        )
 
 
 class MarkdownSlide(Slide):
@@ -341,10 +938,18 @@ class MarkdownSlide(Slide):
 
     classes: list[str] | None = None
 
+    def _load(self):
+        CachedMarkdownParser.forget(self.source)
+        super()._load()
+
     def _render_impl(
         self, app: "PresentationApp", *, columns: int, rows: int
     ) -> Markdown:
-        return Markdown(self.source, classes="slide " + " ".join(self.classes or []))
+        return Markdown(
+            self.source,
+            classes="slide " + " ".join(self.classes or []),
+            parser_factory=CachedMarkdownParser,
+        )
 
 
 class TextSlide(Slide):
@@ -363,6 +968,11 @@ class FuncSlide(Slide):
     source: str = ""  # ignored
     path: None = None  # ignored
 
+    @property
+    def geometry_dependent(self) -> bool:
+        # The function may inspect the app size
+        return True
+
     def _render_impl(
         self, app: "PresentationApp", *, columns: int, rows: int
     ) -> Widget:
@@ -377,36 +987,6 @@ class FuncSlide(Slide):
             raise NotImplementedError()
 
 
-class DataSlide(Slide):
-    """Slide containing data displayed as a table."""
-
-    data: Optional[pl.DataFrame] = None
-
-    model_config = {"arbitrary_types_allowed": True}
-    scrollbar: Literal["own"] = "own"
-
-    def _render_impl(
-        self, app: "PresentationApp", *, columns: int, rows: int
-    ) -> Widget:
-        if self.data is not None:
-            backend = PolarsBackend.from_dataframe(self.data)
-            dt = DataTable(backend=backend, zebra_stripes=True, show_cursor=False)
-            dt.can_focus = False
-            return dt
-        else:
-            return Markdown("No data.")
-
-    def _load(self) -> None:
-        if self.path:
-            match self.path.suffix:
-                case ".csv":
-                    self.data = pl.read_csv(self.path)
-                case ".pq" | ".parquet":
-                    self.data = pl.read_parquet(self.path)
-                case _:
-                    raise NotImplementedError()
-
-
 class ErrorSlide(Slide):
     """Slide to display an error message."""
 
@@ -416,24 +996,40 @@ class ErrorSlide(Slide):
         return Static(Text.from_ansi(self.source), classes="error")
 
 
-def load_slide(path: str | Path, **kwargs) -> Slide:
-    """Load a slide from an external file."""
+def load_slide(path: str | Path, *, slide_type: str | None = None, **kwargs) -> Slide:
+    """Load a slide from an external file.
+
+    Args:
+        slide_type: The type of the slide (see `SlideModel.type`), instead of
+            the one given by the extension.
+    """
     path = Path(path)
-    match path.suffix:
-        case ".py":
+    match slide_type or path.suffix:
+        case "python" | ".py":
             return PythonSlide(path=path, **kwargs)
-        case ".md":
+        case "shell":
+            return ShellSlide(path=path, **kwargs)
+        case "markdown" | ".md":
             return MarkdownSlide(path=path, **kwargs)
-        case ".csv" | ".pq" | ".parquet":
+        case ".csv" | ".pq" | ".parquet" | ".arrow" | ".ipc" | ".feather":
+            from clippt.data import DataSlide  # polars is slow to import
+
             return DataSlide(path=path, **kwargs)
         case ".txt":
             return TextSlide(path=path, **kwargs)
-        case other:
-            language = kwargs.pop("language", EXT_LANGUAGE_MAPPING.get(other, "text"))
+        case _:
+            language = kwargs.pop(
+                "language", EXT_LANGUAGE_MAPPING.get(path.suffix, "text")
+            )
             return CodeSlide(path=path, language=language, **kwargs)
 
 
 EXT_LANGUAGE_MAPPING = {
+    # Also for the files shown as code with `type = "code"`
+    ".py": "python",
+    ".sh": "bash",
+    ".bash": "bash",
+    ".md": "markdown",
     ".json": "json",
     ".toml": "toml",
     ".yaml": "yaml",
@@ -441,3 +1037,12 @@ EXT_LANGUAGE_MAPPING = {
     ".scm": "scheme",
     ".go": "go",
 }
+
+
+def __getattr__(name: str) -> Any:
+    # DataSlide lives with polars, which is imported only when needed
+    if name == "DataSlide":
+        from clippt.data import DataSlide
+
+        return DataSlide
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,181 @@
+"""Persistent state of the sessions of a presentation (see `--continue`).
+
+The state (current slide, display modes, scroll positions...) is kept
+in memory by the app and written by a background thread once it stops
+changing for a while, so that navigating never waits for the disk.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, Literal
+
+from pydantic import BaseModel, Field, ValidationError
+
+from clippt.cache import write_atomic
+
+if TYPE_CHECKING:
+    from clippt.presentation import Presentation
+
+STATE_FORMAT: Final[int] = 1
+"""Version of the stored state (bump when incompatible)."""
+
+SAVE_DELAY: Final[float] = 0.5
+"""Time (in seconds) the state has to stay the same before it is written."""
+
+
+def state_dir() -> Path:
+    """Directory of the clippt state (`$CLIPPT_STATE_DIR` or the user state dir)."""
+    if directory := os.environ.get("CLIPPT_STATE_DIR"):
+        return Path(directory)
+    if sys.platform == "win32" and (local_app_data := os.environ.get("LOCALAPPDATA")):
+        return Path(local_app_data) / "clippt" / "state"
+    base = os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+    return Path(base) / "clippt"
+
+
+class SessionState(BaseModel):
+    """What is restored with `--continue` (by slide index)."""
+
+    format: int = STATE_FORMAT
+    slide_index: int = 0
+    display_modes: dict[int, Literal["code", "output"]] = Field(default_factory=dict)
+    """Of the executable slides switched by the presenter."""
+
+    outputs: dict[int, str] = Field(default_factory=dict)
+    """Keys of the outputs (in the output cache) shown by the slides in output mode."""
+
+    scroll: dict[int, float] = Field(default_factory=dict)
+    """Vertical scroll offsets of the slides (if scrolled)."""
+
+
+class SessionStore:
+    """State of the last session of a presentation, saved in the background.
+
+    The changes are made with the methods of the store (from any thread),
+    which only update the state in memory.
+    """
+
+    def __init__(self, path: Path, *, save_delay: float = SAVE_DELAY):
+        self.path = path
+        self.save_delay = save_delay
+        self._state = SessionState()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._deadline: float | None = None
+        """When to write the state (None if saved)."""
+
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def for_presentation(cls, presentation: "Presentation") -> "SessionStore":
+        """The store of the presentation, keyed by its manifest (or directory)."""
+        if presentation.source_path is not None:
+            identity = str(presentation.source_path.absolute())
+        else:
+            # Created in code (see `create_cli_command`)
+            identity = (
+                f"{presentation.slide_base_path.absolute()}\0{presentation.title}"
+            )
+        name = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+        return cls(state_dir() / "sessions" / f"{name}.json")
+
+    @property
+    def state(self) -> SessionState:
+        """A copy of the current state."""
+        with self._lock:
+            return self._state.model_copy(deep=True)
+
+    def load(self) -> SessionState:
+        """Read the stored state (empty if missing or invalid), making it current."""
+        try:
+            state = SessionState.model_validate_json(self.path.read_bytes())
+            if state.format != STATE_FORMAT:
+                state = SessionState()
+        except (OSError, ValidationError):
+            state = SessionState()
+        with self._lock:
+            self._state = state
+        return state.model_copy(deep=True)
+
+    def set_slide_index(self, index: int) -> None:
+        with self._lock:
+            if self._state.slide_index != index:
+                self._state.slide_index = index
+                self._schedule()
+
+    def set_display_mode(
+        self, index: int, mode: Literal["code", "output"], *, output: str | None = None
+    ) -> None:
+        """Record the mode of the slide (and the key of its output, if cached)."""
+        with self._lock:
+            self._state.display_modes[index] = mode
+            if output is not None and mode == "output":
+                self._state.outputs[index] = output
+            else:
+                self._state.outputs.pop(index, None)
+            self._schedule()
+
+    def set_scroll(self, index: int, offset: float) -> None:
+        with self._lock:
+            if self._state.scroll.get(index, 0) == offset:
+                return
+            if offset:
+                self._state.scroll[index] = offset
+            else:
+                del self._state.scroll[index]
+            self._schedule()
+
+    def _schedule(self) -> None:
+        """Write the state once it has not changed for `save_delay` (lock held)."""
+        self._deadline = time.monotonic() + self.save_delay
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(
+                target=self._run, name="clippt-state", daemon=True
+            )
+            self._thread.start()
+        self._changed.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed:
+                    if self._deadline is None:
+                        self._changed.wait()
+                        continue
+                    delay = self._deadline - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._changed.wait(delay)
+                if self._closed:
+                    return
+                data = self._snapshot()
+            self._write(data)
+
+    def _snapshot(self) -> bytes:
+        """The state to write, marked as saved (lock held)."""
+        self._deadline = None
+        return self._state.model_dump_json().encode("utf-8")
+
+    def _write(self, data: bytes) -> None:
+        try:
+            write_atomic(self.path, data)
+        except OSError:
+            pass  # Not worth interrupting the presentation
+
+    def close(self) -> None:
+        """Write any pending change (now) and stop the thread."""
+        with self._lock:
+            self._closed = True
+            self._changed.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            data = self._snapshot() if self._deadline is not None else None
+        if data is not None:
+            self._write(data)
@@ -18,6 +18,12 @@ css_tweaks: str = """
     Header {
         height: 1;
     }
+    #timings {
+        height: 1;
+        padding: 0 1;
+        background: $panel;
+        color: $text-muted;
+    }
     Markdown {
       MarkdownH1 {
         margin: 1 0;
@@ -42,11 +48,16 @@ css_tweaks: str = """
         margin: 1;
         max-height: 500;
     }
-    Static.output {
+    OutputView.output {
         margin: 0 0;
-        max-height: 500;
         padding: 1 1;
     }
+    OutputView.error {
+        background: #ffcccc;
+        color: #800000;
+        margin: 0 3;
+        padding: 1 2;
+    }
     Static.error {
         background: #ffcccc;
         color: #800000;
@@ -0,0 +1,137 @@
+"""Timing of the slide loading, rendering and execution.
+
+The spans are recorded by the process-wide `tracer` and can be written
+in the Chrome trace format (see `--trace`), viewable in https://ui.perfetto.dev
+or chrome://tracing.
+"""
+
+import contextlib
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Final, NamedTuple
+
+from clippt.cache import write_atomic
+
+MAX_SPANS: Final[int] = 10_000
+"""Number of spans kept by default (the older ones are dropped)."""
+
+
+class Span(NamedTuple):
+    """A timed operation."""
+
+    name: str
+    start: float
+    """Value of `time.perf_counter()` when the operation started."""
+
+    duration: float
+    """In seconds."""
+
+    thread_id: int
+    args: dict[str, Any]
+
+    asynchronous: bool = False
+    """Whether the operation may interleave with others in the thread (coroutines)."""
+
+
+class Tracer:
+    """Collects the spans of the instrumented operations (from any thread)."""
+
+    def __init__(self, max_spans: int | None = MAX_SPANS):
+        self.enabled = True
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+        self._origin = time.perf_counter()
+
+    @property
+    def max_spans(self) -> int | None:
+        return self._spans.maxlen
+
+    @max_spans.setter
+    def max_spans(self, value: int | None) -> None:
+        self._spans = deque(self._spans, maxlen=value)
+
+    @contextlib.contextmanager
+    def span(self, name: str, *, asynchronous: bool = False, **args) -> Iterator[None]:
+        """Time the enclosed code (also when it raises)."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._spans.append(
+                Span(
+                    name=name,
+                    start=start,
+                    duration=time.perf_counter() - start,
+                    thread_id=threading.get_ident(),
+                    args=args,
+                    asynchronous=asynchronous,
+                )
+            )
+
+    @property
+    def spans(self) -> list[Span]:
+        """Spans recorded so far (in the order they finished)."""
+        return list(self._spans)
+
+    def spans_since(self, start: float, *, thread_id: int | None = None) -> list[Span]:
+        """Spans started at (or after) the given `time.perf_counter()` value."""
+        return [
+            span
+            for span in list(self._spans)
+            if span.start >= start and thread_id in (None, span.thread_id)
+        ]
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """The spans as a Chrome trace (JSON object format)."""
+        pid = os.getpid()
+        events = []
+        ids = itertools.count(1)
+        for span in self.spans:
+            timestamp = (span.start - self._origin) * 1e6  # Microseconds
+            event = {
+                "name": span.name,
+                "cat": "clippt",
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {key: str(value) for key, value in span.args.items()},
+            }
+            if span.asynchronous:
+                # Nested by id, not by the thread stack
+                event_id = next(ids)
+                events.append(event | {"ph": "b", "ts": timestamp, "id": event_id})
+                events.append(
+                    event
+                    | {"ph": "e", "ts": timestamp + span.duration * 1e6, "id": event_id}
+                )
+            else:
+                events.append(
+                    event | {"ph": "X", "ts": timestamp, "dur": span.duration * 1e6}
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: Path) -> None:
+        """Write the Chrome trace to a file."""
+        write_atomic(path, json.dumps(self.chrome_trace()).encode("utf-8"))
+
+
+tracer = Tracer()
+"""The tracer used by clippt."""
+
+
+def format_spans(spans: list[Span]) -> str:
+    """Short one-line summary of the spans (e.g. for the timings bar)."""
+    return "  ".join(
+        f"{span.name} {span.duration * 1000:.1f} ms"
+        for span in sorted(spans, key=lambda span: span.start)
+    )
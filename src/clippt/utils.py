@@ -1,9 +1,13 @@
+import asyncio
+import codecs
+import functools
 import os
 import sys
+from collections import deque
 from contextlib import contextmanager
-import shellingham
 import subprocess
 from pathlib import Path
+from typing import Callable, NamedTuple
 
 import rich
 
@@ -31,77 +35,277 @@ def wait_for_key():
 
 
 def exec_in_pseudo_terminal(
-    *, command: str, cwd: Path | None, columns: int, rows: int
+    *,
+    command: str,
+    cwd: Path | None,
+    columns: int,
+    rows: int,
+    limits: "OutputLimits | None" = None,
 ) -> tuple[str, bool]:
-    """Run a command in a pseudo-terminal and capture the output, including ANSI colours."""
+    """Run a command in a pseudo-terminal and capture the output, including ANSI colours.
+
+    Only a part of a long output is kept (see `OutputLimits`).
+    """
     command, shell = create_shell_command(command)
+    output = OutputBuffer(limits or OutputLimits())
 
     match sys.platform:
         case "win32":
-            with patch_environment(get_terminal_env_vars(columns, rows)):
-                proc = subprocess.run(
-                    command,
-                    shell=shell,
-                    capture_output=True,
-                    text=True,
-                    encoding="utf-8",
-                    cwd=cwd,
-                )
-                return proc.stdout or proc.stderr, proc.returncode != 0
+            proc = subprocess.run(
+                command,
+                shell=shell,
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                cwd=cwd,
+                env=os.environ | get_terminal_env_vars(columns, rows),
+            )
+            output.write(proc.stdout or proc.stderr)
+            return output.text, proc.returncode != 0
 
         case "linux" | "darwin":
-            # Assisted by Claude (a bit of magic)
-            import termios
-            import struct
-            import fcntl
-            import pty
-
-            master_fd, slave_fd = pty.openpty()
-
-            # Set the window size on the slave end so TIOCSWINSZ returns our value
-            winsize = struct.pack("HHHH", rows, columns, 0, 0)
-            fcntl.ioctl(slave_fd, termios.TIOCSWINSZ, winsize)
-
-            attrs = termios.tcgetattr(slave_fd)
-            attrs[1] &= ~termios.ONLCR  # clear the nl→crnl output flag
-            termios.tcsetattr(slave_fd, termios.TCSANOW, attrs)
-
-            with patch_environment(get_terminal_env_vars(columns, rows)):
-                proc = subprocess.Popen(
-                    command,
-                    shell=shell,
-                    stdout=slave_fd,
-                    stderr=slave_fd,
-                    close_fds=True,
-                    cwd=cwd,
-                )
+            master_fd, slave_fd = open_pseudo_terminal(columns=columns, rows=rows)
+
+            proc = subprocess.Popen(
+                command,
+                shell=shell,
+                stdout=slave_fd,
+                stderr=slave_fd,
+                close_fds=True,
+                cwd=cwd,
+                env=os.environ | get_terminal_env_vars(columns, rows),
+            )
             os.close(slave_fd)
 
-            chunks = []
             while True:
                 try:
-                    data = os.read(master_fd, 4096)
+                    data = os.read(master_fd, 65536)
                 except OSError:
                     break  # Linux: EIO when slave is fully closed
                 if not data:
                     break  # macOS/BSD: EOF (0 bytes) when slave is fully closed
-                chunks.append(data)
+                output.feed(data)
+            output.finish()
 
             proc.wait()
             os.close(master_fd)
-            return b"".join(chunks).decode(), proc.returncode != 0
+            return output.text, proc.returncode != 0
+
+        case _:
+            raise NotImplementedError("Not implemented for this platform.")
+
+
+async def stream_in_pseudo_terminal(
+    *,
+    command: str,
+    cwd: Path | None,
+    columns: int,
+    rows: int,
+    on_output: Callable[[str], None],
+) -> bool:
+    """Run a command in a pseudo-terminal, passing the output to `on_output` as it arrives.
+
+    The terminal is read through the asyncio event loop, so the caller is not blocked.
+    Cancelling the coroutine kills the process.
+
+    Returns:
+        Whether the command failed.
+    """
+    match sys.platform:
+        case "win32":
+            # No PTY on Windows, just do not block the event loop
+            output, is_error = await asyncio.to_thread(
+                exec_in_pseudo_terminal,
+                command=command,
+                cwd=cwd,
+                columns=columns,
+                rows=rows,
+            )
+            on_output(output)
+            return is_error
+
+        case "linux" | "darwin":
+            shell_command, shell = create_shell_command(command)
+            master_fd, slave_fd = open_pseudo_terminal(columns=columns, rows=rows)
+
+            proc = subprocess.Popen(
+                shell_command,
+                shell=shell,
+                stdout=slave_fd,
+                stderr=slave_fd,
+                close_fds=True,
+                cwd=cwd,
+                env=os.environ | get_terminal_env_vars(columns, rows),
+            )
+            os.close(slave_fd)
+
+            loop = asyncio.get_running_loop()
+            queue: asyncio.Queue[bytes] = asyncio.Queue()
+
+            def read_available() -> None:
+                try:
+                    data = os.read(master_fd, 4096)
+                except OSError:
+                    data = b""  # Linux: EIO when slave is fully closed
+                if not data:
+                    loop.remove_reader(master_fd)
+                queue.put_nowait(data)
+
+            loop.add_reader(master_fd, read_available)
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            try:
+                while data := await queue.get():
+                    on_output(decoder.decode(data))
+                on_output(decoder.decode(b"", final=True))
+                returncode = await asyncio.to_thread(proc.wait)
+                return returncode != 0
+            finally:
+                loop.remove_reader(master_fd)
+                os.close(master_fd)
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
 
         case _:
             raise NotImplementedError("Not implemented for this platform.")
 
 
+def open_pseudo_terminal(*, columns: int, rows: int) -> tuple[int, int]:
+    """Open a PTY of the given size, returning the master and slave file descriptors."""
+    # Assisted by Claude (a bit of magic)
+    import termios
+    import struct
+    import fcntl
+    import pty
+
+    master_fd, slave_fd = pty.openpty()
+
+    # Set the window size on the slave end so TIOCSWINSZ returns our value
+    winsize = struct.pack("HHHH", rows, columns, 0, 0)
+    fcntl.ioctl(slave_fd, termios.TIOCSWINSZ, winsize)
+
+    attrs = termios.tcgetattr(slave_fd)
+    attrs[1] &= ~termios.ONLCR  # clear the nl→crnl output flag
+    termios.tcsetattr(slave_fd, termios.TCSANOW, attrs)
+    return master_fd, slave_fd
+
+
+class OutputLimits(NamedTuple):
+    """How much of the output of a command is kept (the rest is dropped)."""
+
+    head_lines: int = 100
+    """Number of lines kept from the beginning."""
+
+    tail_lines: int = 1000
+    """Number of lines kept from the end."""
+
+    max_line_length: int = 4096
+    """Number of characters kept from each line."""
+
+
+class OutputBuffer:
+    """Output of a command taking bounded memory, however long it is.
+
+    Only the first and last lines are kept (see `OutputLimits`), the lines
+    in between are replaced by a marker. The output can be written as text,
+    or as bytes fed in arbitrary chunks (decoded as UTF-8).
+    """
+
+    def __init__(self, limits: OutputLimits = OutputLimits()) -> None:
+        self.limits = limits
+        self.truncated_lines: int = 0
+        self.version: int = 0
+        """Incremented on each change (to detect updates cheaply)."""
+
+        self._head: list[str] = []
+        self._tail: deque[str] = deque(maxlen=limits.tail_lines)
+        self._line: list[str] = []
+        """Pieces of the current (unfinished) line."""
+
+        self._line_length = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def write(self, text: str) -> int:
+        if not text:
+            return 0
+        *complete, rest = text.split("\n")
+        for piece in complete:
+            self._append_to_line(piece + "\n")
+            self._finish_line()
+        self._append_to_line(rest)
+        self.version += 1
+        return len(text)
+
+    def feed(self, data: bytes) -> None:
+        """Add a chunk of bytes (a multibyte character may be split between chunks)."""
+        self.write(self._decoder.decode(data))
+
+    def finish(self) -> None:
+        """Decode what is left from the fed bytes."""
+        self.write(self._decoder.decode(b"", final=True))
+
+    def flush(self) -> None:
+        pass  # For use as a file (e.g. with `redirect_stdout`)
+
+    def _append_to_line(self, piece: str) -> None:
+        content = piece.removesuffix("\n")
+        available = self.limits.max_line_length - self._line_length
+        if len(content) > available:
+            if available > 0:
+                self._line.append(content[:available] + "…")
+            self._line_length = self.limits.max_line_length
+            piece = piece[len(content) :]  # Keep the newline
+        if piece:
+            self._line.append(piece)
+            self._line_length += len(piece)
+
+    def _finish_line(self) -> None:
+        line = "".join(self._line)
+        self._line.clear()
+        self._line_length = 0
+        if len(self._head) < self.limits.head_lines:
+            self._head.append(line)
+        elif self.limits.tail_lines == 0:
+            self.truncated_lines += 1
+        else:
+            if len(self._tail) == self.limits.tail_lines:
+                self.truncated_lines += 1
+            self._tail.append(line)
+
+    @property
+    def text(self) -> str:
+        marker = (
+            f"\x1b[0m[... {self.truncated_lines} lines truncated ...]\n"
+            if self.truncated_lines
+            else ""
+        )
+        return "".join(self._head) + marker + "".join(self._tail) + "".join(self._line)
+
+
+class OutputStream(OutputBuffer):
+    """Output of a running command, collected chunk by chunk."""
+
+    def __init__(self, limits: OutputLimits = OutputLimits()) -> None:
+        super().__init__(limits)
+        self.done: bool = False
+        self.is_error: bool = False
+
+
+@functools.cache
+def detect_shell() -> tuple[str, str]:
+    """Name and path of the user's shell (detected only once per process)."""
+    import shellingham  # Only needed by shell slides
+
+    return shellingham.detect_shell()
+
+
 def create_shell_command(command: str) -> tuple[list[str], bool]:
     """Create a shell command list and shell flag based on the detected shell."""
 
     # TODO: Perhaps we should force sh and create powershell as a separate slide type
 
     command = command.strip()
-    shell_name, shell_path = shellingham.detect_shell()
+    shell_name, shell_path = detect_shell()
 
     match shell_name:
         case "pwsh" | "powershell":
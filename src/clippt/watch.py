@@ -0,0 +1,157 @@
+"""Watching the slide files for changes."""
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import struct
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Final
+
+HASH_MAX_SIZE: Final[int] = 16 * 1024 * 1024
+"""Files larger than this (e.g. data files) are not hashed: any change of
+their modification time or size counts as a change of content."""
+
+_Fingerprint = tuple[int, int]
+"""Modification time (in ns) and size of a file (or (0, -1) if missing)."""
+
+
+def _fingerprint(path: Path) -> _Fingerprint:
+    try:
+        stat = path.stat()
+    except OSError:
+        return 0, -1
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _content_hash(path: Path, size: int) -> str | None:
+    """Hash of the file content (None if too large to hash, or missing)."""
+    if not 0 <= size <= HASH_MAX_SIZE:
+        return None
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except OSError:
+        return None
+
+
+class FileWatcher:
+    """Tracks changes of a set of files by polling their status.
+
+    A file is reported as changed only if its content differs (saving a file
+    without modifications does not count), apart from its first modification,
+    as the content is not read (hashed) until then. Large files are not hashed
+    (see `HASH_MAX_SIZE`), as this happens in the UI thread.
+    """
+
+    def __init__(self, paths: Iterable[Path]):
+        self._fingerprints: dict[Path, _Fingerprint] = {
+            path.absolute(): _fingerprint(path.absolute()) for path in paths
+        }
+        self._hashes: dict[Path, str | None] = {}
+
+    @property
+    def paths(self) -> set[Path]:
+        return set(self._fingerprints)
+
+    def _candidates(self) -> Iterable[Path]:
+        """Files that may have changed since the last check."""
+        return self._fingerprints
+
+    def changes(self) -> set[Path]:
+        """Files whose content changed since the last check."""
+        changed = set()
+        for path in self._candidates():
+            fingerprint = _fingerprint(path)
+            if fingerprint == self._fingerprints[path]:
+                continue
+            self._fingerprints[path] = fingerprint
+            content_hash = _content_hash(path, fingerprint[1])
+            if (
+                content_hash is None
+                or path not in self._hashes
+                or self._hashes[path] != content_hash
+            ):
+                changed.add(path)
+            self._hashes[path] = content_hash
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher(FileWatcher):
+    """Tracks changes of a set of files using inotify (Linux only).
+
+    The directories are watched (rather than the files) as many editors
+    replace the file when saving. Only the files reported by inotify are checked.
+    """
+
+    _MASK = (
+        0x00000002  # IN_MODIFY
+        | 0x00000008  # IN_CLOSE_WRITE
+        | 0x00000040  # IN_MOVED_FROM
+        | 0x00000080  # IN_MOVED_TO
+        | 0x00000100  # IN_CREATE
+        | 0x00000200  # IN_DELETE
+    )
+    _IN_Q_OVERFLOW = 0x00004000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, paths: Iterable[Path]):
+        super().__init__(paths)
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: dict[int, Path] = {}
+        for directory in {path.parent for path in self._fingerprints}:
+            if not directory.is_dir():
+                continue
+            wd = libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), ctypes.c_uint32(self._MASK)
+            )
+            if wd < 0:
+                error = ctypes.get_errno()
+                self.close()
+                raise OSError(error, f"Cannot watch {directory}")
+            self._directories[wd] = directory
+
+    def _candidates(self) -> Iterable[Path]:
+        candidates = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = self._EVENT.unpack_from(buffer, offset)
+                offset += self._EVENT.size
+                name = buffer[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & self._IN_Q_OVERFLOW:
+                    return self._fingerprints  # Lost track, check everything
+                if directory := self._directories.get(wd):
+                    path = directory / os.fsdecode(name)
+                    if path in self._fingerprints:
+                        candidates.add(path)
+        return candidates
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(paths: Iterable[Path]) -> FileWatcher:
+    """Create the most efficient watcher available on the platform."""
+    paths = list(paths)
+    if sys.platform == "linux":
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass  # No inotify (or out of watches), fall back to polling
+    return FileWatcher(paths)
@@ -0,0 +1,308 @@
+"""Custom widgets used to render the slides."""
+
+import hashlib
+import re
+import threading
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, ClassVar, Final
+
+from rich.ansi import AnsiDecoder
+from rich.cells import cell_len
+from rich.style import Style
+from rich.text import Text
+from textual.cache import LRUCache
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.timer import Timer
+
+from clippt.utils import OutputStream
+
+if TYPE_CHECKING:
+    from markdown_it.token import Token
+
+    from clippt.broadcast import SharedOutput
+
+MARKDOWN_CACHE_SIZE: Final[int] = 256
+"""Number of parsed Markdown documents kept (see `CachedMarkdownParser`)."""
+
+_ANSI_ESCAPE = re.compile(r"\x1b(\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(\x07|\x1b\\)|.)")
+
+_ANSI_STYLE = re.compile(r"\x1b(\[[0-9;]*m|\]8;[^\x07\x1b]*(\x07|\x1b\\))")
+"""The escape sequences changing the style (SGR) or the link (OSC 8)."""
+
+
+def _plain(line: str) -> str:
+    """The line without ANSI escape sequences (as displayed)."""
+    return _ANSI_ESCAPE.sub("", line.rsplit("\r", 1)[-1]).expandtabs()
+
+
+class OutputView(ScrollView, can_focus=False):
+    """Scrollable output of a command, rendering only the visible lines.
+
+    The ANSI codes are parsed line by line, when the line is first displayed,
+    so the cost depends on the size of the view, not on the length of the output.
+    Only the style codes are scanned in advance, to know the style each line
+    starts with (styles carry over from one line to the next, as in a terminal).
+    """
+
+    DEFAULT_CSS = """
+    OutputView {
+        height: auto;
+        overflow: auto auto;
+    }
+    """
+
+    MATCH_STYLE: ClassVar[Style] = Style(reverse=True)
+
+    def __init__(self, text: str = "", *, max_height: int | None = None, **kwargs):
+        super().__init__(**kwargs)
+        if max_height is not None:
+            self.styles.max_height = max_height
+        self._text = ""
+        self._lines: list[str] = []
+        self._styles: list[Style] = [Style.null()]
+        """Style at the start of each line (and after the last one)."""
+
+        self._width = 0
+        self._strips: LRUCache[int, Strip] = LRUCache(1024)
+        self._status: str | None = None
+        self.query_text: str = ""
+        """Text searched for (and highlighted)."""
+
+        self.match_line: int | None = None
+        """Index of the line with the current match."""
+
+        self.set_text(text)
+
+    @property
+    def lines(self) -> Sequence[str]:
+        """The raw lines (with ANSI codes)."""
+        return self._lines
+
+    @property
+    def status(self) -> str | None:
+        """Dimmed line shown after the output (e.g. a progress indicator)."""
+        return self._status
+
+    @status.setter
+    def status(self, value: str | None) -> None:
+        self._status = value
+        self._strips.discard(len(self._lines))
+        self._update_virtual_size()
+        self.refresh_lines(len(self._lines))
+
+    def set_text(self, text: str) -> None:
+        """Replace the displayed output.
+
+        If the text extends the current one (e.g. streamed output), only the
+        new lines (and the last one, if it was unfinished) are processed.
+        """
+        previous, self._text = self._text, text
+        if previous and text.startswith(previous):
+            start = previous.rfind("\n") + 1
+            # Without the last line, if unfinished
+            kept = len(self._lines) - (not previous.endswith("\n"))
+            # The last line and the status are displayed again
+            for index in range(kept, len(self._lines) + 1):
+                self._strips.discard(index)
+            del self._lines[kept:]
+            del self._styles[kept + 1 :]
+        else:
+            start = 0
+            self._lines = []
+            self._styles = [Style.null()]
+            self._width = 0
+            self._strips.clear()
+        new_lines = text[start:].split("\n")
+        if new_lines[-1] == "":
+            new_lines.pop()
+        self._lines.extend(new_lines)
+        self._scan_styles(new_lines)
+        self._width = max(
+            self._width, max((cell_len(_plain(line)) for line in new_lines), default=0)
+        )
+        self._update_virtual_size()
+        self.refresh()
+
+    def _scan_styles(self, lines: list[str]) -> None:
+        """Compute the style at the end of each line (starting from the last one)."""
+        decoder = AnsiDecoder()
+        decoder.style = self._styles[-1]
+        for line in lines:
+            if "\x1b" in line and (
+                codes := "".join(match.group() for match in _ANSI_STYLE.finditer(line))
+            ):
+                decoder.decode_line(codes)
+            self._styles.append(decoder.style)
+
+    def _update_virtual_size(self) -> None:
+        status_width = cell_len(self._status) if self._status else 0
+        self.virtual_size = Size(
+            max(self._width, status_width),
+            len(self._lines) + (self._status is not None),
+        )
+
+    def notify_style_update(self) -> None:
+        super().notify_style_update()
+        self._strips.clear()
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        index = scroll_y + y
+        width = self.size.width
+        rich_style = self.rich_style
+        if index >= len(self._lines) + (self._status is not None):
+            return Strip.blank(width, rich_style)
+        strip = self._strips.get(index)
+        if strip is None:
+            text = self._line_text(index)
+            text.stylize_before(rich_style)
+            strip = Strip(text.render(self.app.console), text.cell_len)
+            self._strips[index] = strip
+        return strip.crop_extend(scroll_x, scroll_x + width, rich_style).apply_offsets(
+            scroll_x, index
+        )
+
+    def _line_text(self, index: int) -> Text:
+        if index == len(self._lines):
+            return Text(self._status or "", style="dim", no_wrap=True, end="")
+        decoder = AnsiDecoder()
+        decoder.style = self._styles[index]
+        text = decoder.decode_line(self._lines[index])
+        text.no_wrap = True
+        text.end = ""
+        text.expand_tabs()
+        if self.query_text:
+            text.highlight_words(
+                [self.query_text], self.MATCH_STYLE, case_sensitive=False
+            )
+        return text
+
+    def search(self, query: str, *, backwards: bool = False) -> bool:
+        """Scroll to the next (or previous) line containing the text (ignoring case).
+
+        The search starts after the current match and wraps around.
+
+        Returns:
+            Whether the text was found.
+        """
+        if query != self.query_text:
+            self.query_text = query
+            self.match_line = None
+            self._strips.clear()
+            self.refresh()
+        if not query or not self._lines:
+            return False
+        needle = query.casefold()
+        count = len(self._lines)
+        step = -1 if backwards else 1
+        start = self.match_line
+        if start is None:
+            start = count if backwards else -1
+        for offset in range(1, count + 1):
+            index = (start + step * offset) % count
+            if needle in _plain(self._lines[index]).casefold():
+                self.match_line = index
+                self.scroll_to(
+                    y=max(0, index - self.scrollable_content_region.height // 2),
+                    animate=False,
+                )
+                return True
+        return False
+
+
+class StreamingOutput(OutputView):
+    """Output of a running command, refreshed (at a capped rate) as it arrives.
+
+    It keeps showing the end of the output, unless scrolled up.
+    """
+
+    REFRESH_INTERVAL: ClassVar[float] = 0.1
+    """Minimum time (in seconds) between two updates of the displayed output."""
+
+    SPINNER: ClassVar[str] = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+
+    def __init__(
+        self,
+        stream: "OutputStream | SharedOutput",
+        *,
+        running_status: str = "Running... (escape to cancel)",
+        **kwargs,
+    ):
+        kwargs.setdefault("classes", "output")
+        super().__init__(**kwargs)
+        self.stream = stream
+        self.running_status = running_status
+        """Shown (after a spinner) until the output is complete."""
+
+        self._frame = 0
+        self._timer: Timer | None = None
+        self._version: int | None = None
+        """Version of the stream displayed."""
+
+    def on_mount(self) -> None:
+        self._update_from_stream()
+        if not self.stream.done:
+            self._timer = self.set_interval(
+                self.REFRESH_INTERVAL, self._update_from_stream
+            )
+
+    def _update_from_stream(self) -> None:
+        follow = self.is_vertical_scroll_end
+        if self._version != self.stream.version:
+            self._version = self.stream.version
+            self.set_text(self.stream.text)
+        if self.stream.done:
+            if self._timer is not None:
+                self._timer.stop()
+                self._timer = None
+            self.set_class(self.stream.is_error, "error")
+            self.set_class(not self.stream.is_error, "output")
+            self.status = None
+        else:
+            self._frame = (self._frame + 1) % len(self.SPINNER)
+            self.status = f"{self.SPINNER[self._frame]} {self.running_status}"
+        if follow:
+            self.scroll_end(animate=False, immediate=True, x_axis=False)
+
+
+def _digest(markdown: str) -> str:
+    return hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+
+
+class CachedMarkdownParser:
+    """Markdown parser reusing the tokens of the documents parsed before.
+
+    Pass the class as `parser_factory` of the `Markdown` widget: navigating back
+    to a slide, resizing or changing the theme then only rebuilds the blocks.
+    The documents are identified by the hash of their source.
+    """
+
+    _tokens: ClassVar[LRUCache[str, "list[Token]"]] = LRUCache(MARKDOWN_CACHE_SIZE)
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+    """The widget parses in a thread."""
+
+    def parse(self, markdown: str) -> "list[Token]":
+        key = _digest(markdown)
+        with self._lock:
+            tokens = self._tokens.get(key)
+        if tokens is None:
+            from markdown_it import MarkdownIt
+
+            # The default parser of the widget
+            tokens = MarkdownIt("gfm-like").parse(markdown)
+            with self._lock:
+                self._tokens[key] = tokens
+        return tokens
+
+    @classmethod
+    def forget(cls, markdown: str) -> None:
+        """Drop the parsed document (e.g. when the slide is reloaded)."""
+        with cls._lock:
+            cls._tokens.discard(_digest(markdown))
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._tokens.clear()
@@ -0,0 +1,277 @@
+"""Pre-forking server of the apps shown with `--serve` (POSIX only).
+
+textual-serve starts a new process for every browser connection. Instead
+of starting clippt from scratch (importing textual and loading the deck),
+that process is a thin client handing its standard streams over to the zygote:
+a process with everything imported and the presentation loaded, which forks
+a copy of itself running the app for the connection.
+
+It is run as `python -m clippt.zygote SOCKET` (the client), so this module
+only imports the standard library.
+"""
+
+import json
+import os
+import select
+import shlex
+import signal
+import socket
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Callable
+
+
+class Zygote:
+    """Process forking an app for each connection of a client.
+
+    Everything that the apps share (imports, loaded slides...) should be done
+    before `start`, and nothing should run in other threads by then.
+    """
+
+    def __init__(self, app_factory: Callable[[], Any]):
+        self.app_factory = app_factory
+        """Creates the app (in the forked process), which gets its `first_frame_callback` set."""
+
+        self._directory = Path(tempfile.mkdtemp(prefix="clippt-"))
+        self.socket_path = self._directory / "zygote.sock"
+        self.pid: int | None = None
+        self._apps: dict[int, _App] = {}
+        """The running apps, by process id (in the zygote)."""
+
+    @property
+    def client_command(self) -> str:
+        """Shell command connecting to the zygote (to run for each connection)."""
+        return shlex.join(
+            [sys.executable, "-m", "clippt.zygote", str(self.socket_path)]
+        )
+
+    def start(self) -> None:
+        """Fork the zygote process, accepting the connections until `stop`."""
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(self.socket_path))
+        listener.listen()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._serve(listener)
+            except SystemExit:
+                pass
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        listener.close()
+        self.pid = pid
+
+    def stop(self) -> None:
+        """Terminate the zygote and the apps it runs."""
+        if self.pid is not None:
+            try:
+                os.kill(self.pid, signal.SIGTERM)
+                os.waitpid(self.pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self.pid = None
+        self.socket_path.unlink(missing_ok=True)
+        try:
+            self._directory.rmdir()
+        except OSError:
+            pass
+
+    def _serve(self, listener: socket.socket) -> None:
+        parent = os.getppid()
+        apps = self._apps
+
+        def terminate(signum, frame):
+            raise SystemExit(0)
+
+        signal.signal(signal.SIGTERM, terminate)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # Stopped by the parent
+        count = 0
+        try:
+            while os.getppid() == parent:
+                watched: list[Any] = [listener]
+                for app in apps.values():
+                    watched += [app.pipe] if app.reporting else []
+                    watched += [app.conn] if app.connected else []
+                ready, _, _ = select.select(watched, [], [], 0.2)
+                for item in ready:
+                    if item is listener:
+                        conn, _ = listener.accept()
+                        count += 1
+                        app = self._fork_app(listener, conn, number=count)
+                        apps[app.pid] = app
+                        continue
+                    for app in apps.values():
+                        if item == app.pipe:
+                            app.reporting = self._report(app.pipe)
+                        elif item is app.conn and not app.conn.recv(1024):
+                            # The client is gone (e.g. closed browser tab)
+                            app.connected = False
+                            _kill(app.pid)
+                self._reap(apps)
+        finally:
+            for pid in apps:
+                _kill(pid)
+
+    def _fork_app(
+        self, listener: socket.socket, conn: socket.socket, *, number: int
+    ) -> "_App":
+        _, fds, _, _ = socket.recv_fds(conn, 1, 3)
+        with conn.makefile("rb") as stream:
+            request = json.loads(stream.readline())
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                listener.close()
+                os.close(read_fd)
+                for app in self._apps.values():
+                    app.conn.close()
+                    os.close(app.pipe)
+                conn.close()
+                code = self._run_app(fds, request, write_fd, number=number)
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(code)
+        for fd in (*fds, write_fd):
+            os.close(fd)
+        return _App(pid=pid, conn=conn, pipe=read_fd)
+
+    def _run_app(
+        self, fds: list[int], request: dict, report_fd: int, *, number: int
+    ) -> int:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        os.environ.clear()
+        os.environ.update(request["env"])
+        if "textual.constants" in sys.modules:
+            _reload_textual_constants()
+
+        def first_frame() -> None:
+            latency = time.time() - request["start"]
+            os.write(report_fd, f"{number} {latency}\n".encode())
+
+        app = self.app_factory()
+        app.first_frame_callback = first_frame
+        app.run()
+        return app.return_code or 0
+
+    @staticmethod
+    def _report(pipe: int) -> bool:
+        """Print the latencies reported by an app (returns False once it exited)."""
+        # The lines are short enough to be written atomically
+        data = os.read(pipe, 1024)
+        for line in data.decode().splitlines():
+            number, latency = line.split()
+            print(
+                f"Connection {number}: first frame after {float(latency) * 1000:.0f} ms",
+                file=sys.__stderr__,  # Even if redirected in the parent
+                flush=True,
+            )
+        return bool(data)
+
+    @classmethod
+    def _reap(cls, apps: dict[int, "_App"]) -> None:
+        for pid in list(apps):
+            try:
+                finished, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                finished, status = pid, 256  # Exit code 1
+            if finished:
+                app = apps.pop(pid)
+                if app.reporting:
+                    cls._report(app.pipe)  # Not read yet if the app exited quickly
+                try:
+                    code = os.waitstatus_to_exitcode(status)
+                    app.conn.sendall(f"{code}\n".encode())
+                except OSError:
+                    pass
+                app.conn.close()
+                os.close(app.pipe)
+
+
+class _App:
+    """Process running an app for a client."""
+
+    def __init__(self, *, pid: int, conn: socket.socket, pipe: int):
+        self.pid = pid
+        self.conn = conn
+        self.pipe = pipe
+        """Reading end of the pipe the app reports its latency to."""
+
+        self.connected = True
+        self.reporting = True
+
+
+def _reload_textual_constants() -> None:
+    """Read the settings of Textual again, from the environment of the connection.
+
+    They are read when `textual.constants` is imported (e.g. the web driver),
+    and some are copied by other modules (`from textual.constants import ...`)
+    or used as default values, which are updated too.
+    """
+    import importlib
+
+    constants = sys.modules["textual.constants"]
+    old = {name: value for name, value in vars(constants).items() if name.isupper()}
+    importlib.reload(constants)
+    changed = {
+        name: value
+        for name, value in old.items()
+        if getattr(constants, name, value) is not value
+    }
+    if not changed:
+        return
+    for module_name, module in list(sys.modules.items()):
+        if not module_name.startswith("textual.") or module is constants:
+            continue
+        module_vars = vars(module)
+        for name, value in changed.items():
+            if module_vars.get(name, constants) is value:
+                setattr(module, name, getattr(constants, name))
+    dim_color = getattr(sys.modules.get("textual.filter"), "dim_color", None)
+    if "DIM_FACTOR" in changed and hasattr(dim_color, "cache_clear"):
+        # Cached function with the factor as default argument
+        dim_color.__wrapped__.__defaults__ = (constants.DIM_FACTOR,)
+        dim_color.cache_clear()
+
+
+def _kill(pid: int) -> None:
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+
+
+def connect(socket_path: str) -> int:
+    """Run an app in the zygote with the standard streams of this process.
+
+    Returns:
+        The exit code of the app.
+    """
+    start = time.time()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path)
+        socket.send_fds(conn, [b"\0"], [0, 1, 2])
+        request = {"env": dict(os.environ), "start": start}
+        conn.sendall(json.dumps(request).encode() + b"\n")
+        with conn.makefile("rb") as stream:
+            line = stream.readline()
+    return int(line) if line.strip() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(connect(sys.argv[1]))
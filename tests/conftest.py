@@ -1,6 +1,9 @@
+from collections.abc import Callable
 from pathlib import Path
+from types import SimpleNamespace
 
-from clippt import Presentation
+from clippt import Presentation, slides
+from clippt.slides import ExecutionContext
 import pytest
 
 
@@ -9,3 +12,51 @@ def empty_presentation() -> Presentation:
     return Presentation(
         slides=[], title="Simple presentation", slide_base_path=Path(".")
     )
+
+
+@pytest.fixture
+def exec_calls(monkeypatch) -> list[tuple[str, int, int]]:
+    """Commands run by the executable slides (faked), with the terminal size.
+
+    The output is "<command> @ <columns>x<rows>" (an error for "fail").
+    """
+    calls = []
+
+    def fake_exec(*, command, cwd, columns, rows, limits):
+        calls.append((command, columns, rows))
+        return f"{command} @ {columns}x{rows}", command == "fail"
+
+    monkeypatch.setattr(slides, "exec_in_pseudo_terminal", fake_exec)
+    return calls
+
+
+@pytest.fixture
+def make_app() -> Callable[..., SimpleNamespace]:
+    """Factory of minimal stand-ins for the app (what the lookahead uses of it)."""
+
+    def make_app(**attributes) -> SimpleNamespace:
+        defaults = {"execution": ExecutionContext(), "log": lambda *args: None}
+        return SimpleNamespace(**(defaults | attributes))
+
+    return make_app
+
+
+@pytest.fixture
+def context() -> ExecutionContext:
+    return ExecutionContext()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory, monkeypatch) -> Path:
+    """Keep the caches (e.g. the compiled code) out of the user's directory."""
+    directory = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("CLIPPT_CACHE_DIR", str(directory))
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path_factory, monkeypatch) -> Path:
+    """Keep the state of the sessions (see `--continue`) out of the user's directory."""
+    directory = tmp_path_factory.mktemp("state")
+    monkeypatch.setenv("CLIPPT_STATE_DIR", str(directory))
+    return directory
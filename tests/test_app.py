@@ -1,8 +1,11 @@
+import json
+import sys
 from pathlib import Path
 from textwrap import dedent
 
 from clippt.app import PresentationApp
-from clippt.slides import ErrorSlide, MarkdownSlide
+from clippt.slides import ErrorSlide, MarkdownSlide, PythonSlide, ShellSlide
+from clippt.widgets import OutputView, StreamingOutput
 from clippt.presentation import Presentation
 
 import pytest
@@ -33,3 +36,179 @@ class TestApp:
         app = PresentationApp(empty_presentation)
         async with app.run_test():
             assert isinstance(app.current_slide, ErrorSlide)
+
+
+@pytest.fixture
+def three_slides_presentation() -> Presentation:
+    return Presentation(
+        slides=[MarkdownSlide(source=f"# Slide {i}") for i in range(3)],
+        title="Three slides",
+        slide_base_path=Path("."),
+    )
+
+
+@pytest.mark.asyncio
+class TestSlideWidgetCache:
+    async def test_navigation_reuses_widgets(self, three_slides_presentation):
+        app = PresentationApp(three_slides_presentation)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            first_widget = app.slide_cache.get(0)
+            assert first_widget is not None
+            # Neighbour pre-rendered during idle time
+            assert 1 in app.slide_cache
+
+            await pilot.press("pagedown")
+            await pilot.press("pageup")
+            await pilot.pause()
+            assert app.slide_cache.get(0) is first_widget
+            assert first_widget.display
+
+    async def test_reload_invalidates(self, three_slides_presentation):
+        app = PresentationApp(three_slides_presentation)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            first_widget = app.slide_cache.get(0)
+            await pilot.press("r")
+            await pilot.pause()
+            assert app.slide_cache.get(0) is not first_widget
+            assert not first_widget.is_attached
+
+    async def test_disabled(self, three_slides_presentation):
+        app = PresentationApp(three_slides_presentation, cache_size=0)
+        async with app.run_test() as pilot:
+            await pilot.press("pagedown")
+            await pilot.pause()
+            assert len(app.slide_cache) == 0
+            assert len(app.query_one("#content").children) == 1
+            assert app.last_update_duration is not None
+
+    async def test_memory_cap(self, three_slides_presentation):
+        app = PresentationApp(three_slides_presentation, cache_max_bytes=10)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            assert list(app.slide_cache._entries) == [0]
+
+    async def test_resize_keeps_reflowing_slides(self, three_slides_presentation):
+        app = PresentationApp(three_slides_presentation)
+        async with app.run_test(size=(80, 24)) as pilot:
+            await pilot.pause()
+            first_widget = app.slide_cache.get(0)
+            await pilot.resize_terminal(100, 30)
+            await pilot.pause(app.RESIZE_DEBOUNCE * 2)
+            assert app.slide_cache.get(0) is first_widget
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Needs a PTY")
+@pytest.mark.asyncio
+class TestStreamingShellSlide:
+    async def test_output_streams_without_blocking(self):
+        slide = ShellSlide(
+            source="echo start; sleep 1; echo end", display_mode="output"
+        )
+        presentation = Presentation(slides=[slide], slide_base_path=Path("."))
+        app = PresentationApp(presentation)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            output = app.query_one(StreamingOutput)
+            assert not output.stream.done
+            await app.workers.wait_for_complete()
+            await pilot.pause(StreamingOutput.REFRESH_INTERVAL * 2)
+            assert "end" in output.stream.text
+            assert slide._outputs
+
+    async def test_cancel(self):
+        slide = ShellSlide(source="sleep 10", display_mode="output")
+        presentation = Presentation(slides=[slide], slide_base_path=Path("."))
+        app = PresentationApp(presentation)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await pilot.press("escape")
+            await app.workers.wait_for_complete()
+            output = app.query_one(StreamingOutput)
+            assert output.stream.done
+            assert output.stream.is_error
+            assert not slide._outputs
+
+
+@pytest.mark.asyncio
+class TestTimings:
+    async def test_toggle_timings(self, three_slides_presentation):
+        app = PresentationApp(three_slides_presentation, cache_size=0)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            timings = app.query_one("#timings")
+            assert not timings.display
+            await pilot.press("t")
+            assert timings.display
+            await pilot.press("pagedown")
+            await pilot.pause()
+            text = str(timings.render())
+            assert text.startswith("Slide 2: update_slide")
+            assert "render_impl" in text
+
+    async def test_trace_written_on_exit(self, three_slides_presentation, tmp_path):
+        trace_path = tmp_path / "trace.json"
+        app = PresentationApp(three_slides_presentation, trace_path=trace_path)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+        names = {
+            event["name"] for event in json.loads(trace_path.read_text())["traceEvents"]
+        }
+        assert {"update_slide", "render", "render_impl"} <= names
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Needs a PTY")
+@pytest.mark.asyncio
+class TestOutputSearch:
+    async def test_search_and_repeat(self):
+        slide = ShellSlide(source="seq 1 500", display_mode="output")
+        presentation = Presentation(slides=[slide], slide_base_path=Path("."))
+        app = PresentationApp(presentation)
+        async with app.run_test() as pilot:
+            await app.workers.wait_for_complete()
+            await pilot.pause(StreamingOutput.REFRESH_INTERVAL * 2)
+            output = app.query_one(OutputView)
+            await pilot.press("slash")
+            await pilot.pause()
+            assert app.query_one("#search").has_focus
+            await pilot.press("4", "2", "enter")
+            await pilot.pause()
+            assert not app.query("#search")
+            assert output.match_line == 41
+            await pilot.press("n")
+            assert output.match_line == 141
+            await pilot.press("N")
+            assert output.match_line == 41
+
+    async def test_no_output(self, three_slides_presentation):
+        app = PresentationApp(three_slides_presentation)
+        async with app.run_test() as pilot:
+            await pilot.press("slash")
+            await pilot.pause()
+            assert not app.query("#search")
+
+
+@pytest.mark.asyncio
+async def test_syntax_errors_reported_on_start():
+    presentation = Presentation(
+        slides=[PythonSlide(source="print(1)"), PythonSlide(source="print(")],
+        slide_base_path=Path("."),
+    )
+    app = PresentationApp(presentation)
+    async with app.run_test() as pilot:
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        messages = [notification.message for notification in app._notifications]
+        assert messages == ["Slide 2: '(' was never closed (line 1)"]
+
+
+@pytest.mark.asyncio
+async def test_first_frame_callback(three_slides_presentation):
+    calls = []
+    app = PresentationApp(three_slides_presentation)
+    app.first_frame_callback = lambda: calls.append(app.slide_index)
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await pilot.press("pagedown")
+    assert calls == [0]
@@ -0,0 +1,50 @@
+import json
+
+from benchmarks.decks import generate_deck
+from benchmarks.runner import compare, measure_load, run_benchmark
+from clippt.presentation import Presentation
+
+
+def test_generate_deck(tmp_path):
+    manifest = generate_deck(tmp_path, slides=12)
+    presentation = Presentation.from_path(manifest)
+    assert presentation.slides_count == 12
+    assert [type(slide).__name__ for slide in presentation.slides[:5]] == [
+        "MarkdownSlide",
+        "PythonSlide",
+        "DataSlide",
+        "DataSlide",
+        "ShellSlide",
+    ]
+    # Code slides hide the setup and teardown
+    assert "HIDE" in presentation.slides[1].source
+
+
+def test_run_benchmark(tmp_path):
+    manifest = generate_deck(tmp_path, slides=6, kinds=("markdown", "code"))
+    results = run_benchmark(manifest, steps=3)
+    json.dumps(results)  # Serializable
+    assert results["parameters"]["slides"] == 6
+    assert results["navigation"]["count"] == 3
+    assert set(results["render"]) == {"MarkdownSlide", "PythonSlide"}
+    assert results["load"]["peak_bytes"] > 0
+    assert {"parse_s", "parse_warm_s", "eager_s", "eager_warm_s"} <= set(
+        results["load"]
+    )
+
+
+def test_load_uses_empty_caches(tmp_path, cache_dir):
+    manifest = generate_deck(tmp_path, slides=6, kinds=("markdown", "code"))
+    measure_load(manifest)
+    measure_load(manifest)
+    # Neither the caches of the user (here, of the tests) are used or filled
+    assert not any(cache_dir.iterdir())
+
+
+def test_compare():
+    baseline = {"load": {"eager_s": 1.0, "peak_bytes": 100}, "parameters": {}}
+    current = {"load": {"eager_s": 1.5, "peak_bytes": 100}, "parameters": {}}
+    assert compare(baseline, current) == [
+        ("load.eager_s", 1.0, 1.5, True),
+        ("load.peak_bytes", 100.0, 100.0, False),
+    ]
@@ -0,0 +1,128 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from clippt.app import PresentationApp
+from clippt.broadcast import Broadcaster, Follower
+from clippt.presentation import Presentation
+from clippt.slides import MarkdownSlide, ShellSlide
+from clippt.widgets import StreamingOutput
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
+
+
+@pytest.fixture
+def socket_path(tmp_path_factory) -> Path:
+    # Short enough for a socket path
+    return tmp_path_factory.mktemp("s") / "talk.sock"
+
+
+class Received:
+    """States received by a follower."""
+
+    def __init__(self):
+        self.states = []
+        self._changed = threading.Condition()
+
+    def __call__(self, state: dict) -> None:
+        with self._changed:
+            self.states.append(state)
+            self._changed.notify_all()
+
+    def wait_for(self, predicate, timeout: float = 5.0) -> dict:
+        with self._changed:
+            assert self._changed.wait_for(
+                lambda: self.states and predicate(self.states[-1]), timeout
+            ), self.states
+            return self.states[-1]
+
+
+def test_followers_get_last_and_new_states(socket_path):
+    broadcaster = Broadcaster(socket_path)
+    follower = Follower(socket_path)
+    received = Received()
+    try:
+        assert broadcaster.publish({"slide_index": 1})
+        assert not broadcaster.publish({"slide_index": 1})
+        follower.start(received)
+        received.wait_for(lambda state: state == {"slide_index": 1})
+        broadcaster.publish({"slide_index": 2})
+        received.wait_for(lambda state: state == {"slide_index": 2})
+    finally:
+        follower.close()
+        broadcaster.close()
+    assert not socket_path.exists()
+
+
+def deck() -> Presentation:
+    return Presentation(
+        slides=[
+            MarkdownSlide(source="# Intro"),
+            ShellSlide(source="echo shared", display_mode="output"),
+        ],
+        slide_base_path=Path("."),
+    )
+
+
+@pytest.mark.asyncio
+async def test_presenter_publishes_output(socket_path):
+    app = PresentationApp(deck(), broadcaster=Broadcaster(socket_path))
+    follower = Follower(socket_path)
+    received = Received()
+    follower.start(received)
+    try:
+        async with app.run_test() as pilot:
+            received.wait_for(lambda state: state["slide_index"] == 0)
+            await pilot.press("pagedown")
+            await app.workers.wait_for_complete()
+            await pilot.pause(app.BROADCAST_INTERVAL * 2)
+            state = received.wait_for(
+                lambda state: (state.get("output") or {}).get("done", False)
+            )
+            assert state["slide_index"] == 1
+            assert state["display_mode"] == "output"
+            assert "shared" in state["output"]["text"]
+    finally:
+        follower.close()
+
+
+@pytest.mark.asyncio
+async def test_follower_shows_presenter_state(socket_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("Executed by the follower")
+
+    monkeypatch.setattr(ShellSlide, "_exec_inline", fail)
+    monkeypatch.setattr(ShellSlide, "_exec_streaming", fail)
+    presentation = deck()
+    slide = presentation.slides[1]
+    source_hash, _, _ = slide._output_key(columns=0, rows=0)
+    broadcaster = Broadcaster(socket_path)
+    app = PresentationApp(presentation, follower=Follower(socket_path))
+    try:
+        async with app.run_test() as pilot:
+            await pilot.press("pagedown")
+            assert app.slide_index == 0
+            broadcaster.publish(
+                {
+                    "slide_index": 1,
+                    "display_mode": "output",
+                    "output": {
+                        "source": source_hash,
+                        "text": "from the presenter\n",
+                        "is_error": False,
+                        "done": True,
+                    },
+                }
+            )
+            for _ in range(50):
+                await pilot.pause(0.1)
+                if app.slide_index == 1:
+                    break
+            await pilot.pause(StreamingOutput.REFRESH_INTERVAL * 2)
+            output = app.query_one(StreamingOutput)
+            assert output.lines == ["from the presenter"]
+            assert output.status is None
+    finally:
+        broadcaster.close()
@@ -0,0 +1,123 @@
+import zipfile
+
+import polars as pl
+import pyarrow as pa
+import pytest
+
+from clippt import data as data_module
+from clippt.bundle import Bundle, BundleError, build_bundle, load_bundle
+from clippt.data import DataSlide
+from clippt.presentation import Presentation
+from clippt.slides import MarkdownSlide, PythonSlide, ShellSlide
+
+
+@pytest.fixture
+def deck(tmp_path):
+    deck = tmp_path / "deck"
+    deck.mkdir()
+    (deck / "intro.md").write_text("# Intro\n")
+    (deck / "code.py").write_text("print(42)\n")
+    (deck / "data.csv").write_text("a,b\n1,2\n3,4\n")
+    (deck / "presentation.toml").write_text(
+        """
+        title = "Deck"
+        slides = [
+            "intro.md",
+            { path = "code.py", title = "Code" },
+            "data.csv",
+            { type = "shell", source = "echo hi" },
+        ]
+        """
+    )
+    return deck
+
+
+@pytest.fixture
+def bundle_path(deck, tmp_path):
+    path = tmp_path / "deck.clippt"
+    build_bundle(deck, path, outputs=[(3, 77, 21, ("hi\n", False))])
+    return path
+
+
+class TestBuild:
+    def test_members(self, bundle_path):
+        with zipfile.ZipFile(bundle_path) as archive:
+            assert sorted(archive.namelist()) == [
+                "data/2.arrow",
+                "manifest.json",
+                "outputs/3-77x21.json",
+                "slides/0/intro.md",
+                "slides/1/code.py",
+            ]
+            assert all(
+                info.compress_type == zipfile.ZIP_STORED for info in archive.infolist()
+            )
+
+    def test_read_from_mapping(self, bundle_path):
+        bundle = Bundle(bundle_path)
+        assert bytes(bundle.read("slides/1/code.py")) == b"print(42)\n"
+        assert bundle.manifest()["model"]["title"] == "Deck"
+        with pytest.raises(FileNotFoundError):
+            bundle.read("slides/9/missing.py")
+
+    def test_not_a_bundle(self, tmp_path):
+        path = tmp_path / "other.clippt"
+        path.write_text("slides = []")
+        with pytest.raises(BundleError):
+            Bundle(path)
+
+    def test_unsupported_format(self, tmp_path):
+        path = tmp_path / "future.clippt"
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("manifest.json", '{"format": 999}')
+        with pytest.raises(BundleError, match="format 999"):
+            load_bundle(path)
+
+
+class TestLoad:
+    def test_slides(self, bundle_path):
+        presentation = Presentation.from_path(bundle_path)
+        assert presentation.title == "Deck"
+        assert presentation.slide_base_path == bundle_path.parent
+        intro, code, data, shell = presentation.slides
+        assert isinstance(intro, MarkdownSlide)
+        assert intro.source == "# Intro\n"
+        assert isinstance(code, PythonSlide)
+        assert (code.title, code.source) == ("Code", "print(42)\n")
+        assert isinstance(data, DataSlide)
+        assert data.data.equals(pl.DataFrame({"a": [1, 3], "b": [2, 4]}))
+        assert isinstance(shell, ShellSlide)
+
+    def test_data_not_copied(self, bundle_path):
+        data = Presentation.from_path(bundle_path).slides[2]
+        mapped = pa.py_buffer(data._reader(data.path))
+        values = data.data["a"].to_arrow().buffers()[1]
+        assert mapped.address <= values.address < mapped.address + mapped.size
+
+    def test_data_out_of_core(self, bundle_path, monkeypatch):
+        monkeypatch.setattr(data_module, "OUT_OF_CORE_THRESHOLD", 0)
+        data = Presentation.from_path(bundle_path).slides[2]
+        assert isinstance(data.data, pl.LazyFrame)
+        assert data.data.collect().equals(pl.DataFrame({"a": [1, 3], "b": [2, 4]}))
+
+    def test_not_watched(self, bundle_path):
+        presentation = load_bundle(bundle_path)
+        assert presentation.slides[0].path == bundle_path / "slides/0/intro.md"
+        assert all(slide.file_path is None for slide in presentation.slides)
+
+    def test_lazy(self, bundle_path):
+        presentation = load_bundle(bundle_path, lazy=True)
+        # Only the slide with a bundled output is read
+        assert [slide.loaded for slide in presentation.slides] == [
+            False,
+            False,
+            False,
+            True,
+        ]
+        presentation.prefetch(0)
+        assert presentation.loaded_count == 4
+
+    def test_outputs(self, bundle_path):
+        shell = load_bundle(bundle_path).slides[3]
+        key = shell._output_key(columns=77, rows=21)
+        assert shell._outputs[key] == ("hi\n", False)
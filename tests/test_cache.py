@@ -0,0 +1,182 @@
+import sys
+import tomllib
+from pathlib import Path
+
+import pytest
+
+from clippt import cache
+from clippt.cache import CodeCache, ModelCache, OutputCache
+from clippt.model import PresentationModel, SlideModel
+from clippt.slides import ExecutionContext, PythonSlide, ShellSlide
+
+
+@pytest.fixture
+def output_cache(tmp_path) -> OutputCache:
+    return OutputCache(tmp_path)
+
+
+def key(**kwargs) -> str:
+    arguments = {
+        "kind": "ShellSlide",
+        "source": "ls",
+        "cwd": Path("."),
+        "columns": 80,
+        "rows": 24,
+        "limits": (100, 1000, 4096),
+    }
+    return OutputCache.key(**(arguments | kwargs))
+
+
+class TestOutputCache:
+    def test_roundtrip(self, output_cache):
+        assert output_cache.get(key()) is None
+        output_cache.put(key(), "\x1b[1mbold\x1b[0m", True)
+        assert output_cache.get(key()) == ("\x1b[1mbold\x1b[0m", True)
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            {"kind": "PythonSlide"},
+            {"source": "ls -la"},
+            {"cwd": Path("/")},
+            {"columns": 100},
+            {"rows": 30},
+            {"limits": (10, 1000, 4096)},
+        ],
+    )
+    def test_key_differs(self, change):
+        assert key() != key(**change)
+
+    def test_key_depends_on_environment(self, monkeypatch):
+        monkeypatch.setenv("VIRTUAL_ENV", "/one")
+        first = key()
+        monkeypatch.setenv("VIRTUAL_ENV", "/two")
+        assert first != key()
+
+    def test_corrupted_entry_ignored(self, output_cache):
+        output_cache.put(key(), "output", False)
+        output_cache._path(key()).write_text("{")
+        assert output_cache.get(key()) is None
+
+
+class TestPersistedOutput:
+    def test_reused_by_new_slide(self, output_cache, exec_calls):
+        context = ExecutionContext(output_cache=output_cache)
+        ShellSlide(source="fail")._exec_cached(context, columns=80, rows=24)
+        slide = ShellSlide(source="fail")
+        assert slide._exec_cached(context, columns=80, rows=24) == "fail @ 80x24"
+        assert slide.is_error
+        assert exec_calls == [("fail", 80, 24)]
+
+    def test_output_limits_in_key(self, output_cache, exec_calls):
+        context = ExecutionContext(output_cache=output_cache)
+        ShellSlide(source="ls")._exec_cached(context, columns=80, rows=24)
+        slide = ShellSlide(source="ls", output_head_lines=5)
+        slide._exec_cached(context, columns=80, rows=24)
+        assert len(exec_calls) == 2
+
+    def test_opt_out(self, output_cache, exec_calls):
+        context = ExecutionContext(output_cache=output_cache)
+        ShellSlide(source="ls", cache=False)._exec_cached(context, columns=80, rows=24)
+        ShellSlide(source="ls", cache=False)._exec_cached(context, columns=80, rows=24)
+        assert [call[0] for call in exec_calls] == ["ls", "ls"]
+
+
+@pytest.fixture(autouse=True)
+def write_bytecode(monkeypatch):
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+
+
+class TestCodeCache:
+    def test_compiled_once(self, tmp_path, monkeypatch):
+        cache = CodeCache(tmp_path)
+        code = cache.compile("x = 1", "slide.py")
+        assert code.co_filename == "slide.py"
+        assert cache.compile("x = 1", "slide.py") is code
+        assert cache.compile("x = 1", "other.py").co_filename == "other.py"
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Compiled again")
+
+        monkeypatch.setattr("clippt.cache.compile", fail, raising=False)
+        # Loaded from disk
+        namespace = {}
+        exec(CodeCache(tmp_path).compile("x = 1", "slide.py"), namespace)
+        assert namespace["x"] == 1
+
+    def test_stale_entry_ignored(self, tmp_path):
+        cache = CodeCache(tmp_path)
+        cache.compile("x = 1", "slide.py")
+        path = cache._path(CodeCache.key("x = 1", "slide.py"))
+        path.write_bytes(b"\0\0\0\0garbage")
+        assert CodeCache(tmp_path).compile("x = 1", "slide.py").co_filename
+
+    def test_not_written_if_disabled(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(sys, "dont_write_bytecode", True)
+        CodeCache(tmp_path).compile("x = 1", "slide.py")
+        assert not (tmp_path / "bytecode").exists()
+
+    def test_syntax_error(self, tmp_path):
+        with pytest.raises(SyntaxError):
+            CodeCache(tmp_path).compile("x = ", "slide.py")
+
+
+class TestModelCache:
+    MANIFEST = """
+    title = "Deck"
+    slides = ["intro.md", { path = "code.py", title = "Code" }, { source = "Hi" }]
+    """
+
+    @pytest.fixture
+    def manifest(self, tmp_path) -> Path:
+        path = tmp_path / "presentation.toml"
+        path.write_text(self.MANIFEST)
+        return path
+
+    def test_reused_without_parsing(self, tmp_path, manifest, monkeypatch):
+        model_cache = ModelCache(tmp_path / "cache")
+        model = PresentationModel.from_path(manifest, cache=model_cache)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("parsed again")
+
+        monkeypatch.setattr(tomllib, "loads", fail)
+        cached = PresentationModel.from_path(manifest, cache=model_cache)
+        assert cached == model
+        assert isinstance(cached.slides[1], SlideModel)
+        assert cached.slides[1].path == Path("code.py")
+        # Unset fields stay unset (as used by `Slide.from_model`)
+        assert cached.slides[2].model_dump(exclude_unset=True) == {"source": "Hi"}
+
+    def test_changed_manifest(self, tmp_path, manifest):
+        model_cache = ModelCache(tmp_path / "cache")
+        PresentationModel.from_path(manifest, cache=model_cache)
+        manifest.write_text(self.MANIFEST.replace("Deck", "New deck"))
+        model = PresentationModel.from_path(manifest, cache=model_cache)
+        assert model.title == "New deck"
+
+    def test_key_depends_on_version(self, monkeypatch):
+        key = ModelCache.key(b"slides = []", suffix=".toml")
+        monkeypatch.setattr(cache, "clippt_version", lambda: "99.0")
+        assert ModelCache.key(b"slides = []", suffix=".toml") != key
+
+    def test_corrupted_entry_ignored(self, tmp_path, manifest):
+        model_cache = ModelCache(tmp_path / "cache")
+        PresentationModel.from_path(manifest, cache=model_cache)
+        for path in model_cache.directory.glob("*/*.bin"):
+            path.write_bytes(b"garbage")
+        model = PresentationModel.from_path(manifest, cache=model_cache)
+        assert model.title == "Deck"
+
+
+class TestCompiledSlide:
+    def test_compiled_on_load(self, tmp_path):
+        path = tmp_path / "slide.py"
+        path.write_text("print('one')\n")
+        slide = PythonSlide(path=path)
+        assert slide.code.co_filename == str(path)
+        assert slide.syntax_error is None
+
+        path.write_text("print(\n")
+        slide.reload()
+        assert slide.syntax_error.lineno == 1
@@ -0,0 +1,107 @@
+import pytest
+from click.testing import CliRunner
+
+from clippt.cli import clippt
+
+
+def test_help():
+    result = CliRunner().invoke(clippt, ["--help"])
+    assert result.exit_code == 0
+    assert "show" in result.output
+    assert "warm" in result.output
+
+
+def test_source_without_command(tmp_path):
+    result = CliRunner().invoke(clippt, [str(tmp_path / "missing.toml")])
+    # Routed to `show`, which validates the path
+    assert result.exit_code == 2
+    assert "does not exist" in result.output
+
+
+def test_cache_options(tmp_path, monkeypatch):
+    from clippt.app import PresentationApp
+
+    apps = []
+    monkeypatch.setattr(PresentationApp, "run", lambda app: apps.append(app))
+    (tmp_path / "presentation.toml").write_text('[[slides]]\nsource = "# Hi"\n')
+    result = CliRunner().invoke(
+        clippt, [str(tmp_path), "--cache-size", "4", "--cache-max-mb", "8"]
+    )
+    assert result.exit_code == 0, result.output
+    (app,) = apps
+    assert app.slide_cache.size == 4
+    assert app.slide_cache.max_bytes == 8 * 1024 * 1024
+
+
+@pytest.fixture
+def no_app(monkeypatch):
+    """The slides are run without creating an app (see `ExecutionContext`)."""
+    from clippt.app import PresentationApp
+
+    def fail(*args, **kwargs):
+        raise AssertionError("PresentationApp created")
+
+    monkeypatch.setattr(PresentationApp, "__init__", fail)
+
+
+@pytest.mark.usefixtures("exec_calls", "no_app")
+def test_warm(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLIPPT_CACHE_DIR", str(tmp_path / "cache"))
+    (tmp_path / "presentation.toml").write_text(
+        """
+        [[slides]]
+        type = "shell"
+        source = "echo one"
+
+        [[slides]]
+        type = "shell"
+        source = "echo two"
+        cache = false
+
+        [[slides]]
+        source = "# Markdown"
+        """
+    )
+    result = CliRunner().invoke(
+        clippt, ["warm", str(tmp_path), "--columns", "80", "--rows", "24"]
+    )
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == ["Slide 1: ok"]
+    assert len(list((tmp_path / "cache" / "outputs").glob("*/*.json"))) == 1
+
+
+@pytest.mark.usefixtures("exec_calls", "no_app")
+def test_build(tmp_path):
+    (tmp_path / "presentation.toml").write_text(
+        """
+        [[slides]]
+        type = "shell"
+        source = "echo one"
+
+        [[slides]]
+        type = "shell"
+        source = "echo two"
+        """
+    )
+    size = ["--columns", "80", "--rows", "24"]
+    assert CliRunner().invoke(clippt, ["warm", str(tmp_path), *size]).exit_code == 0
+    (tmp_path / "presentation.toml").write_text(
+        (tmp_path / "presentation.toml").read_text().replace("echo two", "echo 2")
+    )
+    result = CliRunner().invoke(
+        clippt, ["build", str(tmp_path), "--with-outputs", *size]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Slide 2: no output in the cache" in result.output
+    assert "1 outputs" in result.output
+    assert (tmp_path / "presentation.clippt").exists()
+
+
+def test_export(tmp_path):
+    (tmp_path / "presentation.toml").write_text('slides = [{ source = "# Hi" }]')
+    result = CliRunner().invoke(
+        clippt,
+        ["export", str(tmp_path), "-o", str(tmp_path / "out"), "-f", "text", "-j", "1"],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Hi" in (tmp_path / "out" / "slide-001.txt").read_text()
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from clippt.app import PresentationApp
+from clippt.data import LazyPolarsBackend
+from clippt.presentation import Presentation
+from clippt.data import DataSlide
+from textual_fastdatatable import DataTable
+
+
+@pytest.fixture
+def parquet_path(tmp_path) -> Path:
+    path = tmp_path / "data.parquet"
+    pl.DataFrame(
+        {"i": range(1000), "s": [f"row {i}" for i in range(1000)]}
+    ).write_parquet(path)
+    return path
+
+
+class TestLazyPolarsBackend:
+    def test_row_count(self, parquet_path):
+        backend = LazyPolarsBackend(pl.scan_parquet(parquet_path))
+        assert backend.row_count == 1000
+        assert backend.columns == ["i", "s"]
+
+    def test_rows_collected_in_pages(self, parquet_path):
+        backend = LazyPolarsBackend(pl.scan_parquet(parquet_path))
+        assert backend.get_row_at(567) == [567, "row 567"]
+        assert backend.get_cell_at(999, 1) == "row 999"
+        assert len(backend._pages) == 2
+        for page in backend._pages.values():
+            assert len(page) <= backend.PAGE_SIZE + backend.READ_AHEAD
+
+    def test_read_ahead(self, parquet_path):
+        backend = LazyPolarsBackend(pl.scan_parquet(parquet_path))
+        backend.get_row_at(0)
+        backend.get_row_at(backend.PAGE_SIZE + 1)
+        assert list(backend._pages) == [0]
+
+    def test_max_pages(self, parquet_path):
+        backend = LazyPolarsBackend(pl.scan_parquet(parquet_path))
+        for index in range(backend.READ_AHEAD, 1000, backend.PAGE_SIZE):
+            backend.get_row_at(index)
+        assert len(backend._pages) == backend.MAX_PAGES
+
+    def test_out_of_range(self, parquet_path):
+        backend = LazyPolarsBackend(pl.scan_parquet(parquet_path), max_rows=10)
+        with pytest.raises(IndexError):
+            backend.get_row_at(10)
+
+
+class TestOutOfCoreDataSlide:
+    def test_scanned(self, parquet_path):
+        slide = DataSlide(path=parquet_path, out_of_core=True)
+        assert isinstance(slide.data, pl.LazyFrame)
+
+    def test_small_file_read(self, parquet_path):
+        slide = DataSlide(path=parquet_path)
+        assert isinstance(slide.data, pl.DataFrame)
+
+    def test_arrow_file(self, tmp_path):
+        path = tmp_path / "data.arrow"
+        pl.DataFrame({"i": [1, 2]}).write_ipc(path)
+        assert DataSlide(path=path).data.shape == (2, 1)
+        assert isinstance(DataSlide(path=path, out_of_core=True).data, pl.LazyFrame)
+
+    @pytest.mark.asyncio
+    async def test_render(self, parquet_path):
+        slide = DataSlide(path=parquet_path, out_of_core=True)
+        presentation = Presentation(slides=[slide], slide_base_path=Path("."))
+        app = PresentationApp(presentation)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            table = app.query_one(DataTable)
+            assert isinstance(table.backend, LazyPolarsBackend)
+            assert table.row_count == 1000
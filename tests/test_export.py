@@ -0,0 +1,82 @@
+import pytest
+
+from clippt.export import ExportOptions, export_presentation
+
+
+@pytest.fixture
+def deck(tmp_path):
+    deck = tmp_path / "deck"
+    deck.mkdir()
+    (deck / "presentation.toml").write_text(
+        """
+        title = "Deck"
+        slides = [
+            { source = "# Welcome" },
+            { type = "shell", source = "echo exported" },
+            { source = "# Questions" },
+        ]
+        """
+    )
+    return deck
+
+
+def test_export_text(deck, tmp_path):
+    options = ExportOptions(
+        directory=tmp_path / "out", formats=("text", "html"), columns=60, rows=15
+    )
+    paths = export_presentation(deck, options, jobs=1)
+    assert [path.name for path in paths] == [
+        "slide-001.txt",
+        "slide-001.html",
+        "slide-002.txt",
+        "slide-002.html",
+        "slide-003.txt",
+        "slide-003.html",
+    ]
+    first = paths[0].read_text()
+    assert "Welcome" in first
+    assert "1 / 3" in first
+    assert all(len(line) <= 60 for line in first.splitlines())
+    # Not run by default
+    assert "echo exported" in paths[2].read_text()
+    assert "<html>" in paths[1].read_text().lower()
+
+
+def test_export_outputs(deck, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    options = ExportOptions(
+        directory=tmp_path / "out", formats=("text",), run=True, footer=False
+    )
+    paths = export_presentation(deck, options, jobs=1)
+    text = paths[1].read_text()
+    assert "exported" in text
+    assert "echo" not in text
+    assert not (tmp_path / ".current_slide").exists()
+
+
+def test_export_output_of_first_slide(tmp_path):
+    (tmp_path / "presentation.toml").write_text(
+        """
+        slides = [
+            { type = "shell", source = "echo first" },
+            { type = "shell", source = "echo second" },
+        ]
+        """
+    )
+    options = ExportOptions(directory=tmp_path / "out", formats=("text",), run=True)
+    first, second = export_presentation(tmp_path, options, jobs=1)
+    # Already shown (in code mode) when the app started
+    assert "echo first" not in first.read_text()
+    assert "first" in first.read_text()
+    assert "echo second" not in second.read_text()
+
+
+def test_export_in_processes(deck, tmp_path):
+    options = ExportOptions(directory=tmp_path / "out", formats=("svg",))
+    paths = export_presentation(deck, options, jobs=2)
+    assert [path.name for path in paths] == [
+        "slide-001.svg",
+        "slide-002.svg",
+        "slide-003.svg",
+    ]
+    assert paths[2].read_text().startswith("<svg")
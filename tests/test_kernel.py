@@ -0,0 +1,149 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from clippt.app import PresentationApp
+from clippt.kernel import KernelPool
+from clippt.presentation import Presentation
+from clippt.slides import ExecutionContext, PythonSlide
+from clippt.widgets import StreamingOutput
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = KernelPool(1, preload=["json"], timeout=5)
+    yield pool
+    pool.shutdown()
+
+
+class TestKernelPool:
+    def test_output(self, pool):
+        output, is_error = pool.execute("print(WIDTH, HEIGHT)", columns=80, rows=24)
+        assert (output, is_error) == ("80 24\n", False)
+
+    def test_environment(self, pool):
+        output, _ = pool.execute(
+            "import os; print(os.environ['COLUMNS'])", columns=42, rows=24
+        )
+        assert output == "42\n"
+
+    def test_error(self, pool):
+        output, is_error = pool.execute(
+            "print('before')\n1 / 0", filename="slide.py", columns=80, rows=24
+        )
+        assert is_error
+        assert output.startswith("before\nError: division by zero")
+        assert 'File "slide.py", line 2' in output
+
+    def test_compiled_code(self, pool):
+        code = compile("print(WIDTH)\n1 / 0", "compiled.py", "exec")
+        output, is_error = pool.execute(code, columns=80, rows=24)
+        assert is_error
+        assert output.startswith("80\n")
+        assert 'File "compiled.py", line 2' in output
+
+    def test_fresh_globals(self, pool):
+        pool.execute("x = 1", columns=80, rows=24)
+        output, is_error = pool.execute("print(x)", columns=80, rows=24)
+        assert is_error
+        assert "NameError" in output
+
+    def test_streamed_output(self, pool):
+        chunks = []
+        pool.execute(
+            "print('a')\nprint('b')", columns=80, rows=24, on_output=chunks.append
+        )
+        assert "".join(chunks) == "a\nb\n"
+
+    def test_subprocess_output(self, pool):
+        output, is_error = pool.execute(
+            "import os, subprocess, sys\n"
+            "print('before')\n"
+            "os.system('echo from-system')\n"
+            "subprocess.run([sys.executable, '-c', 'print(\"from-child\")'])\n"
+            "os.write(2, b'raw stderr\\n')\n"
+            "print('after')",
+            columns=80,
+            rows=24,
+        )
+        assert not is_error
+        assert output == "before\nfrom-system\nfrom-child\nraw stderr\nafter\n"
+
+    def test_no_shadowing(self, pool):
+        output, _ = pool.execute(
+            "import sys; print(any(p.endswith('clippt') for p in sys.path))",
+            columns=80,
+            rows=24,
+        )
+        assert output == "False\n"
+
+    def test_cancel_respawns(self, pool):
+        cancelled = threading.Event()
+        cancelled.set()
+        output, is_error = pool.execute(
+            "while True: pass", columns=80, rows=24, cancelled=cancelled
+        )
+        assert is_error
+        assert "Cancelled" in output
+        assert pool.execute("print(1)", columns=80, rows=24) == ("1\n", False)
+
+
+def test_timeout():
+    pool = KernelPool(1, timeout=0.5)
+    try:
+        output, is_error = pool.execute("while True: pass", columns=80, rows=24)
+        assert is_error
+        assert "Timeout" in output
+        assert pool.execute("print(2)", columns=80, rows=24) == ("2\n", False)
+    finally:
+        pool.shutdown()
+
+
+def test_shutdown_kills_busy_kernels():
+    pool = KernelPool(1, timeout=60)
+    (kernel,) = pool._kernels
+    thread = threading.Thread(
+        target=pool.execute,
+        args=("while True: pass",),
+        kwargs={"columns": 80, "rows": 24},
+    )
+    thread.start()
+    while pool._idle.qsize():
+        time.sleep(0.01)
+    pool.shutdown()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert kernel.process.poll() is not None
+    assert not pool._kernels
+
+
+@pytest.mark.asyncio
+async def test_python_slide_streams():
+    slide = PythonSlide(source="print('hello')", display_mode="output")
+    presentation = Presentation(slides=[slide], slide_base_path=Path("."))
+    # Shut down by the app
+    app = PresentationApp(presentation, kernel_pool=KernelPool(1))
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        output = app.query_one(StreamingOutput)
+        await app.workers.wait_for_complete()
+        assert output.stream.text == "hello\n"
+        assert not slide.is_error
+
+
+def test_python_slide_sends_compiled_code(pool, tmp_path):
+    path = tmp_path / "slide.py"
+    path.write_text("x = 1\n1 / 0\n")
+    slide = PythonSlide(path=path)
+    context = ExecutionContext(kernel_pool=pool)
+    output, is_error = slide._exec_inline(context, columns=80, rows=24)
+    assert is_error
+    assert f'File "{path}", line 2' in output
+
+    path.write_text("print(\n")
+    slide.reload()
+    output, is_error = slide._exec_inline(context, columns=80, rows=24)
+    assert is_error
+    assert "SyntaxError" in output
@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+
+from clippt.lookahead import LookaheadScheduler
+from clippt.presentation import Presentation
+from clippt.slides import MarkdownSlide, ShellSlide
+
+
+pytestmark = pytest.mark.usefixtures("exec_calls")
+
+
+@pytest.fixture
+def create_app(make_app):
+    def create_app(*slides):
+        return make_app(
+            presentation=Presentation(slides=list(slides), slide_base_path=Path("."))
+        )
+
+    return create_app
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = LookaheadScheduler(size=2)
+    yield scheduler
+    scheduler.shutdown()
+
+
+def wait(scheduler: LookaheadScheduler) -> None:
+    for future in list(scheduler._futures):
+        future.result()
+
+
+class TestLookaheadScheduler:
+    def test_runs_upcoming_slides(self, scheduler, exec_calls, create_app):
+        app = create_app(
+            MarkdownSlide(source="# Start"),
+            ShellSlide(source="one"),
+            ShellSlide(source="two"),
+            ShellSlide(source="three"),
+        )
+        scheduler.schedule(app, 0, columns=80, rows=24)
+        wait(scheduler)
+        assert sorted(call[0] for call in exec_calls) == ["one", "two"]
+
+        # The output is reused when displayed
+        slide = app.presentation.slides[1]
+        assert slide._exec_cached(app.execution, columns=77, rows=24) == "one @ 77x24"
+        assert sorted(call[0] for call in exec_calls) == ["one", "two"]
+
+    def test_skips_opted_out(self, scheduler, exec_calls, create_app):
+        app = create_app(
+            MarkdownSlide(source="# Start"),
+            ShellSlide(source="one", prefetch=False),
+            ShellSlide(source="two", alt_screen=True),
+        )
+        scheduler.schedule(app, 0, columns=80, rows=24)
+        wait(scheduler)
+        assert exec_calls == []
+
+    def test_disabled(self, exec_calls, create_app):
+        scheduler = LookaheadScheduler(size=0)
+        app = create_app(MarkdownSlide(source="# Start"), ShellSlide(source="one"))
+        scheduler.schedule(app, 0, columns=80, rows=24)
+        assert exec_calls == []
+
+    def test_reload_drops_result(self, scheduler, create_app):
+        slide = ShellSlide(source="one")
+        app = create_app(MarkdownSlide(source="# Start"), slide)
+        scheduler.schedule(app, 0, columns=80, rows=24)
+        slide.reload()
+        wait(scheduler)
+        assert not slide._outputs
@@ -1,9 +1,11 @@
+import threading
+import time
 from pathlib import Path
 import pytest
 from pytest_check import check
 
 from clippt.presentation import Presentation
-from clippt.slides import CodeSlide
+from clippt.slides import CodeSlide, MarkdownSlide, PythonSlide, ShellSlide
 
 
 class TestPresentationFromPath:
@@ -20,3 +22,145 @@ class TestPresentationFromPath:
         assert len(presentation.slides) == 11
         for slide in presentation.slides[1:]:
             check.is_instance(slide, CodeSlide)
+
+
+class TestIncludes:
+    @pytest.fixture
+    def deck(self, tmp_path) -> Path:
+        for chapter in ("01-intro", "02-details"):
+            (tmp_path / "chapters" / chapter).mkdir(parents=True)
+            (tmp_path / "chapters" / chapter / "b.md").write_text(f"# {chapter} b")
+            (tmp_path / "chapters" / chapter / "a.md").write_text(f"# {chapter} a")
+        (tmp_path / "chapters" / ".drafts").mkdir()
+        (tmp_path / "chapters" / ".drafts" / "draft.md").write_text("# Draft")
+        (tmp_path / "snippets").mkdir()
+        (tmp_path / "snippets" / "run.sh").write_text("echo hi")
+        (tmp_path / "snippets" / "fib.py").write_text("print(1)")
+        return tmp_path
+
+    def test_glob(self, deck):
+        (deck / "presentation.toml").write_text(
+            """
+            slides = [
+                { source = "# Title" },
+                { include = "chapters/**/*.md", title = "Part {stem}" },
+                { source = "# End" },
+            ]
+            """
+        )
+        presentation = Presentation.from_path(deck)
+        assert [slide.source for slide in presentation.slides] == [
+            "# Title",
+            "# 01-intro a",
+            "# 01-intro b",
+            "# 02-details a",
+            "# 02-details b",
+            "# End",
+        ]
+        assert presentation.slides[1].title == "Part a"
+        assert all(isinstance(slide, MarkdownSlide) for slide in presentation.slides)
+
+    def test_directory(self, deck):
+        (deck / "presentation.toml").write_text(
+            'slides = [{ include = "snippets", display_mode = "output" }]'
+        )
+        fib, run = Presentation.from_path(deck).slides
+        assert isinstance(fib, PythonSlide)
+        assert isinstance(run, CodeSlide)
+        assert fib.display_mode == "output"
+
+    def test_type(self, deck):
+        (deck / "presentation.toml").write_text(
+            'slides = [{ include = "snippets/*.sh", type = "shell" }]'
+        )
+        (slide,) = Presentation.from_path(deck).slides
+        assert isinstance(slide, ShellSlide)
+        assert slide.source == "echo hi"
+
+    def test_code_type_keeps_language(self, deck):
+        (deck / "presentation.toml").write_text(
+            'slides = [{ include = "snippets", type = "code" }]'
+        )
+        fib, run = Presentation.from_path(deck).slides
+        assert type(fib) is CodeSlide
+        assert fib.language == "python"
+        assert run.language == "bash"
+
+    def test_no_match(self, deck):
+        (deck / "presentation.toml").write_text('slides = [{ include = "*.rst" }]')
+        assert Presentation.from_path(deck).slides == []
+
+    def test_loaded_concurrently_in_order(self, tmp_path):
+        for index in range(50):
+            (tmp_path / f"{index:03}.md").write_text(f"# {index}")
+        (tmp_path / "presentation.toml").write_text('slides = [{ include = "*.md" }]')
+        presentation = Presentation.from_path(tmp_path)
+        assert [slide.source for slide in presentation.slides] == [
+            f"# {index}" for index in range(50)
+        ]
+        assert presentation.loaded_count == 50
+
+
+class TestLazyLoading:
+    @pytest.fixture
+    def fibonacci_path(self) -> Path:
+        return (
+            Path(__file__).parent.parent
+            / "src"
+            / "clippt"
+            / "examples"
+            / "fibonacci"
+            / "presentation.toml"
+        )
+
+    def test_files_not_read(self, fibonacci_path):
+        presentation = Presentation.from_path(fibonacci_path, lazy=True)
+        assert presentation.lazy
+        for slide in presentation.slides:
+            if slide.path:
+                check.is_false(slide.loaded)
+                check.equal(slide.source, "")
+
+    def test_prefetch(self, fibonacci_path):
+        presentation = Presentation.from_path(fibonacci_path, lazy=True)
+        presentation.prefetch_window = 2
+        presentation.prefetch(3)
+        loaded = [i for i, slide in enumerate(presentation.slides) if slide.loaded]
+        assert {2, 3, 4, 5} <= set(loaded)
+        assert 8 not in loaded
+
+    def test_loaded_on_render(self, fibonacci_path):
+        presentation = Presentation.from_path(fibonacci_path, lazy=True)
+        slide = presentation.slides[-1]
+        slide.render(app=None, columns=80, rows=24)
+        assert slide.loaded
+        assert slide.source
+
+    def test_loaded_once_concurrently(self, tmp_path, monkeypatch):
+        (tmp_path / "slide.md").write_text("# Slide")
+        slide = MarkdownSlide(path=tmp_path / "slide.md", lazy=True)
+        reads = []
+
+        def slow_read(self) -> str:
+            reads.append(threading.get_ident())
+            time.sleep(0.05)
+            return "# Slide"
+
+        monkeypatch.setattr(MarkdownSlide, "_read_text", slow_read)
+        # E.g. the prefetch thread and the rendering
+        threads = [threading.Thread(target=slide.ensure_loaded) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(reads) == 1
+        assert slide.source == "# Slide"
+
+    def test_data_slide(self, tmp_path):
+        (tmp_path / "data.csv").write_text("a,b\n1,2\n")
+        (tmp_path / "presentation.toml").write_text('slides = ["data.csv"]')
+        presentation = Presentation.from_path(tmp_path, lazy=True)
+        slide = presentation.slides[0]
+        assert slide.data is None
+        slide.ensure_loaded()
+        assert slide.data.shape == (1, 2)
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import pytest
+
+from clippt.app import PresentationApp
+from clippt.presentation import Presentation
+from clippt.search import SlideIndex, describe
+from clippt.slides import CodeSlide, MarkdownSlide
+
+
+@pytest.fixture
+def slides() -> list:
+    return [
+        MarkdownSlide(source="# Welcome\n\nStreaming with Kafka and Flink."),
+        CodeSlide(
+            title="Kafka config",
+            source="bootstrap.servers=localhost:9092\nacks=all",
+            language="properties",
+        ),
+        MarkdownSlide(source="# Questions?"),
+    ]
+
+
+class TestSlideIndex:
+    def test_prefix_and_title_weight(self, slides):
+        index = SlideIndex()
+        assert index.refresh(slides) == 3
+        assert [result.index for result in index.search("kaf")] == [1, 0]
+
+    def test_all_words_required(self, slides):
+        index = SlideIndex()
+        index.refresh(slides)
+        assert [result.index for result in index.search("kafka flink")] == [0]
+        assert index.search("kafka questions") == []
+
+    def test_typo(self, slides):
+        index = SlideIndex()
+        index.refresh(slides)
+        assert [result.index for result in index.search("bootstrap serverz")] == [1]
+
+    def test_incremental(self, slides):
+        index = SlideIndex()
+        index.refresh(slides)
+        assert index.refresh(slides) == 0
+        slides[2].source = "# Thanks"
+        assert index.refresh(slides) == 1
+        assert index.search("questions") == []
+        assert [result.index for result in index.search("thanks")] == [2]
+        assert index.refresh(slides[:1]) == 0
+        assert index.search("kafka config") == []
+
+    def test_unloaded_slides_skipped(self, tmp_path):
+        (tmp_path / "slide.md").write_text("# Lazy")
+        slide = MarkdownSlide(path=tmp_path / "slide.md", lazy=True)
+        index = SlideIndex()
+        assert index.refresh([slide]) == 0
+        slide.ensure_loaded()
+        assert index.refresh([slide]) == 1
+        assert index.search("lazy")
+
+    def test_snippet(self, slides):
+        index = SlideIndex()
+        index.refresh(slides)
+        assert index.snippet(1, "acks") == "acks=all"
+
+    def test_describe(self, slides):
+        assert describe(0, slides[0]) == "1. Welcome"
+        assert describe(1, slides[1]) == "2. Kafka config"
+
+
+@pytest.mark.asyncio
+class TestCommandPalette:
+    async def run_command(self, app: PresentationApp, pilot, query: str) -> None:
+        await pilot.press("ctrl+p")
+        await pilot.press(*query)
+        await pilot.pause(0.3)
+        await pilot.press("enter")
+        await pilot.pause()
+
+    async def test_search(self, slides):
+        presentation = Presentation(slides=slides, slide_base_path=Path("."))
+        app = PresentationApp(presentation, live_reload=False)
+        async with app.run_test() as pilot:
+            await self.run_command(app, pilot, "bootstrap")
+            assert app.slide_index == 1
+
+    async def test_go_to_slide(self, slides):
+        presentation = Presentation(slides=slides, slide_base_path=Path("."))
+        app = PresentationApp(presentation, cache_size=0, live_reload=False)
+        rendered = []
+        render_slide = app._render_slide
+
+        def record(slide):
+            rendered.append(slides.index(slide))
+            return render_slide(slide)
+
+        app._render_slide = record
+        async with app.run_test() as pilot:
+            await self.run_command(app, pilot, "3")
+            assert app.slide_index == 2
+            # Without the slides in between
+            assert rendered == [0, 2]
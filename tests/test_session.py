@@ -0,0 +1,110 @@
+import sys
+import threading
+
+import pytest
+
+from clippt.app import PresentationApp
+from clippt.presentation import Presentation
+from clippt.session import ShellSession
+from clippt.slides import ExecutionContext, ShellSlide
+from clippt.widgets import StreamingOutput
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Needs a PTY")
+
+
+@pytest.fixture
+def session(tmp_path):
+    session = ShellSession(cwd=tmp_path, shell="/bin/sh", timeout=5)
+    yield session
+    session.close()
+
+
+class TestShellSession:
+    def test_output_and_status(self, session):
+        assert session.execute("echo hello", columns=80, rows=24) == ("hello\n", False)
+        output, is_error = session.execute("echo oops; false", columns=80, rows=24)
+        assert (output, is_error) == ("oops\n", True)
+
+    def test_output_without_newline(self, session):
+        assert session.execute("printf abc", columns=80, rows=24) == ("abc", False)
+
+    def test_state_carries_over(self, session, tmp_path):
+        (tmp_path / "sub").mkdir()
+        session.execute("cd sub; export GREETING=hi", columns=80, rows=24)
+        output, _ = session.execute('pwd; echo "$GREETING"', columns=80, rows=24)
+        assert output == f"{tmp_path / 'sub'}\nhi\n"
+
+    def test_terminal_size(self, session):
+        output, _ = session.execute("echo $COLUMNS; stty size <&1", columns=42, rows=10)
+        assert output == "42\n10 42\n"
+
+    def test_quotes(self, session):
+        output, _ = session.execute("echo \"it's\" '$HOME'", columns=80, rows=24)
+        assert output == "it's $HOME\n"
+
+    def test_syntax_error_keeps_shell(self, session):
+        session.execute("X=1", columns=80, rows=24)
+        _, is_error = session.execute("if then", columns=80, rows=24)
+        assert is_error
+        assert session.execute("echo $X", columns=80, rows=24) == ("1\n", False)
+
+    def test_exit_restarts_shell(self, session):
+        output, is_error = session.execute("exit 3", columns=80, rows=24)
+        assert is_error
+        assert "The shell exited" in output
+        assert session.execute("echo again", columns=80, rows=24) == ("again\n", False)
+
+    def test_streamed_output(self, session):
+        chunks = []
+        session.execute(
+            "echo a; sleep 0.1; echo b", columns=80, rows=24, on_output=chunks.append
+        )
+        assert "".join(chunks) == "a\nb\n"
+
+    def test_cancel(self, session):
+        cancelled = threading.Event()
+        cancelled.set()
+        output, is_error = session.execute(
+            "sleep 10", columns=80, rows=24, cancelled=cancelled
+        )
+        assert is_error
+        assert "Cancelled" in output
+        assert session.execute("echo 1", columns=80, rows=24) == ("1\n", False)
+
+    def test_timeout(self, tmp_path):
+        session = ShellSession(cwd=tmp_path, shell="/bin/sh", timeout=0.3)
+        try:
+            output, is_error = session.execute("sleep 10", columns=80, rows=24)
+            assert is_error
+            assert "Timeout" in output
+        finally:
+            session.close()
+
+
+def test_shell_slides_share_session(session, tmp_path):
+    context = ExecutionContext(working_dir=tmp_path, shell_session=session)
+    ShellSlide(source="export NAME=clippt")._exec_cached(context, columns=80, rows=24)
+    slide = ShellSlide(source="echo $NAME", display_mode="output")
+    assert slide._exec_cached(context, columns=80, rows=24) == "clippt\n"
+    assert slide.persistent_key(context, columns=80, rows=24) is None
+
+
+@pytest.mark.asyncio
+async def test_app_streams_from_session(tmp_path):
+    slides = [
+        ShellSlide(source="cd /", display_mode="output"),
+        ShellSlide(source="pwd", display_mode="output"),
+    ]
+    presentation = Presentation(slides=slides, slide_base_path=tmp_path)
+    # Closed by the app
+    session = ShellSession(cwd=tmp_path, shell="/bin/sh", timeout=5)
+    app = PresentationApp(presentation, shell_session=session, live_reload=False)
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.press("pagedown")
+        await pilot.pause()
+        output = app.query_one(StreamingOutput)
+        await app.workers.wait_for_complete()
+        assert output.stream.text == "/\n"
+    assert not session.running
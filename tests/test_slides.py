@@ -0,0 +1,134 @@
+import asyncio
+import sys
+
+import pytest
+
+from clippt.slides import CodeSlide, MarkdownSlide, ShellSlide
+from clippt.utils import stream_in_pseudo_terminal
+from clippt.widgets import CachedMarkdownParser
+
+
+class TestOutputCache:
+    def test_same_geometry_runs_once(self, context, exec_calls):
+        slide = ShellSlide(source="ls", display_mode="output")
+        slide._exec_cached(context, columns=80, rows=24)
+        slide._exec_cached(context, columns=80, rows=24)
+        assert exec_calls == [("ls", 80, 24)]
+
+    def test_new_geometry_runs_again(self, context, exec_calls):
+        slide = ShellSlide(source="ls", display_mode="output")
+        slide._exec_cached(context, columns=80, rows=24)
+        slide._exec_cached(context, columns=100, rows=24)
+        slide._exec_cached(context, columns=80, rows=24)
+        assert len(exec_calls) == 2
+
+    def test_changed_source_runs_again(self, context, exec_calls):
+        slide = ShellSlide(source="ls", display_mode="output")
+        slide._exec_cached(context, columns=80, rows=24)
+        slide.source = "pwd"
+        slide._exec_cached(context, columns=80, rows=24)
+        assert [call[0] for call in exec_calls] == ["ls", "pwd"]
+
+    def test_reload_clears(self, context, exec_calls):
+        slide = ShellSlide(source="ls", display_mode="output")
+        slide._exec_cached(context, columns=80, rows=24)
+        slide.reload()
+        slide._exec_cached(context, columns=80, rows=24)
+        assert len(exec_calls) == 2
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Needs a PTY")
+@pytest.mark.asyncio
+class TestStreamInPseudoTerminal:
+    async def test_chunks_arrive(self):
+        chunks = []
+        is_error = await stream_in_pseudo_terminal(
+            command="echo one; sleep 0.1; echo two",
+            cwd=None,
+            columns=80,
+            rows=24,
+            on_output=chunks.append,
+        )
+        assert not is_error
+        assert "".join(chunks).split() == ["one", "two"]
+
+    async def test_error(self):
+        is_error = await stream_in_pseudo_terminal(
+            command="exit 3", cwd=None, columns=80, rows=24, on_output=print
+        )
+        assert is_error
+
+    async def test_cancel(self):
+        task = asyncio.create_task(
+            stream_in_pseudo_terminal(
+                command="sleep 10", cwd=None, columns=80, rows=24, on_output=print
+            )
+        )
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=2)
+
+
+@pytest.mark.parametrize(
+    "slide,expected",
+    [
+        pytest.param(MarkdownSlide(source="# Hello"), False, id="markdown"),
+        pytest.param(CodeSlide(source="x = 1"), False, id="code"),
+        pytest.param(ShellSlide(source="ls"), False, id="shell-code"),
+        pytest.param(
+            ShellSlide(source="ls", display_mode="output"), True, id="shell-output"
+        ),
+        pytest.param(
+            ShellSlide(source="ls", display_mode="output", alt_screen=True),
+            False,
+            id="shell-alt-screen",
+        ),
+    ],
+)
+def test_geometry_dependent(slide, expected):
+    assert slide.geometry_dependent == expected
+
+
+class TestParsedSourceCache:
+    def test_hidden_lines_filtered_once(self, tmp_path):
+        path = tmp_path / "code.py"
+        path.write_text("import os  # HIDE\nprint(1)\n# HIDE_BELOW\nprint(2)\n")
+        slide = CodeSlide(path=path, language="python")
+        assert slide.displayed_code == "print(1)"
+        cached = slide._displayed_code
+        assert slide.displayed_code == "print(1)"
+        assert slide._displayed_code is cached
+
+        path.write_text("print(3)\n")
+        slide.reload()
+        assert slide.displayed_code == "print(3)"
+
+    def test_markdown_parsed_once(self, monkeypatch):
+        from markdown_it import MarkdownIt
+
+        CachedMarkdownParser.clear()
+        calls = []
+        original = MarkdownIt.parse
+
+        def parse(self, source, *args, **kwargs):
+            calls.append(source)
+            return original(self, source, *args, **kwargs)
+
+        monkeypatch.setattr(MarkdownIt, "parse", parse)
+        parser = CachedMarkdownParser()
+        tokens = parser.parse("# Title\n\nText.")
+        assert parser.parse("# Title\n\nText.") is tokens
+        assert len(calls) == 1
+        CachedMarkdownParser.forget("# Title\n\nText.")
+        parser.parse("# Title\n\nText.")
+        assert len(calls) == 2
+
+    def test_reload_forgets_markdown(self, tmp_path):
+        path = tmp_path / "slide.md"
+        path.write_text("# Old")
+        slide = MarkdownSlide(path=path)
+        parser = CachedMarkdownParser()
+        tokens = parser.parse(slide.source)
+        slide.reload()
+        assert parser.parse(slide.source) is not tokens
@@ -0,0 +1,79 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import clippt
+
+IMPORT_TIME_BUDGET_US = 250_000
+"""Maximum cumulative import time of `clippt.cli` (in microseconds).
+
+Around 75 ms are expected (mostly click), the rest is a margin for slow machines.
+"""
+
+HEAVY_MODULES = [
+    "polars",
+    "pydantic",
+    "textual",
+    "textual_fastdatatable",
+    "shellingham",
+]
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(Path(clippt.__file__).parents[1]), env.get("PYTHONPATH", "")]
+    )
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+        timeout=60,
+    )
+
+
+def _loaded_modules(code: str) -> list[str]:
+    """Heavy modules loaded after running the code in a fresh interpreter."""
+    result = _run_python(
+        "-c",
+        f"{code}\nimport json, sys\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))",
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_cli_import_is_light():
+    assert _loaded_modules("import clippt.cli") == []
+
+
+def test_package_import_is_light():
+    assert _loaded_modules("import clippt") == []
+
+
+def test_markdown_deck_does_not_load_polars(tmp_path):
+    (tmp_path / "presentation.toml").write_text(
+        """
+        [[slides]]
+        source = "# Title"
+        """
+    )
+    code = (
+        "from clippt.presentation import Presentation\n"
+        f"Presentation.from_path({str(tmp_path / 'presentation.toml')!r})"
+    )
+    assert "polars" not in _loaded_modules(code)
+
+
+def test_import_time_budget():
+    result = _run_python("-X", "importtime", "-c", "import clippt.cli")
+    # Lines: "import time: self [us] | cumulative | imported package"
+    cumulative = next(
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.split("|")[-1].strip() == "clippt.cli"
+    )
+    assert cumulative < IMPORT_TIME_BUDGET_US
@@ -0,0 +1,130 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from clippt.app import PresentationApp
+from clippt.cache import OutputCache
+from clippt.presentation import Presentation
+from clippt.slides import MarkdownSlide, ShellSlide
+from clippt.state import SessionState, SessionStore
+
+
+@pytest.fixture
+def store(tmp_path) -> SessionStore:
+    return SessionStore(tmp_path / "session.json", save_delay=0.05)
+
+
+class TestSessionStore:
+    def test_debounced(self, store):
+        for index in range(10):
+            store.set_slide_index(index)
+        assert not store.path.exists()
+        time.sleep(0.3)
+        assert json.loads(store.path.read_text())["slide_index"] == 9
+        store.close()
+
+    def test_written_on_close(self, tmp_path):
+        store = SessionStore(tmp_path / "session.json", save_delay=60)
+        store.set_display_mode(2, "output", output="key")
+        store.set_scroll(2, 12.0)
+        store.close()
+        state = SessionStore(store.path).load()
+        assert state.display_modes == {2: "output"}
+        assert state.outputs == {2: "key"}
+        assert state.scroll == {2: 12.0}
+
+    def test_code_mode_drops_output(self, store):
+        store.set_display_mode(2, "output", output="key")
+        store.set_display_mode(2, "code", output="key")
+        assert store.state.outputs == {}
+        store.close()
+
+    def test_invalid_file(self, store):
+        store.path.write_text("{")
+        assert store.load() == SessionState()
+
+    def test_keyed_by_manifest(self, tmp_path):
+        first, second = (
+            Presentation(slide_base_path=tmp_path, source_path=tmp_path / name)
+            for name in ("a.toml", "b.toml")
+        )
+        assert (
+            SessionStore.for_presentation(first).path
+            != SessionStore.for_presentation(second).path
+        )
+
+
+@pytest.fixture
+def presentation() -> Presentation:
+    return Presentation(
+        slides=[
+            MarkdownSlide(source="# First"),
+            ShellSlide(source="echo hi"),
+            MarkdownSlide(source="# Long\n\n" + "text\n\n" * 100),
+        ],
+        slide_base_path=Path("."),
+    )
+
+
+@pytest.mark.asyncio
+class TestAppSession:
+    async def test_navigation_recorded(
+        self, presentation, store, tmp_path, monkeypatch
+    ):
+        monkeypatch.chdir(tmp_path)
+        app = PresentationApp(presentation, session_store=store)
+        async with app.run_test() as pilot:
+            await pilot.press("pagedown", "pagedown")
+            await pilot.pause()
+            (shown,) = [
+                child for child in app.query_one("#content").children if child.display
+            ]
+            shown.scroll_to(y=5, animate=False)
+            await pilot.pause()
+        state = SessionStore(store.path).load()
+        assert state.slide_index == 2
+        assert state.scroll == {2: 5}
+        assert not (tmp_path / ".current_slide").exists()
+
+    async def test_restore(self, presentation, tmp_path):
+        output_cache = OutputCache(tmp_path)
+        app = PresentationApp(presentation, output_cache=output_cache)
+        state = SessionState(
+            slide_index=2,
+            display_modes={1: "output"},
+            outputs={1: "missing"},
+            scroll={2: 4},
+        )
+        app.restore_session(state)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            assert app.slide_index == 2
+            (shown,) = [
+                child for child in app.query_one("#content").children if child.display
+            ]
+            assert shown.scroll_y == 4
+            # Not in the cache, it would have to run
+            assert presentation.slides[1].display_mode == "code"
+
+    async def test_restore_cached_output(self, presentation, tmp_path):
+        output_cache = OutputCache(tmp_path)
+        output_cache.put("cached", "hi\n", False)
+        app = PresentationApp(presentation, output_cache=output_cache)
+        app.restore_session(
+            SessionState(display_modes={1: "output"}, outputs={1: "cached"})
+        )
+        assert presentation.slides[1].display_mode == "output"
+        assert app.slide_index == 0
+
+
+def test_output_reference_recorded(presentation, store):
+    app = PresentationApp(presentation, session_store=store, output_cache=OutputCache())
+    app._geometry = (80, 20)
+    presentation.slides[1].display_mode = "output"
+    app._remember_display_mode(1)
+    assert store.state.outputs[1] == presentation.slides[1].persistent_key(
+        app.execution, columns=77, rows=20
+    )
+    store.close()
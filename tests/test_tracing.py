@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from clippt.tracing import Tracer, format_spans
+
+
+def test_span_records_duration_and_args():
+    tracer = Tracer()
+    with tracer.span("outer", slide="A"):
+        with tracer.span("inner"):
+            pass
+    inner, outer = tracer.spans
+    assert (inner.name, outer.name) == ("inner", "outer")
+    assert outer.args == {"slide": "A"}
+    assert outer.start <= inner.start
+    assert outer.duration >= inner.duration
+
+
+def test_span_recorded_on_error():
+    tracer = Tracer()
+    with pytest.raises(ValueError):
+        with tracer.span("failing"):
+            raise ValueError()
+    assert [span.name for span in tracer.spans] == ["failing"]
+
+
+def test_disabled():
+    tracer = Tracer()
+    tracer.enabled = False
+    with tracer.span("ignored"):
+        pass
+    assert tracer.spans == []
+
+
+def test_max_spans():
+    tracer = Tracer(max_spans=2)
+    for name in "abc":
+        with tracer.span(name):
+            pass
+    assert [span.name for span in tracer.spans] == ["b", "c"]
+    tracer.max_spans = None
+    with tracer.span("d"):
+        pass
+    assert len(tracer.spans) == 3
+
+
+def test_spans_since():
+    tracer = Tracer()
+    with tracer.span("before"):
+        pass
+    start = tracer.spans[0].start + tracer.spans[0].duration
+    with tracer.span("after"):
+        pass
+    assert [span.name for span in tracer.spans_since(start)] == ["after"]
+
+
+def test_chrome_trace(tmp_path):
+    tracer = Tracer()
+    with tracer.span("render", slide="A"):
+        pass
+    with tracer.span("exec", asynchronous=True):
+        pass
+    path = tmp_path / "trace.json"
+    tracer.dump(path)
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [(event["name"], event["ph"]) for event in events] == [
+        ("render", "X"),
+        ("exec", "b"),
+        ("exec", "e"),
+    ]
+    assert events[0]["args"] == {"slide": "A"}
+    assert events[1]["id"] == events[2]["id"]
+
+
+def test_format_spans():
+    tracer = Tracer()
+    with tracer.span("outer"):
+        with tracer.span("inner"):
+            pass
+    assert format_spans(tracer.spans).startswith("outer ")
@@ -0,0 +1,81 @@
+import sys
+
+import pytest
+
+from clippt.slides import Slide, ShellSlide
+from clippt.model import SlideModel
+from clippt.utils import OutputBuffer, OutputLimits, exec_in_pseudo_terminal
+
+
+def lines(count: int) -> str:
+    return "".join(f"{i}\n" for i in range(count))
+
+
+class TestOutputBuffer:
+    def test_short_output_kept(self):
+        buffer = OutputBuffer(OutputLimits(head_lines=2, tail_lines=2))
+        buffer.write("a\nb")
+        buffer.write("c\nd\n")
+        assert buffer.text == "a\nbc\nd\n"
+        assert buffer.truncated_lines == 0
+
+    def test_head_and_tail(self):
+        buffer = OutputBuffer(OutputLimits(head_lines=2, tail_lines=3))
+        buffer.write(lines(10))
+        assert buffer.truncated_lines == 5
+        assert buffer.text == ("0\n1\n\x1b[0m[... 5 lines truncated ...]\n7\n8\n9\n")
+
+    def test_unfinished_line_kept(self):
+        buffer = OutputBuffer(OutputLimits(head_lines=1, tail_lines=1))
+        buffer.write(lines(5) + "last")
+        assert buffer.text.endswith("4\nlast")
+
+    def test_no_tail(self):
+        buffer = OutputBuffer(OutputLimits(head_lines=1, tail_lines=0))
+        buffer.write(lines(3))
+        assert buffer.text == "0\n\x1b[0m[... 2 lines truncated ...]\n"
+
+    def test_long_line(self):
+        buffer = OutputBuffer(OutputLimits(max_line_length=5))
+        buffer.write("abc")
+        buffer.write("defgh\nij\n")
+        buffer.write("x" * 5 + "\n")
+        assert buffer.text == "abcde…\nij\nxxxxx\n"
+
+    def test_split_multibyte_characters(self):
+        buffer = OutputBuffer()
+        data = "příliš žluťoučký\n".encode("utf-8")
+        for i in range(len(data)):
+            buffer.feed(data[i : i + 1])
+        buffer.finish()
+        assert buffer.text == "příliš žluťoučký\n"
+
+    def test_version(self):
+        buffer = OutputBuffer()
+        version = buffer.version
+        buffer.write("")
+        assert buffer.version == version
+        buffer.write("x")
+        assert buffer.version > version
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Needs a PTY")
+def test_exec_in_pseudo_terminal_truncates():
+    output, is_error = exec_in_pseudo_terminal(
+        command="seq 1 100000",
+        cwd=None,
+        columns=80,
+        rows=24,
+        limits=OutputLimits(head_lines=1, tail_lines=1),
+    )
+    assert not is_error
+    assert output == "1\n\x1b[0m[... 99998 lines truncated ...]\n100000\n"
+
+
+def test_limits_from_model():
+    model = SlideModel(
+        type="shell", source="ls", output_head_lines=5, output_tail_lines=0
+    )
+    slide = Slide.from_model(model)
+    assert isinstance(slide, ShellSlide)
+    assert slide.output_limits == OutputLimits(head_lines=5, tail_lines=0)
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from clippt import watch
+from clippt.app import PresentationApp
+from clippt.presentation import Presentation
+from clippt.slides import CodeSlide
+from clippt.watch import FileWatcher, InotifyWatcher, create_watcher
+
+watchers = [pytest.param(FileWatcher, id="polling")]
+if sys.platform == "linux":
+    watchers.append(pytest.param(InotifyWatcher, id="inotify"))
+
+
+def modify(path: Path, content: str) -> None:
+    """Write the file, making sure the modification time changes."""
+    mtime_ns = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+
+@pytest.mark.parametrize("watcher_class", watchers)
+class TestFileWatcher:
+    def test_change_detected(self, tmp_path, watcher_class):
+        path = tmp_path / "slide.md"
+        path.write_text("# One")
+        other = tmp_path / "other.md"
+        other.write_text("# Other")
+        watcher = watcher_class([path, other])
+        assert watcher.changes() == set()
+        modify(path, "# Two")
+        assert watcher.changes() == {path}
+        assert watcher.changes() == set()
+        watcher.close()
+
+    def test_same_content_ignored(self, tmp_path, watcher_class):
+        path = tmp_path / "slide.md"
+        path.write_text("# One")
+        watcher = watcher_class([path])
+        modify(path, "# Two")
+        assert watcher.changes() == {path}
+        modify(path, "# Two")
+        assert watcher.changes() == set()
+        watcher.close()
+
+    def test_deleted_and_recreated(self, tmp_path, watcher_class):
+        path = tmp_path / "slide.md"
+        path.write_text("# One")
+        watcher = watcher_class([path])
+        path.unlink()
+        assert watcher.changes() == {path}
+        modify(path, "# Two")
+        assert watcher.changes() == {path}
+        watcher.close()
+
+
+def test_large_file_not_hashed(tmp_path, monkeypatch):
+    monkeypatch.setattr(watch, "HASH_MAX_SIZE", 4)
+    monkeypatch.setattr(hashlib, "file_digest", None)  # Fails if called
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,2\n")
+    watcher = FileWatcher([path])
+    modify(path, "a,b\n1,2\n")
+    assert watcher.changes() == {path}
+    # Same content, but the modification time is trusted
+    modify(path, "a,b\n1,2\n")
+    assert watcher.changes() == {path}
+
+
+def test_create_watcher_missing_directory(tmp_path):
+    watcher = create_watcher([tmp_path / "missing" / "slide.md"])
+    assert watcher.changes() == set()
+    watcher.close()
+
+
+@pytest.mark.asyncio
+async def test_current_slide_reloaded(tmp_path):
+    path = tmp_path / "code.py"
+    path.write_text("x = 1")
+    slide = CodeSlide(path=path, language="python")
+    presentation = Presentation(slides=[slide], slide_base_path=tmp_path)
+    app = PresentationApp(presentation)
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        first_widget = app.slide_cache.get(0)
+        modify(path, "x = 2")
+        await pilot.pause(app.WATCH_INTERVAL * 3)
+        assert slide.source == "x = 2"
+        assert app.slide_cache.get(0) is not first_widget
@@ -0,0 +1,99 @@
+from textual.app import App, ComposeResult
+
+from clippt import widgets
+from clippt.widgets import OutputView
+
+import pytest
+
+OUTPUT = "".join(f"\x1b[32mline {i}\x1b[0m\n" for i in range(1000))
+
+
+class OutputApp(App):
+    def __init__(self, text: str):
+        super().__init__()
+        self.text = text
+
+    def compose(self) -> ComposeResult:
+        yield OutputView(self.text, max_height=10)
+
+
+@pytest.mark.asyncio
+class TestOutputView:
+    async def test_renders_visible_lines_only(self):
+        app = OutputApp(OUTPUT)
+        async with app.run_test(size=(40, 20)) as pilot:
+            await pilot.pause()
+            view = app.query_one(OutputView)
+            assert len(view.lines) == 1000
+            assert view.virtual_size.height == 1000
+            assert view.size.height == 10
+            assert 0 < len(view._strips) <= 10
+            assert view.render_line(0).text.rstrip() == "line 0"
+
+    async def test_search(self):
+        app = OutputApp(OUTPUT)
+        async with app.run_test(size=(40, 20)) as pilot:
+            await pilot.pause()
+            view = app.query_one(OutputView)
+            assert view.search("LINE 500")
+            assert view.match_line == 500
+            await pilot.pause()
+            assert view.scroll_offset.y > 0
+            # A new text is searched from the start
+            assert view.search("line 99")
+            assert view.match_line == 99
+            assert view.search("line 99")
+            assert view.match_line == 990
+            assert view.search("line 99", backwards=True)
+            assert view.match_line == 99
+            # Wraps around
+            assert view.search("line 99", backwards=True)
+            assert view.match_line == 999
+            assert not view.search("missing")
+
+    async def test_status_line(self):
+        app = OutputApp("one\ntwo\n")
+        async with app.run_test(size=(40, 20)) as pilot:
+            view = app.query_one(OutputView)
+            view.status = "Running"
+            await pilot.pause()
+            assert view.virtual_size.height == 3
+            assert view.render_line(2).text.rstrip() == "Running"
+            view.status = None
+            assert view.virtual_size.height == 2
+
+    async def test_style_carries_over_lines(self):
+        app = OutputApp("\x1b[31mred 1\nred 2\x1b[0m\nplain\n")
+        async with app.run_test(size=(40, 20)) as pilot:
+            await pilot.pause()
+            view = app.query_one(OutputView)
+            colors = [
+                [
+                    segment.style.color.name if segment.style.color else None
+                    for segment in view.render_line(y)
+                    if segment.text.strip()
+                ]
+                for y in range(3)
+            ]
+            assert colors[0] == colors[1] == ["color(1)"]
+            assert colors[2] != ["color(1)"]
+
+    async def test_appended_text(self, monkeypatch):
+        app = OutputApp("one\n\x1b[1mtw")
+        async with app.run_test(size=(40, 20)) as pilot:
+            view = app.query_one(OutputView)
+            scanned = []
+            original = widgets._plain
+            monkeypatch.setattr(
+                widgets, "_plain", lambda line: scanned.append(line) or original(line)
+            )
+            view.set_text("one\n\x1b[1mtwo\nthree\n")
+            await pilot.pause()
+            # Only the unfinished line and the new one
+            assert scanned == ["\x1b[1mtwo", "three"]
+            assert view.lines == ["one", "\x1b[1mtwo", "three"]
+            assert view._styles[2].bold
+            # Not an extension
+            view.set_text("other\n")
+            assert view.lines == ["other"]
+            assert not view._styles[1].bold
@@ -0,0 +1,107 @@
+import os
+import shlex
+import subprocess
+import sys
+
+import pytest
+
+from clippt.app import PresentationApp
+from clippt.presentation import Presentation
+from clippt.slides import MarkdownSlide
+from clippt.zygote import Zygote
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Needs fork")
+
+
+class EchoApp:
+    """Stand-in app answering a line of input."""
+
+    first_frame_callback = None
+    return_code = 3
+
+    def run(self) -> None:
+        self.first_frame_callback()
+        name = os.read(0, 100).decode().strip()
+        os.write(1, f"{os.environ['GREETING']} {name}\n".encode())
+
+
+@pytest.fixture
+def zygote():
+    zygote = Zygote(EchoApp)
+    zygote.start()
+    yield zygote
+    zygote.stop()
+
+
+def connect(zygote: Zygote, text: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        shlex.split(zygote.client_command),
+        input=text,
+        env=os.environ | {"GREETING": "Hello"},
+        capture_output=True,
+        text=True,
+        timeout=10,
+    )
+
+
+def test_app_forked_per_connection(capfd):
+    # Started here for its stderr to be captured
+    zygote = Zygote(EchoApp)
+    zygote.start()
+    try:
+        for name in ("one", "two"):
+            result = connect(zygote, f"{name}\n")
+            assert result.stdout == f"Hello {name}\n"
+            assert result.returncode == 3
+    finally:
+        zygote.stop()
+    assert "Connection 2: first frame after" in capfd.readouterr().err
+
+
+def test_stop_cleans_up(zygote):
+    zygote.stop()
+    assert not zygote.socket_path.exists()
+    assert connect(zygote, "").returncode != 0
+
+
+class SettingsApp(PresentationApp):
+    """The real app, reporting the settings read from the environment."""
+
+    def __init__(self):
+        super().__init__(
+            Presentation(slides=[MarkdownSlide(source="# Hi")], slide_base_path=".")
+        )
+
+    def run(self) -> None:
+        from textual import filter, message_pump
+
+        self.first_frame_callback()
+        settings = [
+            self.no_color,
+            filter.DIM_FACTOR,
+            filter.dim_color.__wrapped__.__defaults__[0],
+            message_pump.SLOW_THRESHOLD,
+        ]
+        os.write(1, f"{settings}\n".encode())
+        self.return_code = 0
+
+
+def test_textual_settings_of_connection():
+    zygote = Zygote(SettingsApp)
+    zygote.start()
+    try:
+        result = subprocess.run(
+            shlex.split(zygote.client_command),
+            env=os.environ
+            | {
+                "NO_COLOR": "1",
+                "TEXTUAL_DIM_FACTOR": "20",
+                "TEXTUAL_SLOW_THRESHOLD": "1234",
+            },
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    finally:
+        zygote.stop()
+    assert result.stdout == "[True, 0.2, 0.2, 1234]\n", result.stderr